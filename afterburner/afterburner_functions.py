@@ -1,4 +1,4 @@
-def calculate_f_ab(cp_ab, T06, T05, LHV):
+def calculate_f_ab(cp_ab, T06, T05, LHV, n_ab=1.0):
     """
     Calculate the fuel-to-air ratio in the afterburner.
 
@@ -7,11 +7,12 @@ def calculate_f_ab(cp_ab, T06, T05, LHV):
     T06 (float): Temperature at turbine exit (K)
     T05 (float): Temperature at turbine inlet (K)
     LHV (float): Lower heating value of the fuel (J/kg)
+    n_ab (float): Afterburner efficiency
 
     Returns:
     float: Fuel-to-air ratio in the afterburner
     """
-    return cp_ab *(T06 - T05) / (LHV - cp_ab * T06)
+    return cp_ab *(T06 - T05) / (n_ab * LHV - cp_ab * T06)
 
 def calculate_ab_fuel_mass_flow(f_ab, m_total):
     """
@@ -5,7 +5,7 @@ import matplotlib.pyplot as plt
 from afterburner_functions import *
 from turbine_outputs import *
 
-f_ab = calculate_f_ab(cp_ab, T06, T05, LHV)
+f_ab = calculate_f_ab(cp_ab, T06, T05, LHV, n_ab)
 ab_fuel_mass_flow= calculate_ab_fuel_mass_flow(f_ab, m_total)
 m_new = calculate_m_flow_new(m_total, ab_fuel_mass_flow)
 h06= calculate_h06(cp_ab, T06)
@@ -0,0 +1,60 @@
+"""
+Jet engine cycle simulator as a library.
+
+Submodules and the names below are imported on first use, so importing
+jetsim (or running the jetsim command) does not pay for numpy, scipy or
+matplotlib until something needs them.
+
+    import jetsim
+    jetsim.run_cycle(rp=25.0)["thrust"]
+"""
+import importlib
+
+__version__ = "0.1.0"
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "DESIGN_POINT": "cycle",
+    "CYCLE_OUTPUTS": "cycle",
+    "cycle_inputs": "cycle",
+    "run_cycle": "cycle",
+    "run_stations": "cycle",
+    "flight_condition": "atmosphere",
+    "standard_atmosphere": "atmosphere",
+    "Deck": "deck",
+    "generate_deck": "deck",
+    "run_batch": "batch",
+    "ResultCache": "cache",
+    "CycleGraph": "graph",
+    "WarmStartSolver": "solve",
+    "fit_fleet": "fleet",
+    "precision_report": "precision",
+    "integrate_missions": "mission",
+    "run_feasible": "feasibility",
+    "design_contour": "moc",
+    "run_fidelity": "fidelity",
+    "Emissions": "emissions",
+    "emission_indices": "emissions",
+    "equilibrium_properties": "equilibrium",
+    "size_inlet": "inlet_matching",
+    "run_matched": "inlet_matching",
+    "run_pipeline": "pipeline",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    else:
+        try:
+            value = importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module '{__name__}' has no attribute '{name}'") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
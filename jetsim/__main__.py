@@ -0,0 +1,3 @@
+from jetsim.cli import main
+
+main()
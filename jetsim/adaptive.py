@@ -0,0 +1,294 @@
+"""
+Adaptive N-dimensional parameter-space refinement.
+
+A uniform linspace sweep spends most of its points where the outputs are
+nearly linear. adaptive_map starts from a coarse grid of cells over a box
+of inputs and splits a cell into its 2**d children only where the
+outputs bend (the value at the cell centre differs from the mean of the
+corners) or change steeply across it, e.g. near nozzle regime transitions
+or temperature limits.
+
+Points live on a lattice at the finest level, so corners shared between
+cells are evaluated once. Each refinement level evaluates all its new
+points in one vectorized call. The result is an AdaptiveMap that
+interpolates multilinearly within the leaf cells.
+
+    python -m jetsim.adaptive
+"""
+import argparse
+import itertools
+
+import numpy as np
+
+from jetsim.cycle import run_cycle
+
+
+class AdaptiveMap:
+    """
+    Outputs sampled on adaptively refined cells, with multilinear interpolation.
+
+    Built by adaptive_map. Queries outside the box are clamped to it.
+
+    Attributes:
+    names (tuple of str): Input names, one per axis.
+    outputs (tuple of str): Output names.
+    points (dict): Evaluated inputs, {name: array}.
+    values (dict): Outputs at the evaluated points, {name: array}.
+    evaluations (int): Number of points evaluated.
+    leaves_per_level (list of int): Leaf cells at each refinement level.
+    """
+
+    def __init__(self, ranges, outputs, base, max_level, keys, X, Y, leaves):
+        self.names = tuple(ranges)
+        self.outputs = tuple(outputs)
+        self._low = np.array([low for low, _ in ranges.values()], dtype=float)
+        self._high = np.array([high for _, high in ranges.values()], dtype=float)
+        self._base = base
+        self._max_level = max_level
+        self._resolution = base * 2**max_level  # lattice intervals per axis
+        order = np.argsort(keys)
+        self._keys = keys[order]
+        self._Y = Y[order]
+        self._leaves = [np.sort(level) for level in leaves]
+        self.points = {name: X[order, j] for j, name in enumerate(self.names)}
+        self.values = {name: self._Y[:, k] for k, name in enumerate(self.outputs)}
+        self.evaluations = len(keys)
+        self.leaves_per_level = [len(level) for level in leaves]
+
+    def _key(self, lattice):
+        return np.ravel_multi_index(tuple(lattice.T), (self._resolution + 1,) * len(self.names))
+
+    def __call__(self, **coords):
+        """
+        Interpolate the outputs.
+
+        Parameters:
+        **coords: One value (float or array) per input, broadcast together.
+
+        Returns:
+        dict: Each output with the broadcast query shape.
+        """
+        missing = [name for name in self.names if name not in coords]
+        if missing:
+            raise ValueError(f"Missing coordinate(s): {', '.join(missing)}.")
+        columns = np.broadcast_arrays(*(np.asarray(coords[name], dtype=float) for name in self.names))
+        shape = columns[0].shape
+        X = np.stack([column.ravel() for column in columns], axis=1)
+        position = np.clip((X - self._low) / (self._high - self._low), 0.0, 1.0) * self._resolution
+        d = len(self.names)
+
+        # Find the leaf holding each query, coarsest level first.
+        origin = np.zeros((len(X), d), dtype=np.int64)
+        size = np.zeros(len(X), dtype=np.int64)
+        unresolved = np.ones(len(X), dtype=bool)
+        for level, leaves in enumerate(self._leaves):
+            if not unresolved.any():
+                break
+            cell = 2 ** (self._max_level - level)  # lattice units per cell side
+            index = np.flatnonzero(unresolved)
+            candidate = np.minimum((position[index] // cell).astype(np.int64), self._resolution // cell - 1) * cell
+            keys = self._key(candidate)
+            slot = np.minimum(np.searchsorted(leaves, keys), max(len(leaves) - 1, 0))
+            found = (leaves[slot] == keys) if len(leaves) else np.zeros(len(index), dtype=bool)
+            origin[index[found]] = candidate[found]
+            size[index[found]] = cell
+            unresolved[index[found]] = False
+
+        # Multilinear interpolation from the leaf's 2**d corners.
+        t = (position - origin) / size[:, None]
+        result = np.zeros((len(X), len(self.outputs)))
+        for corner in itertools.product((0, 1), repeat=d):
+            corner = np.array(corner)
+            weight = np.prod(np.where(corner, t, 1.0 - t), axis=1)
+            keys = self._key(origin + corner * size[:, None])
+            result += weight[:, None] * self._Y[np.searchsorted(self._keys, keys)]
+        return {name: result[:, k].reshape(shape) for k, name in enumerate(self.outputs)}
+
+
+def adaptive_map(func, ranges, outputs, rtol=1e-3, gtol=None, base=4, max_level=6, atol=None):
+    """
+    Sample outputs over a box, refining cells only where they are needed.
+
+    Parameters:
+    func (callable): func(**inputs) -> dict of outputs, vectorized over
+        array inputs (run_cycle, or a wrapper around it).
+    ranges (dict): {input: (low, high)} box to cover.
+    outputs (iterable of str): Outputs that drive the refinement and are stored.
+    rtol (float): Split a cell where |centre - mean of corners| exceeds
+        rtol times the output's range over the coarse grid.
+    gtol (float): Also split where an output changes by more than gtol
+        times its range across the cell; None turns this off.
+    base (int): Cells per axis on the coarse grid.
+    max_level (int): Refinement levels below the coarse grid.
+    atol (dict): Absolute tolerances per output, replacing the rtol scale.
+
+    Returns:
+    AdaptiveMap: The sampled map.
+    """
+    names = tuple(ranges)
+    outputs = tuple(outputs)
+    d = len(names)
+    low = np.array([low for low, _ in ranges.values()], dtype=float)
+    high = np.array([high for _, high in ranges.values()], dtype=float)
+    resolution = base * 2**max_level
+    if float(resolution + 1) ** d >= 2.0**62:
+        raise ValueError("Too many dimensions or levels for the point lattice; lower max_level or base.")
+    dims = (resolution + 1,) * d
+    corners = np.array(list(itertools.product((0, 1), repeat=d)), dtype=np.int64)  # (2**d, d)
+
+    keys, X_all, Y_all = [], [], []
+    known = np.empty(0, dtype=np.int64)  # keys evaluated so far, sorted
+    known_index = np.empty(0, dtype=np.int64)  # their rows in Y
+
+    def evaluate(lattice):
+        """
+        Evaluate the lattice points not seen before, in one call; return indices of all of them.
+        """
+        nonlocal known, known_index
+        flat = np.ravel_multi_index(tuple(lattice.T), dims)
+        unique, inverse = np.unique(flat, return_inverse=True)
+        slot = np.searchsorted(known, unique)
+        seen = known[np.minimum(slot, max(len(known) - 1, 0))] == unique if len(known) else np.zeros(len(unique), bool)
+        rows = np.empty(len(unique), dtype=np.int64)
+        rows[seen] = known_index[slot[seen]]
+        new = unique[~seen]
+        if len(new):
+            coords = np.stack(np.unravel_index(new, dims), axis=1)
+            X = low + coords / resolution * (high - low)
+            result = func(**{name: X[:, j] for j, name in enumerate(names)})
+            Y = np.stack([np.broadcast_to(np.asarray(result[name], dtype=float), (len(new),)) for name in outputs], axis=1)
+            start = sum(len(k) for k in keys)
+            rows[~seen] = np.arange(start, start + len(new))
+            # new is sorted, so inserting at its search positions keeps known sorted.
+            known = np.insert(known, slot[~seen], new)
+            known_index = np.insert(known_index, slot[~seen], rows[~seen])
+            keys.append(new)
+            X_all.append(X)
+            Y_all.append(Y)
+        Y = np.concatenate(Y_all) if len(Y_all) > 1 else Y_all[0]
+        Y_all[:] = [Y]  # keep one array so lookups stay cheap
+        return rows[inverse], Y
+
+    # Coarse grid: every cell with its corners and centre, in one call.
+    size = 2**max_level
+    origins = np.array(list(itertools.product(range(base), repeat=d)), dtype=np.int64) * size
+    leaves = [np.empty(0, dtype=np.int64) for _ in range(max_level + 1)]
+    scale = None
+    for level in range(max_level + 1):
+        if not len(origins):
+            break
+        if level == max_level:
+            leaves[level] = np.ravel_multi_index(tuple(origins.T), dims)
+            evaluate((origins[:, None, :] + corners * size).reshape(-1, d))
+            break
+        lattice = np.concatenate([(origins[:, None, :] + corners * size).reshape(-1, d), origins + size // 2])
+        index, Y = evaluate(lattice)
+        corner_values = Y[index[:len(origins) * len(corners)]].reshape(len(origins), len(corners), -1)
+        centre_values = Y[index[len(origins) * len(corners):]]
+        if scale is None:
+            if atol is not None:
+                scale = np.array([atol[name] for name in outputs], dtype=float)
+                tolerance = 1.0
+            else:
+                spread = np.nanmax(Y, axis=0) - np.nanmin(Y, axis=0)
+                scale = np.where(spread > 0, spread, 1.0)
+                tolerance = rtol
+        with np.errstate(invalid="ignore"):
+            error = np.abs(centre_values - corner_values.mean(axis=1)) / scale
+            split = np.any(~(error <= tolerance), axis=1)  # NaN outputs also refine
+            if gtol is not None:
+                change = (np.nanmax(corner_values, axis=1) - np.nanmin(corner_values, axis=1)) / scale
+                split |= np.any(change > gtol, axis=1)
+        leaves[level] = np.ravel_multi_index(tuple(origins[~split].T), dims)
+        size //= 2
+        origins = (origins[split][:, None, :] + corners * size).reshape(-1, d)
+
+    X = np.concatenate([low + np.stack(np.unravel_index(k, dims), axis=1) / resolution * (high - low) for k in keys])
+    return AdaptiveMap(ranges, outputs, base, max_level, np.concatenate(keys), X, Y_all[0], leaves)
+
+
+def adaptive_cycle_map(ranges, outputs=("thrust", "tsfc"), rtol=1e-3, gtol=None, base=4, max_level=6, atol=None,
+                       **overrides):
+    """
+    Adaptive map of cycle outputs over a box of cycle inputs.
+
+    Parameters:
+    ranges (dict): {cycle input: (low, high)}.
+    outputs (iterable of str): Cycle outputs.
+    rtol, gtol, base, max_level, atol: See adaptive_map.
+    **overrides: Fixed cycle inputs.
+
+    Returns:
+    AdaptiveMap: The sampled map.
+    """
+    return adaptive_map(lambda **inputs: run_cycle(**overrides, **inputs), ranges, outputs, rtol, gtol, base,
+                        max_level, atol)
+
+
+def compare_uniform(adaptive, func, ranges, samples=20000, seed=0, max_points_per_axis=1025):
+    """
+    Error of an adaptive map and the uniform grid needed to match it.
+
+    Parameters:
+    adaptive (AdaptiveMap): Map to check.
+    func (callable): The function it samples.
+    ranges (dict): Its input box.
+    samples (int): Random check points.
+    seed (int): Random seed.
+    max_points_per_axis (int): Largest uniform grid tried.
+
+    Returns:
+    dict: {output: {"adaptive_error", "adaptive_evaluations",
+    "uniform_error", "uniform_evaluations"}}, with max absolute errors over
+    the check points; the uniform grid is the coarsest (doubling from the
+    coarse grid) whose error is at most the adaptive one. The adaptive
+    evaluations are shared by all outputs of the map, so compare maps of
+    one output to see the saving for that output.
+    """
+    from jetsim.interpolate import GridInterpolator
+
+    rng = np.random.default_rng(seed)
+    checks = {name: rng.uniform(low, high, samples) for name, (low, high) in ranges.items()}
+    exact = func(**checks)
+    approx = adaptive(**checks)
+    report = {}
+    for name in adaptive.outputs:
+        target = float(np.nanmax(np.abs(approx[name] - exact[name])))
+        report[name] = {"adaptive_error": target, "adaptive_evaluations": adaptive.evaluations}
+        n = adaptive._base + 1
+        while True:
+            axes = [np.linspace(low, high, n) for low, high in ranges.values()]
+            grid = np.meshgrid(*axes, indexing="ij")
+            values = np.broadcast_to(func(**{key: g for key, g in zip(ranges, grid)})[name], grid[0].shape)
+            error = float(np.nanmax(np.abs(GridInterpolator(axes, values)(*checks.values()) - exact[name])))
+            if error <= target or n >= max_points_per_axis:
+                report[name].update(uniform_error=error, uniform_evaluations=n ** len(ranges))
+                break
+            n = 2 * n - 1
+    return report
+
+
+def main(argv=None):
+    from jetsim.nozzle_offdesign import offdesign_thrust
+
+    parser = argparse.ArgumentParser(description="Adaptive map of off-design nozzle thrust against a uniform grid.")
+    parser.add_argument("--rtol", type=float, default=1e-3)
+    parser.add_argument("--max-level", type=int, default=7)
+    args = parser.parse_args(argv)
+    state = run_cycle(T06=1800.0)
+
+    def nozzle(P_back, area_ratio):
+        result = offdesign_thrust(state, area_ratio, P_back)
+        return {"thrust": result["thrust"], "M_e": result["M_e"]}
+
+    ranges = {"P_back": (5000.0, 400000.0), "area_ratio": (1.2, 3.0)}
+    adaptive = adaptive_map(nozzle, ranges, ("thrust", "M_e"), rtol=args.rtol, max_level=args.max_level)
+    print(f"Adaptive: {adaptive.evaluations} evaluations, leaves per level {adaptive.leaves_per_level}")
+    for name, row in compare_uniform(adaptive, nozzle, ranges).items():
+        print(f"{name:>7}: adaptive max error {row['adaptive_error']:.4g} with {row['adaptive_evaluations']} points; "
+              f"uniform grid {row['uniform_error']:.4g} with {row['uniform_evaluations']} points "
+              f"({row['uniform_evaluations'] / row['adaptive_evaluations']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
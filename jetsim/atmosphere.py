@@ -0,0 +1,81 @@
+"""
+International Standard Atmosphere up to 32 km, vectorized.
+"""
+import numpy as np
+
+G0 = 9.80665  # m/s^2, Standard gravity
+R_AIR = 287.05  # J/(kg*K), Specific gas constant for air
+GAMMA_AIR = 1.4  # Specific heat ratio for air
+
+# Layer base altitude (m), base temperature (K), lapse rate (K/m), base pressure (Pa)
+_LAYERS = (
+    (0.0, 288.15, -0.0065, 101325.0),
+    (11000.0, 216.65, 0.0, 22632.06),
+    (20000.0, 216.65, 0.001, 5474.889),
+)
+_TOP = 32000.0
+
+
+def standard_atmosphere(altitude):
+    """
+    Calculate static temperature, pressure and density of the standard atmosphere.
+
+    Parameters:
+    altitude (float or array): Geopotential altitude in m, 0 to 32000.
+
+    Returns:
+    tuple: Temperature (K), pressure (Pa) and density (kg/m^3).
+    """
+    h = np.asarray(altitude, dtype=float)
+    if np.any(h < 0) or np.any(h > _TOP):
+        raise ValueError(f"Altitude must be between 0 and {_TOP:.0f} m.")
+    T = np.empty_like(h)
+    P = np.empty_like(h)
+    for base, T_base, lapse, P_base in _LAYERS:
+        layer = h >= base
+        dh = h[layer] - base
+        if lapse == 0.0:
+            T[layer] = T_base
+            P[layer] = P_base * np.exp(-G0 * dh / (R_AIR * T_base))
+        else:
+            T[layer] = T_base + lapse * dh
+            P[layer] = P_base * (T[layer] / T_base) ** (-G0 / (lapse * R_AIR))
+    rho = P / (R_AIR * T)
+    return T, P, rho
+
+
+def speed_of_sound(T, gamma=GAMMA_AIR, R=R_AIR):
+    """
+    Calculate the speed of sound.
+
+    Parameters:
+    T (float or array): Static temperature in K.
+    gamma (float): Specific heat ratio.
+    R (float): Specific gas constant in J/(kg*K).
+
+    Returns:
+    float or array: Speed of sound in m/s.
+    """
+    return np.sqrt(gamma * R * T)
+
+
+def flight_condition(altitude, mach):
+    """
+    Cycle inputs for flight at an altitude and Mach number.
+
+    The freestream sets the inlet static conditions and velocity, the
+    nozzle back pressure and the flight speed used for ram drag.
+
+    Parameters:
+    altitude (float or array): Altitude in m.
+    mach (float or array): Flight Mach number.
+
+    Returns:
+    dict: Overrides for P1, T1, V1, P_ambient and u0, broadcast together.
+    """
+    altitude, mach = np.broadcast_arrays(np.asarray(altitude, dtype=float), np.asarray(mach, dtype=float))
+    if np.any(mach < 0):
+        raise ValueError("Flight Mach number cannot be negative.")
+    T, P, _ = standard_atmosphere(altitude)
+    V = mach * speed_of_sound(T)
+    return {"P1": P, "T1": T, "V1": V, "P_ambient": P, "u0": V}
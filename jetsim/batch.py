@@ -0,0 +1,355 @@
+"""
+Bulk case-file runner.
+
+Streams case definitions from CSV or JSON Lines, converts them into array
+batches, runs the cycle on each batch and streams the results back out
+row by row. Reading, computing and writing run in separate threads joined
+by bounded queues, so parsing the next chunk overlaps with the cycle.
+
+    python -m jetsim.batch cases.csv results.csv --outputs thrust,tsfc,T04
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import queue
+import threading
+
+import numpy as np
+
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, run_cycle
+
+CASE_ID = "case_id"  # optional pass-through column naming each case
+
+
+def file_format(path):
+    """
+    Tell a case or results file's format from its extension.
+
+    Parameters:
+    path (str): File path.
+
+    Returns:
+    str: "csv" for .csv, "jsonl" for .jsonl or .ndjson; anything else
+    raises ValueError.
+    """
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot tell the format of '{path}'; use a .csv or .jsonl file.")
+
+
+def parse_number(value, name, where):
+    """
+    Convert a case value to a finite float, or raise ValueError naming the
+    column and the file location `where` ("path:line").
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{where}: '{name}' must be a number, got {value!r}.")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: '{name}' must be a number, got {value!r}.") from None
+    if not math.isfinite(number):
+        raise ValueError(f"{where}: '{name}' must be finite, got {value!r}.")
+    return number
+
+
+def _csv_records(handle, path):
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    for name in header:
+        if name != CASE_ID and name not in DESIGN_POINT:
+            raise ValueError(f"{path}:1: unknown column '{name}'.")
+    for row in reader:
+        if not row:
+            continue
+        where = f"{path}:{reader.line_num}"
+        if len(row) != len(header):
+            raise ValueError(f"{where}: expected {len(header)} fields, got {len(row)}.")
+        # Blank cells fall back to the design point.
+        yield where, {name: value for name, value in zip(header, row) if value.strip()}
+
+
+def _jsonl_records(handle, path):
+    for line_number, line in enumerate(handle, 1):
+        if not line.strip():
+            continue
+        where = f"{path}:{line_number}"
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{where}: invalid JSON ({exc.msg}).") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"{where}: each line must be a JSON object.")
+        for name in record:
+            if name != CASE_ID and name not in DESIGN_POINT:
+                raise ValueError(f"{where}: unknown field '{name}'.")
+        yield where, record
+
+
+def case_records(handle, path):
+    """
+    Stream the cases of an open CSV or JSON Lines case file, unparsed.
+
+    Parameters:
+    handle (file): The case file, opened with newline="".
+    path (str): Its path, for the format and error locations.
+
+    Yields:
+    tuple: ("path:line", {column: raw value}) for each case, with unknown
+    columns rejected and blank CSV cells left out.
+    """
+    records = _csv_records if file_format(path) == "csv" else _jsonl_records
+    return records(handle, path)
+
+
+def read_cases(path, chunk_size=4096):
+    """
+    Stream validated cases from a CSV or JSON Lines file in array batches.
+
+    Parameters:
+    path (str): Case file (.csv, .jsonl or .ndjson).
+    chunk_size (int): Cases per batch.
+
+    Yields:
+    tuple: (number of cases, case ids or None, dict of input arrays) for
+    each batch. Inputs missing from every case in the batch are left out
+    and take their design-point values.
+    """
+    with open(path, newline="") as handle:
+        chunk = []
+        for where, record in case_records(handle, path):
+            case = {}
+            for name, value in record.items():
+                case[name] = str(value) if name == CASE_ID else parse_number(value, name, where)
+            chunk.append(case)
+            if len(chunk) == chunk_size:
+                yield _to_arrays(chunk)
+                chunk = []
+        if chunk:
+            yield _to_arrays(chunk)
+
+
+def has_case_ids(path):
+    """
+    Tell whether a case file names its cases, so the results can get a
+    case_id column before the first case is run.
+
+    Parameters:
+    path (str): Case file (.csv, .jsonl or .ndjson).
+
+    Returns:
+    bool: True if the CSV header has a case_id column, or any JSON Lines
+    record has a case_id field (the file is scanned once for it).
+    """
+    with open(path, newline="") as handle:
+        if file_format(path) == "csv":
+            header = next(csv.reader(handle), None)
+            return header is not None and CASE_ID in (name.strip() for name in header)
+        for line in handle:
+            if CASE_ID not in line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # reported with its line number when the cases are read
+            if isinstance(record, dict) and CASE_ID in record:
+                return True
+    return False
+
+
+def _to_arrays(chunk):
+    n = len(chunk)
+    names = set()
+    for case in chunk:
+        names.update(case)
+    ids = [case.get(CASE_ID, "") for case in chunk] if CASE_ID in names else None
+    names.discard(CASE_ID)
+    inputs = {
+        name: np.fromiter((case.get(name, DESIGN_POINT[name]) for case in chunk), float, n)
+        for name in sorted(names)
+    }
+    return n, ids, inputs
+
+
+class ResultWriter:
+    """
+    Row writer for a CSV or JSON Lines results file.
+
+    Parameters:
+    path (str): Output file (.csv or .jsonl).
+    columns (list of str): Column names, in row order.
+    append (bool): Add to an existing file; the CSV header is written only
+        if the file is new or empty.
+    """
+
+    def __init__(self, path, columns, append=False):
+        self.format = file_format(path)
+        self.columns = columns
+        continuing = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.handle = open(path, "a" if append else "w", newline="")
+        if self.format == "csv":
+            self.csv = csv.writer(self.handle)
+            if not continuing:
+                self.csv.writerow(columns)
+
+    def write(self, rows):
+        """
+        Write an iterable of row tuples in column order.
+        """
+        if self.format == "csv":
+            self.csv.writerows(rows)
+        else:
+            self.handle.writelines(
+                json.dumps(dict(zip(self.columns, row))) + "\n" for row in rows
+            )
+
+    def close(self):
+        self.handle.close()
+
+
+def queue_put(out_queue, item, stop):
+    """
+    Put an item on a bounded queue, giving up once `stop` is set.
+
+    Returns:
+    bool: True if the item was queued.
+    """
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def queue_get(in_queue, stop):
+    """
+    Take the next item from a queue, re-raising it if it is an exception.
+
+    Returns:
+    The item, or None once `stop` is set and the queue is empty.
+    """
+    while True:
+        try:
+            item = in_queue.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return None
+            continue
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+
+def _produce(source, out_queue, stop):
+    try:
+        for item in source:
+            if not queue_put(out_queue, item, stop):
+                return
+        queue_put(out_queue, None, stop)
+    except BaseException as exc:
+        queue_put(out_queue, exc, stop)
+
+
+def run_batch(cases_path, results_path, outputs=CYCLE_OUTPUTS, chunk_size=4096, prefetch=4, post=()):
+    """
+    Run every case in a case file and stream the results to a file.
+
+    Parameters:
+    cases_path (str): Input case file (.csv or .jsonl).
+    results_path (str): Output file (.csv or .jsonl).
+    outputs (iterable of str): Cycle outputs to write for each case.
+    chunk_size (int): Cases per vectorized cycle run.
+    prefetch (int): Chunks buffered between the reader, the cycle and the writer.
+    post (iterable): Post-processing stages run on each chunk's cycle state
+        in order, each a callable(state) -> dict of new columns with an
+        `outputs` attribute naming them (e.g. emissions.Emissions()).
+
+    Returns:
+    int: Number of cases run.
+
+    The results get a case_id column if the case file has one (see
+    has_case_ids), left blank for cases without an id.
+    """
+    outputs = tuple(outputs)
+    post = tuple(post)
+    added = {name for stage in post for name in stage.outputs}
+    for name in outputs:
+        if name not in CYCLE_OUTPUTS and name not in DESIGN_POINT and name not in added:
+            raise ValueError(f"Unknown cycle output '{name}'.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    with_ids = has_case_ids(cases_path)
+    stop = threading.Event()
+    parsed = queue.Queue(prefetch)
+    computed = queue.Queue(prefetch)
+    reader = threading.Thread(target=_produce, args=(read_cases(cases_path, chunk_size), parsed, stop), daemon=True)
+    writer = ResultWriter(results_path, ([CASE_ID] if with_ids else []) + list(outputs))
+    writer_thread = None
+    writer_errors = []
+    count = 0
+    reader.start()
+    try:
+        item = queue_get(parsed, stop)
+
+        def write_all():
+            try:
+                while True:
+                    rows = queue_get(computed, stop)
+                    if rows is None:
+                        return
+                    writer.write(rows)
+            except BaseException as exc:
+                writer_errors.append(exc)
+                stop.set()
+
+        writer_thread = threading.Thread(target=write_all, daemon=True)
+        writer_thread.start()
+        while item is not None:
+            n, ids, inputs = item
+            state = run_cycle(**inputs)
+            for stage in post:
+                state.update(stage(state))
+            columns = [np.broadcast_to(state[name], (n,)).tolist() for name in outputs]
+            if with_ids:
+                columns.insert(0, ids if ids is not None else [""] * n)
+            if not queue_put(computed, list(zip(*columns)), stop):
+                break
+            count += n
+            item = queue_get(parsed, stop)
+        queue_put(computed, None, stop)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        if writer_thread is not None:
+            writer_thread.join()
+        stop.set()
+        writer.close()
+    if writer_errors:
+        raise writer_errors[0]
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a CSV or JSON Lines file of engine cases through the cycle.")
+    parser.add_argument("cases", help="Input case file (.csv or .jsonl).")
+    parser.add_argument("results", help="Output file (.csv or .jsonl).")
+    parser.add_argument("--outputs", default=",".join(CYCLE_OUTPUTS), help="Comma-separated cycle outputs to write.")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args(argv)
+    count = run_batch(args.cases, args.results, args.outputs.split(","), args.chunk_size)
+    print(f"Ran {count} cases into {args.results}")
+
+
+if __name__ == "__main__":
+    main()
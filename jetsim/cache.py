@@ -0,0 +1,185 @@
+"""
+Content-addressed on-disk cache of cycle results.
+
+Entries are keyed by a hash of the input arrays, any extra parameters and
+the kernel code version (the source of the station functions and the
+cycle), so a code change never serves stale results. Each entry is a
+compressed .npz file written atomically; the least recently used entries
+are evicted once the cache grows past its size budget. Several processes
+can share one cache directory.
+"""
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from jetsim import cycle
+from jetsim.cycle import CYCLE_OUTPUTS, cycle_inputs, run_stations
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "jetsim", "results")
+
+
+@functools.lru_cache(maxsize=None)
+def kernel_version():
+    """
+    Hash of the station and cycle source code.
+
+    Returns:
+    str: Hex digest that changes whenever any kernel source file changes.
+    """
+    digest = hashlib.sha256()
+    modules = [cycle.inlet_functions, cycle.compressor_functions, cycle.combustor_functions,
+               cycle.turbine_functions, cycle.afterburner_functions, cycle.nozzle_functions, cycle]
+    for module in modules:
+        with open(module.__file__, "rb") as handle:
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def hash_inputs(inputs, params=None):
+    """
+    Build a cache key from input arrays and extra parameters.
+
+    Parameters:
+    inputs (dict): Named floats or arrays.
+    params (dict): Extra JSON-serializable parameters that change the result.
+
+    Returns:
+    str: Hex digest key.
+    """
+    digest = hashlib.sha256(kernel_version().encode())
+    for name in sorted(inputs):
+        value = np.ascontiguousarray(inputs[name], dtype=np.result_type(inputs[name], float))
+        digest.update(f"{name}|{value.dtype.str}|{value.shape}|".encode())
+        digest.update(value.tobytes())
+    digest.update(json.dumps(params or {}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory of compressed result arrays with LRU size-based eviction.
+
+    Parameters:
+    directory (str): Cache directory, shared by all workers using it.
+    max_bytes (int): Size budget; the least recently used entries are removed beyond it.
+    """
+
+    def __init__(self, directory=None, max_bytes=1 << 30):
+        self.directory = directory or os.environ.get("JETSIM_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key):
+        """
+        Load a cached entry.
+
+        Parameters:
+        key (str): Key from hash_inputs.
+
+        Returns:
+        dict: Arrays stored under the key, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # A damaged entry is a miss; drop it so it gets rewritten.
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Store arrays under a key, then evict old entries if over budget.
+
+        Parameters:
+        key (str): Key from hash_inputs.
+        arrays (dict): Named arrays to store.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez_compressed(handle, **arrays)
+            os.replace(tmp_path, self._path(key))  # atomic, readers never see a partial file
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits its budget."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".npz") or entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every entry."""
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".npz"):
+                    self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def cached_run_cycle(cache, outputs=CYCLE_OUTPUTS, **overrides):
+    """
+    Run the cycle through a result cache.
+
+    Parameters:
+    cache (ResultCache): Cache to read from and fill.
+    outputs (iterable of str): Cycle outputs to return and store.
+    **overrides: Input values (floats or arrays) replacing the design point.
+
+    Returns:
+    dict: The requested outputs as arrays.
+    """
+    outputs = tuple(outputs)
+    inputs = cycle_inputs(**overrides)
+    key = hash_inputs(inputs, {"outputs": outputs})
+    result = cache.get(key)
+    if result is None:
+        state = run_stations(dict(inputs))
+        result = {name: np.asarray(state[name]) for name in outputs}
+        cache.put(key, result)
+    return result
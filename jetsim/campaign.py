@@ -0,0 +1,495 @@
+"""
+Long sweeps and Monte Carlo runs with checkpoint and resume.
+
+A run is cut into fixed chunks of cases. Each chunk is one vectorized
+cycle call reduced at once to streaming statistics (count, mean, sum of
+squared deviations, min, max per output), so results never have to sit in
+memory. Every few seconds, and when the run stops, the checkpoint file is
+rewritten atomically with the bitmap of finished chunks, the per-chunk
+statistics and the random seed. A restart with the same arguments skips
+the finished chunks.
+
+Monte Carlo chunks draw from their own random stream, derived from the run
+seed and the chunk index, so a chunk gives the same samples whenever it
+runs. The final statistics merge the per-chunk ones in chunk order, so the
+result is identical however many times the run was interrupted.
+
+    python -m jetsim.campaign sweep run.ckpt rp=10:40:61 f=0.015:0.025:41 T06=2000:2400:21 M_e=1.2:2.5:27
+    python -m jetsim.campaign montecarlo run.ckpt --samples 10000000 --set eta_c=0.85:0.89
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from jetsim.cache import kernel_version
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, run_cycle
+
+CHECKPOINT_VERSION = 1
+STATISTICS = ("count", "mean", "m2", "min", "max")  # per chunk and output, in this order
+
+
+def chunk_statistics(values):
+    """
+    Streaming statistics of one chunk, ignoring NaN.
+
+    Parameters:
+    values (array): Shape (cases, outputs).
+
+    Returns:
+    array: Shape (outputs, len(STATISTICS)).
+    """
+    finite = np.isfinite(values)
+    count = finite.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(finite, values, 0.0).sum(axis=0) / count
+        m2 = np.where(finite, (values - mean) ** 2, 0.0).sum(axis=0)
+    low = np.where(finite, values, np.inf).min(axis=0)
+    high = np.where(finite, values, -np.inf).max(axis=0)
+    return np.stack([count, np.where(count > 0, mean, 0.0), m2, low, high], axis=1)
+
+
+def merge_statistics(chunks):
+    """
+    Merge per-chunk statistics in order (Chan et al. pairwise update).
+
+    Parameters:
+    chunks (array): Shape (chunks, outputs, len(STATISTICS)).
+
+    Returns:
+    array: Shape (outputs, len(STATISTICS)) for all chunks together.
+    """
+    total = np.zeros(chunks.shape[1:])
+    total[:, 3], total[:, 4] = np.inf, -np.inf
+    for chunk in chunks:
+        n_a, n_b = total[:, 0], chunk[:, 0]
+        n = n_a + n_b
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = chunk[:, 1] - total[:, 1]
+            mean = np.where(n > 0, total[:, 1] + delta * n_b / n, 0.0)
+            m2 = total[:, 2] + chunk[:, 2] + np.where(n > 0, delta**2 * n_a * n_b / n, 0.0)
+        total = np.stack([n, mean, m2, np.minimum(total[:, 3], chunk[:, 3]),
+                          np.maximum(total[:, 4], chunk[:, 4])], axis=1)
+    return total
+
+
+def summarize(outputs, statistics):
+    """
+    Turn merged statistics into {output: {"count", "mean", "std", "min", "max"}}.
+    """
+    summary = {}
+    for name, (count, mean, m2, low, high) in zip(outputs, statistics):
+        empty = count == 0
+        summary[name] = {
+            "count": int(count),
+            "mean": float("nan") if empty else float(mean),
+            "std": float("nan") if count < 2 else float(np.sqrt(m2 / (count - 1))),
+            "min": float("nan") if empty else float(low),
+            "max": float("nan") if empty else float(high),
+        }
+    return summary
+
+
+class Checkpoint:
+    """
+    Checkpoint file of a chunked run.
+
+    Parameters:
+    path (str): Checkpoint file (.npz); loaded if it exists.
+    spec (dict): JSON-serializable description of the run; a checkpoint
+        written for a different spec, or by different kernel code, is refused.
+    chunks (int): Number of chunks in the run.
+    outputs (tuple of str): Outputs with statistics.
+    """
+
+    def __init__(self, path, spec, chunks, outputs):
+        self.path = path
+        self.fingerprint = hashlib.sha256(
+            json.dumps({"spec": spec, "kernel": kernel_version()}, sort_keys=True).encode()).hexdigest()
+        self.done = np.zeros(chunks, dtype=bool)
+        self.statistics = np.zeros((chunks, len(outputs), len(STATISTICS)))
+        self.entropy = None
+        self.resumed = 0
+        if path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                header = json.loads(str(data["header"]))
+                done = np.unpackbits(data["done"], count=len(self.done)).astype(bool)
+                statistics = data["statistics"]
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as exc:
+            raise ValueError(f"'{self.path}' is not a readable checkpoint ({exc}).") from None
+        if header.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint version {header.get('version')} is not supported "
+                             f"(expected {CHECKPOINT_VERSION}).")
+        if header["fingerprint"] != self.fingerprint or statistics.shape != self.statistics.shape:
+            raise ValueError(f"'{self.path}' was written for a different run or kernel version; "
+                             "remove it to start over.")
+        self.done, self.statistics = done, statistics
+        self.entropy = header["entropy"]
+        self.resumed = int(done.sum())
+
+    def save(self):
+        """
+        Write the checkpoint atomically.
+        """
+        if not self.path:
+            return
+        header = json.dumps({"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint,
+                             "entropy": self.entropy})
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-ckpt-", suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez_compressed(handle, header=np.array(header), done=np.packbits(self.done),
+                                    statistics=self.statistics)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)  # a preempted write leaves the previous checkpoint intact
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def sweep_spec(axes, outputs=("thrust", "tsfc"), chunk_size=65536, **overrides):
+    """
+    Describe a full-grid sweep as a JSON-serializable run spec.
+
+    Parameters:
+    axes (dict): {cycle input: 1-d array of values}; the grid is their
+        outer product, flattened in C order.
+    outputs (iterable of str): Cycle outputs to summarize.
+    chunk_size (int): Grid points per chunk.
+    **overrides: Fixed cycle inputs.
+
+    Returns:
+    dict: Run spec for chunk_count, chunk_evaluator and Checkpoint.
+    """
+    outputs = tuple(outputs)
+    _check_names(tuple(axes), outputs, overrides)
+    return {"kind": "sweep", "axes": {name: np.asarray(values, dtype=float).tolist() for name, values in axes.items()},
+            "outputs": list(outputs), "chunk_size": int(chunk_size), "overrides": _floats(overrides)}
+
+
+def monte_carlo_spec(ranges, samples, outputs=("thrust", "tsfc"), chunk_size=65536, **overrides):
+    """
+    Describe a Monte Carlo run as a JSON-serializable run spec.
+
+    Parameters:
+    ranges (dict): {cycle input: (low, high)} drawn uniformly, or
+        {cycle input: ("normal", mean, std)}.
+    samples (int): Total number of samples.
+    outputs (iterable of str): Cycle outputs to summarize.
+    chunk_size (int): Samples per chunk.
+    **overrides: Fixed cycle inputs.
+
+    Returns:
+    dict: Run spec for chunk_count, chunk_evaluator and Checkpoint.
+    """
+    outputs = tuple(outputs)
+    _check_names(tuple(ranges), outputs, overrides)
+    distributions = {}
+    for name, spec in ranges.items():
+        if len(spec) == 2:
+            distributions[name] = ["uniform", float(spec[0]), float(spec[1])]
+        elif len(spec) == 3 and spec[0] in ("uniform", "normal"):
+            distributions[name] = [spec[0], float(spec[1]), float(spec[2])]
+        else:
+            raise ValueError(f"'{name}': expected (low, high) or ('normal', mean, std).")
+    return {"kind": "montecarlo", "distributions": distributions, "samples": int(samples), "outputs": list(outputs),
+            "chunk_size": int(chunk_size), "overrides": _floats(overrides)}
+
+
+def _cases(spec):
+    if spec["kind"] == "sweep":
+        return int(np.prod([len(values) for values in spec["axes"].values()]))
+    return spec["samples"]
+
+
+def input_names(spec):
+    """
+    Inputs varied by a run spec, in order.
+    """
+    return list(spec["axes"] if spec["kind"] == "sweep" else spec["distributions"])
+
+
+def chunk_count(spec):
+    """
+    Number of chunks in a run spec.
+    """
+    return -(-_cases(spec) // spec["chunk_size"])
+
+
+def chunk_evaluator(spec, entropy=None):
+    """
+    Build the function that evaluates one chunk of a run spec.
+
+    Parameters:
+    spec (dict): From sweep_spec or monte_carlo_spec.
+    entropy (int): Run seed, needed for Monte Carlo specs.
+
+    Returns:
+    callable: evaluate(chunk) -> array of outputs, shape (cases in chunk,
+    outputs); evaluate(chunk, with_inputs=True) -> (case indices, input
+    array, output array), with inputs in the spec's order.
+    """
+    chunk_size, total, outputs = spec["chunk_size"], _cases(spec), spec["outputs"]
+    overrides = spec["overrides"]
+    if spec["kind"] == "sweep":
+        names = tuple(spec["axes"])
+        axes = [np.asarray(spec["axes"][name]) for name in names]
+        shape = tuple(len(axis) for axis in axes)
+
+        def inputs(chunk):
+            index = np.unravel_index(np.arange(chunk * chunk_size, min((chunk + 1) * chunk_size, total)), shape)
+            return {name: axis[i] for name, axis, i in zip(names, axes, index)}
+    elif spec["kind"] == "montecarlo":
+        if entropy is None:
+            raise ValueError("A Monte Carlo run needs its seed.")
+
+        def inputs(chunk):
+            n = min(chunk_size, total - chunk * chunk_size)
+            rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(chunk,)))
+            return {name: rng.uniform(a, b, n) if kind == "uniform" else rng.normal(a, b, n)
+                    for name, (kind, a, b) in spec["distributions"].items()}
+    else:
+        raise ValueError(f"Unknown run kind '{spec['kind']}'.")
+
+    def evaluate(chunk, with_inputs=False):
+        if not 0 <= chunk < chunk_count(spec):
+            raise ValueError(f"Chunk {chunk} is outside the run.")
+        cases = inputs(chunk)
+        n = len(next(iter(cases.values())))
+        result = run_cycle(**overrides, **cases)
+        values = np.stack([np.broadcast_to(np.asarray(result[name], dtype=float), (n,)) for name in outputs], axis=1)
+        if not with_inputs:
+            return values
+        return np.arange(chunk * chunk_size, chunk * chunk_size + n), np.stack(list(cases.values()), axis=1), values
+
+    return evaluate
+
+
+def open_checkpoint(path, spec, seed=None):
+    """
+    Open (or start) the checkpoint of a run spec and settle its seed.
+
+    Parameters:
+    path (str): Checkpoint file; None keeps the state in memory only.
+    spec (dict): From sweep_spec or monte_carlo_spec.
+    seed (int): Run seed; None reuses the checkpoint's or draws a fresh one.
+
+    Returns:
+    Checkpoint: With entropy set for Monte Carlo specs.
+    """
+    checkpoint = Checkpoint(path, spec, chunk_count(spec), spec["outputs"])
+    if spec["kind"] == "montecarlo":
+        if checkpoint.entropy is None:
+            checkpoint.entropy = int(np.random.SeedSequence(seed).entropy)
+        elif seed is not None and int(seed) != checkpoint.entropy:
+            raise ValueError(f"'{path}' was written with seed {checkpoint.entropy}, not {seed}.")
+    return checkpoint
+
+
+def checkpoint_summary(checkpoint, outputs, run=0):
+    """
+    Summary statistics of the finished chunks, with a "progress" entry.
+    """
+    summary = summarize(outputs, merge_statistics(checkpoint.statistics[checkpoint.done]))
+    summary["progress"] = {"chunks": len(checkpoint.done), "done": int(checkpoint.done.sum()),
+                           "resumed": checkpoint.resumed, "run": run}
+    if checkpoint.entropy is not None:
+        summary["seed"] = checkpoint.entropy
+    return summary
+
+
+def run_chunks(spec, checkpoint=None, seed=None, every=30.0, max_chunks=None):
+    """
+    Evaluate the unfinished chunks of a run spec in order, saving the
+    checkpoint every `every` seconds and when the run stops.
+
+    Parameters:
+    spec (dict): From sweep_spec or monte_carlo_spec.
+    checkpoint (str): Checkpoint file; None runs without one.
+    seed (int): Run seed (Monte Carlo); see open_checkpoint.
+    every (float): Seconds between checkpoint writes.
+    max_chunks (int): Stop after this many chunks in this call (for
+        time-limited jobs); None runs to the end.
+
+    Returns:
+    dict: {output: {"count", "mean", "std", "min", "max"}} over the
+    finished chunks, "progress": {"chunks", "done", "resumed", "run"} and,
+    for Monte Carlo, "seed".
+    """
+    state = open_checkpoint(checkpoint, spec, seed)
+    evaluate = chunk_evaluator(spec, state.entropy)
+    saved = time.monotonic()
+    run = 0
+    try:
+        for chunk in np.flatnonzero(~state.done):
+            if max_chunks is not None and run >= max_chunks:
+                break
+            state.statistics[chunk] = chunk_statistics(evaluate(int(chunk)))
+            state.done[chunk] = True
+            run += 1
+            if time.monotonic() - saved >= every:
+                state.save()
+                saved = time.monotonic()
+    finally:
+        # Also on interrupts: keep whatever finished.
+        state.save()
+    return checkpoint_summary(state, spec["outputs"], run)
+
+
+def run_sweep(axes, outputs=("thrust", "tsfc"), checkpoint=None, chunk_size=65536, every=30.0, max_chunks=None,
+              **overrides):
+    """
+    Statistics of cycle outputs over a full grid, with checkpoint and resume.
+
+    Parameters:
+    axes (dict): {cycle input: 1-d array of values}; the grid is their
+        outer product, flattened in C order.
+    outputs (iterable of str): Cycle outputs to summarize.
+    checkpoint (str): Checkpoint file; None runs without one.
+    chunk_size (int): Grid points per chunk.
+    every, max_chunks: See run_chunks.
+    **overrides: Fixed cycle inputs.
+
+    Returns:
+    dict: See run_chunks.
+    """
+    return run_chunks(sweep_spec(axes, outputs, chunk_size, **overrides), checkpoint, None, every, max_chunks)
+
+
+def run_monte_carlo(ranges, samples, outputs=("thrust", "tsfc"), checkpoint=None, seed=None, chunk_size=65536,
+                    every=30.0, max_chunks=None, **overrides):
+    """
+    Monte Carlo statistics of cycle outputs, with checkpoint and resume.
+
+    Parameters:
+    ranges (dict): {cycle input: (low, high)} drawn uniformly, or
+        {cycle input: ("normal", mean, std)}.
+    samples (int): Total number of samples.
+    outputs (iterable of str): Cycle outputs to summarize.
+    checkpoint (str): Checkpoint file; None runs without one.
+    seed (int): Run seed; None draws a fresh one, which the checkpoint
+        keeps so a resumed run continues the same streams.
+    chunk_size (int): Samples per chunk.
+    every, max_chunks: See run_chunks.
+    **overrides: Fixed cycle inputs.
+
+    Returns:
+    dict: See run_chunks.
+    """
+    spec = monte_carlo_spec(ranges, samples, outputs, chunk_size, **overrides)
+    return run_chunks(spec, checkpoint, seed, every, max_chunks)
+
+
+def _check_names(inputs, outputs, overrides):
+    for name in (*inputs, *overrides):
+        if name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle input '{name}'.")
+    for name in outputs:
+        if name not in CYCLE_OUTPUTS and name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle output '{name}'.")
+
+
+def _floats(overrides):
+    return {name: float(value) for name, value in overrides.items()}
+
+
+def _axis(text):
+    name, _, spec = text.partition("=")
+    start, stop, count = spec.split(":")
+    return name.strip(), np.linspace(float(start), float(stop), int(count))
+
+
+def _range(text):
+    name, _, spec = text.partition("=")
+    low, high = spec.split(":")
+    return name.strip(), (float(low), float(high))
+
+
+def on_sigterm(signum, frame):
+    """
+    SIGTERM handler for preemptible runs: unwind through the run so its
+    checkpoint is written.
+    """
+    sys.exit(128 + signum)
+
+
+def add_run_commands(commands, common):
+    """
+    Add the sweep and montecarlo subcommands, sharing the `common` options.
+    """
+    common.add_argument("--outputs", default="thrust,tsfc", help="Comma-separated cycle outputs.")
+    common.add_argument("--chunk-size", type=int, default=65536)
+    sweep = commands.add_parser("sweep", parents=[common], help="Full grid over the given axes.")
+    sweep.add_argument("axes", type=_axis, nargs="+", metavar="NAME=START:STOP:COUNT")
+    montecarlo = commands.add_parser("montecarlo", parents=[common], help="Uniform random samples.")
+    montecarlo.add_argument("--samples", type=int, default=1 << 22)
+    montecarlo.add_argument("--set", type=_range, action="append", default=[], metavar="NAME=LOW:HIGH",
+                            help="Input drawn uniformly between LOW and HIGH; repeat for more.")
+    montecarlo.add_argument("--seed", type=int)
+
+
+def spec_from_args(args, parser):
+    """
+    Run spec from the options of add_run_commands; bad values end in parser.error.
+    """
+    outputs = [name.strip() for name in args.outputs.split(",") if name.strip()]
+    try:
+        if args.command == "sweep":
+            return sweep_spec(dict(args.axes), outputs, args.chunk_size)
+        if not args.set:
+            parser.error("give at least one --set NAME=LOW:HIGH")
+        return monte_carlo_spec(dict(args.set), args.samples, outputs, args.chunk_size)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+def print_summary(summary, elapsed):
+    """
+    Print a run summary from run_chunks and the seconds it took.
+    """
+    summary = dict(summary)
+    progress = summary.pop("progress")
+    seed = summary.pop("seed", None)
+    print(f"{progress['done']}/{progress['chunks']} chunks done ({progress['resumed']} from the checkpoint, "
+          f"{progress['run']} run in {elapsed:.1f} s)" + (f", seed {seed}" if seed is not None else ""))
+    for name, stats in summary.items():
+        print(f"{name:>14}: n {stats['count']}, mean {stats['mean']:.6g}, std {stats['std']:.6g}, "
+              f"min {stats['min']:.6g}, max {stats['max']:.6g}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweeps and Monte Carlo runs with checkpoint and resume.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("checkpoint", help="Checkpoint file; an existing one is resumed.")
+    common.add_argument("--every", type=float, default=30.0, help="Seconds between checkpoint writes.")
+    common.add_argument("--max-chunks", type=int, help="Stop after this many chunks.")
+    add_run_commands(commands, common)
+    args = parser.parse_args(argv)
+
+    spec = spec_from_args(args, parser)
+    signal.signal(signal.SIGTERM, on_sigterm)
+    started = time.perf_counter()
+    try:
+        summary = run_chunks(spec, args.checkpoint, getattr(args, "seed", None), args.every, args.max_chunks)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print_summary(summary, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
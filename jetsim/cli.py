@@ -0,0 +1,232 @@
+"""
+The jetsim command.
+
+    jetsim run [--set rp=25] [--outputs thrust,tsfc] [--json] [--no-plot]
+    jetsim sweep rp=10:40:31 [f=0.015:0.025:5] [--set ...] [-o sweep.csv]
+    jetsim plot rp=10:40:31 --y thrust,tsfc [--save sweep.png]
+    jetsim <tool> ...   batch, serve, deck, reheat, nozzle, gaspath, fleet, precision,
+                        dashboard, surrogate, adaptive, mission, campaign,
+                        distributed, feasibility, moc, fidelity,
+                        emissions, equilibrium, inlet_matching, pipeline
+
+Everything beyond the standard library is imported inside the command that
+needs it: jetsim run --no-plot works on Python floats and never imports
+numpy, so it starts in about the time of the interpreter itself.
+"""
+import argparse
+import importlib
+import sys
+
+# Tool subcommands, forwarded to the module's own command line.
+TOOLS = {
+    "batch": ("jetsim.batch", "Run a case file through the cycle."),
+    "serve": ("jetsim.service", "Serve cycle evaluations over HTTP."),
+    "deck": ("jetsim.deck", "Build or check an engine performance deck."),
+    "reheat": ("jetsim.reheat", "Print a wet/dry thrust table."),
+    "nozzle": ("jetsim.nozzle_offdesign", "Off-design nozzle altitude sweep."),
+    "gaspath": ("jetsim.gaspath", "Gas-path analysis of sensor logs."),
+    "fleet": ("jetsim.fleet", "Fleet health estimation demo."),
+    "precision": ("jetsim.precision", "float32 error report."),
+    "dashboard": ("jetsim.dashboard", "Interactive what-if slider dashboard."),
+    "surrogate": ("jetsim.surrogate", "Fit and cross-validate a cycle surrogate."),
+    "adaptive": ("jetsim.adaptive", "Adaptive parameter-space refinement demo."),
+    "mission": ("jetsim.mission", "Fuel burn over many missions."),
+    "campaign": ("jetsim.campaign", "Checkpointed sweeps and Monte Carlo runs."),
+    "distributed": ("jetsim.distributed", "Sweeps and Monte Carlo runs sharded over TCP workers."),
+    "feasibility": ("jetsim.feasibility", "Time feasibility pruning on mostly infeasible sweeps."),
+    "moc": ("jetsim.moc", "Minimum-length nozzle contour by the method of characteristics."),
+    "fidelity": ("jetsim.fidelity", "Ideal, detailed and automatic per-station model fidelity."),
+    "emissions": ("jetsim.emissions", "Run a case file with combustor emission indices added."),
+    "equilibrium": ("jetsim.equilibrium", "Build the combustion-product equilibrium table and compare with the ideal cycle."),
+    "inlet_matching": ("jetsim.inlet_matching", "Match inlet capture, spillage and recovery to the engine over the envelope."),
+    "pipeline": ("jetsim.pipeline", "Run a case file through concurrent station workers with per-stage occupancy."),
+}
+
+# Station labels with their stagnation (or freestream/exit static) temperature and pressure.
+STATION_PROFILE = (("1", "T1", "P1"), ("2", "T02", "P02"), ("3", "T03", "P03"), ("4", "T04", "P04"),
+                   ("5", "T05", "P05"), ("6", "T06", "P06"), ("e", "T_e", "P_e"))
+
+
+def _assignment(text):
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected name=value, got '{text}'")
+    try:
+        return name.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{name}' must be a number, got '{value}'") from None
+
+
+def _axis(text):
+    """
+    Parse name=start:stop:count or name=v1,v2,... into a name and a list of values.
+    """
+    name, sep, spec = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected name=start:stop:count or name=v1,v2,..., got '{text}'")
+    try:
+        if ":" in spec:
+            start, stop, count = spec.split(":")
+            start, stop, count = float(start), float(stop), int(count)
+            if count < 1:
+                raise ValueError
+            step = (stop - start) / (count - 1) if count > 1 else 0.0
+            return name.strip(), [start + i * step for i in range(count)]
+        return name.strip(), [float(value) for value in spec.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"cannot read the values of '{text}'") from None
+
+
+def _outputs(text):
+    return [name.strip() for name in text.split(",") if name.strip()]
+
+
+def _check_outputs(parser, names, cycle):
+    for name in names:
+        if name not in cycle.CYCLE_OUTPUTS and name not in cycle.DESIGN_POINT:
+            parser.error(f"unknown cycle output '{name}'")
+
+
+def _require_matplotlib(parser):
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        parser.error("plots need matplotlib (pip install 'jetsim[plot]'); pass --no-plot to skip them")
+    return plt
+
+
+def _run(args, parser):
+    from jetsim import cycle
+
+    outputs = args.outputs or list(cycle.CYCLE_OUTPUTS)
+    _check_outputs(parser, outputs, cycle)
+    try:
+        state = cycle.run_cycle(**dict(args.set))
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.json:
+        import json
+
+        print(json.dumps({name: float(state[name]) for name in outputs}))
+    else:
+        for name in outputs:
+            print(f"{name:>14} {float(state[name]):.6g}")
+    if not args.no_plot:
+        plt = _require_matplotlib(parser)
+        labels = [label for label, _, _ in STATION_PROFILE]
+        figure, (temperature, pressure) = plt.subplots(2, 1, sharex=True)
+        temperature.plot(labels, [state[T] for _, T, _ in STATION_PROFILE], "o-")
+        temperature.set_ylabel("Temperature (K)")
+        pressure.plot(labels, [state[P] / 1000 for _, _, P in STATION_PROFILE], "o-")
+        pressure.set_ylabel("Pressure (kPa)")
+        pressure.set_xlabel("Station")
+        figure.suptitle(f"Thrust {state['thrust'] / 1000:.1f} kN, TSFC {state['tsfc'] * 1e6:.2f} mg/(N*s)")
+        _finish_plot(plt, args.save)
+
+
+def _sweep_state(args, parser):
+    import numpy as np
+
+    from jetsim import cycle
+
+    names = [name for name, _ in args.axes]
+    if len(set(names)) != len(names):
+        parser.error("each swept input can appear only once")
+    grids = np.meshgrid(*(np.asarray(values) for _, values in args.axes), indexing="ij")
+    swept = {name: grid.ravel() for name, grid in zip(names, grids)}
+    try:
+        state = cycle.run_cycle(args.dtype, **dict(args.set), **swept)
+    except (ValueError, TypeError) as exc:
+        parser.error(str(exc))
+    n = grids[0].size
+    return swept, {name: np.broadcast_to(state[name], (n,)) for name in args.outputs_list}
+
+
+def _sweep(args, parser):
+    import csv
+
+    from jetsim import cycle
+
+    args.outputs_list = args.outputs or ["thrust", "tsfc", "T04", "m_fuel_total"]
+    _check_outputs(parser, args.outputs_list, cycle)
+    swept, results = _sweep_state(args, parser)
+    handle = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(handle)
+        writer.writerow(list(swept) + args.outputs_list)
+        writer.writerows(zip(*(column.tolist() for column in list(swept.values()) + list(results.values()))))
+    finally:
+        if args.output:
+            handle.close()
+
+
+def _plot(args, parser):
+    from jetsim import cycle
+
+    if len(args.axes) != 1:
+        parser.error("plot takes exactly one swept input")
+    args.outputs_list = args.y
+    _check_outputs(parser, args.outputs_list, cycle)
+    plt = _require_matplotlib(parser)
+    swept, results = _sweep_state(args, parser)
+    (name, x), = swept.items()
+    figure, axes = plt.subplots(len(results), 1, sharex=True, squeeze=False)
+    for ax, (output, y) in zip(axes[:, 0], results.items()):
+        ax.plot(x, y)
+        ax.set_ylabel(output)
+        ax.grid(True)
+    axes[-1, 0].set_xlabel(name)
+    _finish_plot(plt, args.save)
+
+
+def _finish_plot(plt, save):
+    if save:
+        plt.savefig(save, dpi=150, bbox_inches="tight")
+    else:
+        plt.show()
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="jetsim", description="Jet engine cycle simulator.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+    overrides = argparse.ArgumentParser(add_help=False)
+    overrides.add_argument("--set", type=_assignment, action="append", default=[], metavar="NAME=VALUE",
+                           help="Replace a design-point input; repeat for more.")
+
+    run = commands.add_parser("run", parents=[overrides], help="Run the cycle at one operating point.")
+    run.add_argument("--outputs", type=_outputs, help="Comma-separated outputs to print (default: all).")
+    run.add_argument("--json", action="store_true", help="Print one JSON object.")
+    run.add_argument("--no-plot", action="store_true", help="Skip the station temperature/pressure plot.")
+    run.add_argument("--save", help="Save the plot to this file instead of showing it.")
+
+    sweep = commands.add_parser("sweep", parents=[overrides], help="Run the cycle over a grid of inputs, as CSV.")
+    sweep.add_argument("axes", type=_axis, nargs="+", metavar="NAME=START:STOP:COUNT")
+    sweep.add_argument("--outputs", type=_outputs, help="Comma-separated outputs (default: thrust,tsfc,T04,m_fuel_total).")
+    sweep.add_argument("-o", "--output", help="CSV file to write (default: standard output).")
+    sweep.add_argument("--dtype", choices=("float64", "float32"), default=None, help="Evaluation precision.")
+
+    plot = commands.add_parser("plot", parents=[overrides], help="Plot outputs against one swept input.")
+    plot.add_argument("axes", type=_axis, nargs=1, metavar="NAME=START:STOP:COUNT")
+    plot.add_argument("--y", type=_outputs, default=["thrust", "tsfc"], help="Comma-separated outputs to plot.")
+    plot.add_argument("--dtype", choices=("float64", "float32"), default=None, help="Evaluation precision.")
+    plot.add_argument("--save", help="Save the plot to this file instead of showing it.")
+
+    for name, (_, help_text) in TOOLS.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    return parser, commands
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in TOOLS:
+        # Hand the rest of the command line to the tool's own parser.
+        module = importlib.import_module(TOOLS[argv[0]][0])
+        sys.argv[0] = f"jetsim {argv[0]}"
+        return module.main(argv[1:])
+    parser, commands = _parser()
+    args = parser.parse_args(argv)
+    {"run": _run, "sweep": _sweep, "plot": _plot}[args.command](args, commands.choices[args.command])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Vectorized inlet-to-nozzle cycle built from the station functions.
+
+Station numbering follows the combustor, turbine and afterburner scripts:
+1 freestream, 2 inlet exit / compressor face, 3 compressor exit,
+4 combustor exit, 5 turbine exit, 6 afterburner exit, e nozzle exit.
+
+Every station function is plain numpy arithmetic, so any input can be
+given as an array and the whole cycle broadcasts over it in one call.
+Pass dtype=np.float32 to run in single precision; see jetsim.precision
+for the error that costs on each output.
+"""
+import os
+import sys
+from collections import namedtuple
+
+try:  # installed package: the station directories are mapped into jetsim.stations
+    from jetsim.stations.afterburner import afterburner_functions
+    from jetsim.stations.combustor import combustor_functions
+    from jetsim.stations.compressor import compressor_functions
+    from jetsim.stations.inlet import inlet_functions
+    from jetsim.stations.nozzle import nozzle_functions
+    from jetsim.stations.turbine import turbine_functions
+except ImportError:  # source checkout: the station functions live in the script directories next to this package
+    _ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for _station in ("inlet", "compressor", "combustor", "turbine", "afterburner", "nozzle"):
+        _path = os.path.join(_ROOT, _station)
+        if _path not in sys.path:
+            sys.path.append(_path)
+
+    import afterburner_functions
+    import combustor_functions
+    import compressor_functions
+    import inlet_functions
+    import nozzle_functions
+    import turbine_functions
+
+
+# Design point, collected from inlet_main.py and the *_outputs.py files.
+DESIGN_POINT = {
+    # Inlet (inlet_main.py)
+    "P1": 101325.0,  # Pa, Inlet Pressure
+    "T1": 288.15,  # K, Inlet Temperature
+    "V1": 237.0,  # m/s, Inlet Velocity
+    "eta_i": 0.96,  # Efficiency of the inlet
+    "eta_p": 0.99,  # Efficiency of the pressure recovery
+    "m_flow": 115.0,  # kg/s, Mass flow rate
+    "gamma": 1.4,  # Specific heat ratio for air
+    "cp": 1005.0,  # J/(kg*K), Specific heat at constant pressure for air
+    "R": 287.05,  # J/(kg*K), Specific gas constant for air
+    # Compressor (compressor/inlet_outputs.py)
+    "rp": 30.0,  # Pressure ratio across the compressor
+    "eta_c": 0.88,  # Efficiency of the compressor
+    # Combustor (combustor/compressor_outputs.py)
+    "f": 0.02,  # Fuel to Air Ratio
+    "n_b": 0.98,  # Combustor Efficiency
+    "LHV": 43000000.0,  # J/kg, Lower Heating Value of Jet-A Fuel
+    "cp_combustor": 1150.0,  # J/(kg*K), Specific Heat Capacity at Constant Pressure
+    "f_stoich": 0.067,  # Stoichiometric Fuel to Air Ratio for Jet-A
+    "p_loss_ratio": 0.06,  # Pressure Loss Ratio in Combustor
+    # Turbine (turbine/combustor_outputs.py)
+    "cp_turbine": 1150.0,  # Specific heat at constant pressure for the turbine
+    "gamma_turbine": 1.333,  # Specific heat ratio for the turbine
+    "n_turbine": 0.98,  # Isentropic efficiency of the turbine
+    "n_mech": 0.98,  # Mechanical efficiency of the turbine
+    # Afterburner (afterburner/turbine_outputs.py)
+    "T06": 2400.0,  # K, Afterburner exit temperature
+    "cp_ab": 1150.0,  # J/kgK
+    "gamma_ab": 1.333,
+    "n_ab": 0.95,  # afterburner efficiency
+    "ab_loss": 0.05,  # Fraction of pressure loss in the afterburner
+    # Nozzle (nozzle/afterburner_outputs.py)
+    "M_e": 2.0,  # Exit Mach number
+    "gamma_nozzle": 1.3333,  # Specific heat ratio
+    "P_ambient": 101325.0,  # Ambient pressure in Pa
+    "u0": 0.0,  # Initial velocity in m/s
+}
+
+
+def inlet(P1, T1, V1, eta_i, eta_p, gamma, cp):
+    """
+    Inlet: freestream to compressor face stagnation conditions.
+
+    Returns:
+    dict: T02 and P02, the real stagnation temperature and pressure at the inlet exit.
+    """
+    T0 = inlet_functions.calculate_ideal_stagnation_temperature(T1, V1, cp)
+    T0_real = inlet_functions.calculate_real_stagnation_temperature(T1, eta_i, T0)
+    P0_real = inlet_functions.calculate_real_stagnation_pressure(P1, T0_real, T1, gamma)
+    P0_real_after_eta_p = inlet_functions.calculate_real_stagnation_pressure_after_eta_p(eta_p, P0_real)
+    return {"T02": T0_real, "P02": P0_real_after_eta_p}
+
+
+def compressor(P02, T02, rp, eta_c, gamma, cp, m_flow):
+    """
+    Compressor: compressor face to compressor exit.
+
+    Returns:
+    dict: P03, T03 and W_compressor. As in turbine/combustor_outputs.py,
+    W_compressor is the energy flow at the compressor exit.
+    """
+    P03 = compressor_functions.calculate_stag_pressure_2(P02, rp)
+    T03 = compressor_functions.calculate_stag_temperature_2(T02, eta_c, gamma, P03, P02)
+    h03 = compressor_functions.calculate_stag_enthalpy_2(T03, cp)
+    W_compressor = compressor_functions.energy_flow_2(h03, m_flow)
+    return {"P03": P03, "T03": T03, "W_compressor": W_compressor}
+
+
+def combustor(P03, T03, f, n_b, LHV, cp_combustor, f_stoich, p_loss_ratio, m_flow):
+    """
+    Combustor: compressor exit to turbine inlet.
+
+    Returns:
+    dict: T04, P04, fuel and total mass flow and the equivalence ratio.
+    """
+    T04 = combustor_functions.calculate_T04(T03, n_b, f, LHV, cp_combustor)
+    P04 = combustor_functions.calculate_P04(P03, p_loss_ratio)
+    m_fuel = combustor_functions.calculate_fuel_mass_flow_rate(m_flow, f)
+    m_total = combustor_functions.calculate_mass_flow_total(m_flow, f)
+    phi = combustor_functions.calculate_equivalence_ratio(f, f_stoich)
+    return {"T04": T04, "P04": P04, "m_fuel": m_fuel, "m_total": m_total, "phi": phi}
+
+
+def turbine(P04, T04, W_compressor, cp_turbine, gamma_turbine, n_turbine, m_total):
+    """
+    Turbine: turbine inlet to turbine exit.
+
+    Returns:
+    dict: T05_prime (ideal exit temperature), T05 and P05.
+    """
+    T05_prime = turbine_functions.calculate_T05_prime(T04, W_compressor, cp_turbine, m_total)
+    T05 = turbine_functions.calculate_T05(T04, n_turbine, T05_prime)
+    P05 = turbine_functions.calculate_P05(P04, T05_prime, T04, gamma_turbine)
+    return {"T05_prime": T05_prime, "T05": T05, "P05": P05}
+
+
+def afterburner(P05, T05, T06, cp_ab, LHV, n_ab, m_total, ab_loss):
+    """
+    Afterburner: turbine exit to nozzle inlet.
+
+    Returns:
+    dict: f_ab, afterburner fuel flow, mass flow after the afterburner and P06.
+    """
+    f_ab = afterburner_functions.calculate_f_ab(cp_ab, T06, T05, LHV, n_ab)
+    m_fuel_ab = afterburner_functions.calculate_ab_fuel_mass_flow(f_ab, m_total)
+    m_ab = afterburner_functions.calculate_m_flow_new(m_total, m_fuel_ab)
+    P06 = afterburner_functions.calculate_P06(P05, loss_fraction=ab_loss)
+    return {"f_ab": f_ab, "m_fuel_ab": m_fuel_ab, "m_ab": m_ab, "P06": P06}
+
+
+def nozzle(P06, T06, m_ab, m_total, m_fuel, m_fuel_ab, M_e, gamma_nozzle, R, P_ambient, u0):
+    """
+    Nozzle: afterburner exit to nozzle exit, plus overall thrust and TSFC.
+
+    Returns:
+    dict: exit conditions, thrust (N) and TSFC (kg/(N*s)).
+    """
+    area_ratio = nozzle_functions.calculate_area_ratio(M_e, gamma_nozzle)
+    T_e = nozzle_functions.calculate_T_exit(T06, M_e, gamma_nozzle)
+    P_e = nozzle_functions.calculate_P_exit(P06, M_e, gamma_nozzle)
+    rho_e = nozzle_functions.calculate_density_exit(P_e, T_e, R)
+    V_e = nozzle_functions.calculate_velocity_exit(M_e, gamma_nozzle, R, T_e)
+    A_e = nozzle_functions.calculate_nozzle_exit_area(m_ab, rho_e, V_e)
+    thrust = nozzle_functions.calculate_thrust(m_ab, m_total, u0, V_e, P_e, P_ambient, A_e)
+    m_fuel_total = m_fuel + m_fuel_ab
+    return {
+        "area_ratio": area_ratio,
+        "T_e": T_e,
+        "P_e": P_e,
+        "rho_e": rho_e,
+        "V_e": V_e,
+        "A_e": A_e,
+        "thrust": thrust,
+        "m_fuel_total": m_fuel_total,
+        "tsfc": m_fuel_total / thrust,
+    }
+
+
+Station = namedtuple("Station", ["name", "function", "inputs", "outputs"])
+
+
+def _station(function, outputs):
+    code = function.__code__  # argument names, without importing inspect at startup
+    inputs = code.co_varnames[:code.co_argcount]
+    return Station(function.__name__, function, inputs, tuple(outputs))
+
+
+STATIONS = (
+    _station(inlet, ["T02", "P02"]),
+    _station(compressor, ["P03", "T03", "W_compressor"]),
+    _station(combustor, ["T04", "P04", "m_fuel", "m_total", "phi"]),
+    _station(turbine, ["T05_prime", "T05", "P05"]),
+    _station(afterburner, ["f_ab", "m_fuel_ab", "m_ab", "P06"]),
+    _station(nozzle, ["area_ratio", "T_e", "P_e", "rho_e", "V_e", "A_e", "thrust", "m_fuel_total", "tsfc"]),
+)
+STATION_NAMES = tuple(station.name for station in STATIONS)
+CYCLE_OUTPUTS = tuple(name for station in STATIONS for name in station.outputs)
+
+
+def cycle_inputs(dtype=None, **overrides):
+    """
+    Build a full set of cycle inputs from the design point.
+
+    Parameters:
+    dtype (numpy dtype): Cast every input to this floating type, e.g.
+        np.float32; None leaves the values as given.
+    **overrides: Input values (floats or arrays) replacing the design point.
+
+    Returns:
+    dict: Cycle inputs.
+    """
+    for name in overrides:
+        if name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle input '{name}'.")
+    inputs = dict(DESIGN_POINT)
+    inputs.update(overrides)
+    if dtype is not None:
+        import numpy as np  # numpy is only needed here; scalar runs stay import-free
+
+        # Scalars become 0-d arrays so they keep the dtype through the station arithmetic.
+        inputs = {name: np.asarray(value, dtype=dtype) for name, value in inputs.items()}
+    return inputs
+
+
+def get_stations(names=None):
+    """
+    Look up stations by name, in cycle order.
+
+    Parameters:
+    names (iterable of str): Station names, or None for the whole cycle.
+
+    Returns:
+    tuple: Station records.
+    """
+    if names is None:
+        return STATIONS
+    names = set(names)
+    unknown = names.difference(STATION_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown station(s): {', '.join(sorted(unknown))}.")
+    return tuple(station for station in STATIONS if station.name in names)
+
+
+def run_stations(state, stations=None):
+    """
+    Run stations in order, adding their outputs to the state.
+
+    Parameters:
+    state (dict): Cycle inputs plus the outputs of any stations already run.
+    stations (iterable of str): Station names to run, or None for the whole cycle.
+
+    Returns:
+    dict: The updated state.
+    """
+    for station in get_stations(stations):
+        state.update(station.function(**{name: state[name] for name in station.inputs}))
+    return state
+
+
+def run_cycle(dtype=None, **overrides):
+    """
+    Run the full cycle at the design point with any inputs replaced.
+
+    Parameters:
+    dtype (numpy dtype): Floating type to run in, e.g. np.float32; see cycle_inputs.
+    **overrides: Input values (floats or arrays) replacing the design point.
+
+    Returns:
+    dict: Inputs and all station outputs, broadcast over the array inputs.
+    """
+    return run_stations(cycle_inputs(dtype, **overrides))
@@ -0,0 +1,228 @@
+"""
+Interactive what-if dashboard for the cycle.
+
+One window with a slider for the main input of each station, a station
+temperature/pressure profile, bars of the change from the design point in
+the headline outputs, and a curve of thrust over the range of the slider
+last moved (one vectorized cycle run). Every artist is created once;
+slider moves only change their data. Slider events are debounced so a
+drag triggers one update after it pauses rather than one per pixel.
+
+Changing artists are animated and blitted over a saved background, so an
+update redraws only them; the full figure is redrawn only when an axis
+range has to grow or the swept input changes.
+
+    python -m jetsim.dashboard
+"""
+import argparse
+import time
+
+import numpy as np
+
+from jetsim.cli import STATION_PROFILE
+from jetsim.cycle import run_cycle
+
+# (input, label, low, high) for each slider, grouped by station.
+SLIDERS = (
+    ("V1", "Inlet V1 (m/s)", 0.0, 500.0),
+    ("eta_i", "Inlet eta_i", 0.85, 1.0),
+    ("rp", "Compressor rp", 5.0, 40.0),
+    ("eta_c", "Compressor eta_c", 0.75, 0.95),
+    ("f", "Combustor f", 0.012, 0.03),
+    ("n_b", "Combustor n_b", 0.9, 1.0),
+    ("n_turbine", "Turbine n_turbine", 0.85, 1.0),
+    ("T06", "Afterburner T06 (K)", 1600.0, 2400.0),
+    ("M_e", "Nozzle M_e", 1.0, 3.0),
+)
+BAR_OUTPUTS = ("thrust", "tsfc", "T04", "T05", "m_fuel_total")
+SWEEP_POINTS = 60
+
+
+class Dashboard:
+    """
+    Slider dashboard over the cycle.
+
+    Parameters:
+    debounce (float): Quiet time in s after the last slider event before updating.
+    **overrides: Cycle inputs to start from instead of the design point.
+    """
+
+    def __init__(self, debounce=0.03, **overrides):
+        import matplotlib.pyplot as plt
+        from matplotlib.widgets import Slider
+
+        self.debounce = debounce
+        self.reference = run_cycle(**overrides)
+        self.values = {name: float(self.reference[name]) for name, _, _, _ in SLIDERS}
+        self.overrides = overrides
+        self.swept = "f"
+        self.update_ms = 0.0
+        self._pending = False
+
+        self.figure = plt.figure(figsize=(12, 7))
+        grid = self.figure.add_gridspec(len(SLIDERS), 3, width_ratios=(1.1, 1, 1), left=0.12, right=0.97,
+                                        hspace=0.9, wspace=0.35)
+        self.sliders = {}
+        for row, (name, label, low, high) in enumerate(SLIDERS):
+            slider = Slider(self.figure.add_subplot(grid[row, 0]), label, low, high,
+                            valinit=min(max(self.values[name], low), high))
+            slider.drawon = False  # drawn by blitting instead of a full redraw per event
+            slider.on_changed(lambda value, name=name: self._changed(name, value))
+            self.sliders[name] = slider
+
+        labels = [label for label, _, _ in STATION_PROFILE]
+        self.temperature_axes = self.figure.add_subplot(grid[:4, 1])
+        self.temperature_axes.plot(labels, self._profile(self.reference, 1), ":", color="0.6", label="start")
+        (self.temperature_line,) = self.temperature_axes.plot(labels, self._profile(self.reference, 1), "o-", label="now")
+        self.temperature_axes.set_ylabel("T0 (K)")
+        self.temperature_axes.legend(loc="upper left")
+        self.pressure_axes = self.figure.add_subplot(grid[5:, 1], sharex=self.temperature_axes)
+        self.pressure_axes.plot(labels, self._profile(self.reference, 2), ":", color="0.6")
+        (self.pressure_line,) = self.pressure_axes.plot(labels, self._profile(self.reference, 2), "o-")
+        self.pressure_axes.set_ylabel("P0 (kPa)")
+        self.pressure_axes.set_xlabel("Station")
+
+        self.bar_axes = self.figure.add_subplot(grid[:4, 2])
+        self.bars = self.bar_axes.bar(BAR_OUTPUTS, np.zeros(len(BAR_OUTPUTS)))
+        self.bar_axes.axhline(0.0, color="k", linewidth=0.8)
+        self.bar_axes.set_ylabel("Change from start (%)")
+        self.bar_axes.tick_params(axis="x", labelrotation=30)
+
+        self.sweep_axes = self.figure.add_subplot(grid[5:, 2])
+        (self.sweep_line,) = self.sweep_axes.plot([], [])
+        (self.sweep_marker,) = self.sweep_axes.plot([], [], "o")
+        self.sweep_axes.set_ylabel("Thrust (kN)")
+        self.sweep_axes.grid(True)
+        self.status = self.figure.text(0.01, 0.01, "", fontsize=8)
+
+        self._dynamic = [self.temperature_line, self.pressure_line, *self.bars, self.sweep_line,
+                         self.sweep_marker, self.status]
+        for slider in self.sliders.values():
+            self._dynamic.extend(sorted(slider.ax.lines + slider.ax.patches + slider.ax.texts,
+                                        key=lambda artist: artist.get_zorder()))
+        for artist in self._dynamic:
+            artist.set_animated(True)
+        self._background = None
+        self.figure.canvas.mpl_connect("draw_event", self._on_draw)
+
+        self._timer = self.figure.canvas.new_timer(interval=max(int(debounce * 1000), 1))
+        self._timer.single_shot = True
+        self._timer.add_callback(self.flush)
+        self.update()
+        for axes in (self.temperature_axes, self.pressure_axes, self.bar_axes):
+            axes.relim()
+            axes.autoscale_view()
+
+    @staticmethod
+    def _profile(state, column):
+        scale = 1.0 if column == 1 else 1e-3
+        return [float(state[row[column]]) * scale for row in STATION_PROFILE]
+
+    def _on_draw(self, event):
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_dynamic()
+
+    def _draw_dynamic(self):
+        for artist in self._dynamic:
+            self.figure.draw_artist(artist)
+
+    def _blit(self):
+        canvas = self.figure.canvas
+        canvas.restore_region(self._background)
+        self._draw_dynamic()
+        canvas.blit(self.figure.bbox)
+
+    def _changed(self, name, value):
+        self.values[name] = float(value)
+        self.swept = name
+        self._pending = True
+        if self._background is not None:
+            self._blit()  # move the slider at once; the cycle waits for the drag to pause
+        # Restart the quiet period; only the last event of a drag updates the plots.
+        self._timer.stop()
+        self._timer.start()
+
+    def flush(self):
+        """
+        Apply pending slider changes now.
+        """
+        if not self._pending:
+            return
+        self._pending = False
+        if self.update() or self._background is None:
+            self.figure.canvas.draw_idle()
+        else:
+            self._blit()
+
+    @staticmethod
+    def _cover(axes, low, high):
+        """
+        Grow the y range to cover [low, high]; True if it changed.
+        """
+        if not (np.isfinite(low) and np.isfinite(high)):
+            return False
+        bottom, top = axes.get_ylim()
+        if low >= bottom and high <= top:
+            return False
+        pad = 0.1 * ((high - low) or abs(high) or 1.0)
+        axes.set_ylim(min(low - pad, bottom), max(high + pad, top))
+        return True
+
+    def update(self):
+        """
+        Re-run the cycle at the slider values and update every artist in place.
+
+        Returns:
+        bool: True if an axis range changed, so the whole figure needs redrawing.
+        """
+        started = time.perf_counter()
+        inputs = {**self.overrides, **self.values}
+        state = run_cycle(**inputs)
+        temperatures, pressures = self._profile(state, 1), self._profile(state, 2)
+        self.temperature_line.set_ydata(temperatures)
+        self.pressure_line.set_ydata(pressures)
+        heights = [100.0 * (float(state[name]) / float(self.reference[name]) - 1.0) for name in BAR_OUTPUTS]
+        for bar, height in zip(self.bars, heights):
+            bar.set_height(height)
+        rescaled = self._cover(self.temperature_axes, min(temperatures), max(temperatures))
+        rescaled |= self._cover(self.pressure_axes, min(pressures), max(pressures))
+        rescaled |= self._cover(self.bar_axes, min(heights + [0.0]), max(heights + [0.0]))
+
+        # Thrust across the whole range of the last slider moved, in one vectorized run.
+        _, label, low, high = next(row for row in SLIDERS if row[0] == self.swept)
+        x = np.linspace(low, high, SWEEP_POINTS)
+        sweep = run_cycle(**{**inputs, self.swept: x})
+        thrust = np.broadcast_to(sweep["thrust"], x.shape) / 1000
+        self.sweep_line.set_data(x, thrust)
+        self.sweep_marker.set_data([self.values[self.swept]], [float(state["thrust"]) / 1000])
+        if self.sweep_axes.get_xlabel() != label:
+            # New swept input: fit the axes to its curve.
+            self.sweep_axes.set_xlabel(label)
+            self.sweep_axes.set_xlim(low, high)
+            finite = thrust[np.isfinite(thrust)]
+            if finite.size:
+                pad = 0.05 * (np.ptp(finite) or abs(finite[0]) or 1.0)
+                self.sweep_axes.set_ylim(finite.min() - pad, finite.max() + pad)
+            rescaled = True
+        else:
+            rescaled |= self._cover(self.sweep_axes, np.nanmin(thrust), np.nanmax(thrust))
+        self.update_ms = (time.perf_counter() - started) * 1000
+        self.status.set_text(f"Thrust {float(state['thrust']) / 1000:.1f} kN, "
+                             f"TSFC {float(state['tsfc']) * 1e6:.2f} mg/(N*s), update {self.update_ms:.1f} ms")
+        return rescaled
+
+    def show(self):
+        import matplotlib.pyplot as plt
+
+        plt.show()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive what-if dashboard for the cycle.")
+    parser.add_argument("--debounce", type=float, default=0.03, help="Quiet time in s before updating.")
+    args = parser.parse_args(argv)
+    Dashboard(args.debounce).show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Engine performance deck: thrust and fuel flow over altitude, Mach and power setting.
+
+The deck generator runs the full inlet-to-nozzle cycle over a grid and
+writes a versioned binary table that can be memory-mapped. Flight-sim and
+mission tools then interpolate in the table instead of running the cycle.
+
+Power setting runs from 0 to 2: 0 to 1 is dry, with the fuel-air ratio
+going from f_idle to f_max; 1 to 2 adds reheat from dry to T06_max.
+
+File layout (little-endian):
+    8 bytes   magic b"JETDECK\\0"
+    4 bytes   uint32 format version
+    4 bytes   uint32 length of the JSON header in bytes
+    JSON      header: axis names and lengths, output names, dtype, schedule
+    padding   to a 64-byte boundary
+    float64   axis coordinates, one axis after another
+    padding   to a 64-byte boundary
+    float32   table, C order, shape (*axis lengths, outputs)
+
+    python -m jetsim.deck build deck.bin
+    python -m jetsim.deck report deck.bin
+"""
+import argparse
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from jetsim.atmosphere import flight_condition
+from jetsim.cycle import cycle_inputs, run_stations
+from jetsim.interpolate import GridInterpolator
+from jetsim.reheat import CORE_STATIONS, REHEAT_STATIONS, reheat_T06
+
+MAGIC = b"JETDECK\0"
+FORMAT_VERSION = 1
+AXES = ("altitude", "mach", "power")
+DECK_OUTPUTS = ("thrust", "m_fuel_total")
+_ALIGN = 64
+
+# Power schedule defaults
+F_IDLE = 0.016  # Fuel to air ratio at idle (power 0)
+F_MAX = 0.025  # Fuel to air ratio at maximum dry power (power 1)
+T06_MAX = 2400.0  # K, Afterburner exit temperature at maximum reheat (power 2)
+
+
+def power_schedule(power, f_idle=F_IDLE, f_max=F_MAX):
+    """
+    Split a power setting into a fuel-air ratio and a reheat setting.
+
+    Parameters:
+    power (float or array): Power setting, 0 (idle) to 1 (max dry) to 2 (max reheat).
+    f_idle (float): Fuel to air ratio at idle.
+    f_max (float): Fuel to air ratio at maximum dry power.
+
+    Returns:
+    tuple: Fuel to air ratio and reheat setting (0 to 1).
+    """
+    power = np.asarray(power, dtype=float)
+    if np.any(power < 0) or np.any(power > 2):
+        raise ValueError("Power setting must be between 0 and 2.")
+    f = f_idle + np.minimum(power, 1.0) * (f_max - f_idle)
+    reheat = np.maximum(power - 1.0, 0.0)
+    return f, reheat
+
+
+def deck_cycle(altitude, mach, power, f_idle=F_IDLE, f_max=F_MAX, T06_max=T06_MAX, **overrides):
+    """
+    Run the full cycle at flight conditions and power settings.
+
+    Parameters:
+    altitude (float or array): Altitude in m.
+    mach (float or array): Flight Mach number.
+    power (float or array): Power setting, 0 to 2.
+    f_idle, f_max, T06_max: Power schedule, see power_schedule.
+    **overrides: Other cycle inputs replacing the design point.
+
+    Returns:
+    dict: Cycle state broadcast over altitude, Mach and power.
+    """
+    for name in ("f", "T06"):
+        if name in overrides:
+            raise ValueError(f"'{name}' is set by the power schedule.")
+    f, reheat = power_schedule(power, f_idle, f_max)
+    state = run_stations(cycle_inputs(**{**flight_condition(altitude, mach), **overrides}, f=f), CORE_STATIONS)
+    state["T06"] = reheat_T06(state["T05"], reheat, T06_max)
+    return run_stations(state, REHEAT_STATIONS)
+
+
+def _pad(handle):
+    handle.write(b"\0" * (-handle.tell() % _ALIGN))
+
+
+def generate_deck(path, altitudes, machs, powers, outputs=DECK_OUTPUTS, f_idle=F_IDLE, f_max=F_MAX,
+                  T06_max=T06_MAX, **overrides):
+    """
+    Run the cycle over a grid and write the deck file.
+
+    Parameters:
+    path (str): Output deck file.
+    altitudes, machs, powers (array): Increasing grid coordinates.
+    outputs (iterable of str): Cycle outputs to tabulate.
+    f_idle, f_max, T06_max: Power schedule, see power_schedule.
+    **overrides: Other cycle inputs replacing the design point.
+
+    Returns:
+    Deck: The written deck, opened from disk.
+    """
+    axes = [np.asarray(axis, dtype=float) for axis in (altitudes, machs, powers)]
+    outputs = tuple(outputs)
+    shape = tuple(len(axis) for axis in axes)
+    state = deck_cycle(axes[0][:, None, None], axes[1][None, :, None], axes[2][None, None, :],
+                       f_idle, f_max, T06_max, **overrides)
+    table = np.stack([np.broadcast_to(state[name], shape) for name in outputs], axis=-1).astype("<f4")
+    header = json.dumps({
+        "axes": [{"name": name, "length": n} for name, n in zip(AXES, shape)],
+        "outputs": list(outputs),
+        "dtype": "<f4",
+        "schedule": {"f_idle": f_idle, "f_max": f_max, "T06_max": T06_max},
+        "overrides": {name: float(value) for name, value in overrides.items()},
+    }).encode()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-deck-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(MAGIC + struct.pack("<II", FORMAT_VERSION, len(header)) + header)
+            _pad(handle)
+            for axis in axes:
+                handle.write(axis.astype("<f8").tobytes())
+            _pad(handle)
+            handle.write(table.tobytes())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return Deck(path)
+
+
+class Deck:
+    """
+    Memory-mapped engine deck with vectorized interpolation.
+
+    Linear interpolation is the default: the power schedule has a kink at
+    power 1 (dry to reheat) that cubic interpolation rings across, so keep
+    a grid node there and check error_report before choosing cubic.
+
+    Parameters:
+    path (str): Deck file written by generate_deck.
+    method (str): "linear" or "cubic" interpolation.
+    """
+
+    def __init__(self, path, method="linear"):
+        self.path = path
+        with open(path, "rb") as handle:
+            prefix = handle.read(16)
+            if len(prefix) < 16 or prefix[:8] != MAGIC:
+                raise ValueError(f"'{path}' is not an engine deck file.")
+            version, header_length = struct.unpack("<II", prefix[8:])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Deck format version {version} is not supported (expected {FORMAT_VERSION}).")
+            self.header = json.loads(handle.read(header_length))
+        offset = 16 + header_length
+        offset += -offset % _ALIGN
+        shape = tuple(axis["length"] for axis in self.header["axes"])
+        axes = np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=(sum(shape),))
+        bounds = np.cumsum((0,) + shape)
+        self.axes = tuple(np.array(axes[bounds[i]:bounds[i + 1]]) for i in range(len(shape)))
+        offset += 8 * sum(shape)
+        offset += -offset % _ALIGN
+        self.outputs = tuple(self.header["outputs"])
+        self.table = np.memmap(path, dtype=self.header["dtype"], mode="r", offset=offset,
+                               shape=shape + (len(self.outputs),))
+        self.schedule = self.header["schedule"]
+        self.overrides = self.header["overrides"]
+        self._interpolators = {}
+        self.method = method
+
+    def interpolator(self, method=None):
+        method = method or self.method
+        if method not in self._interpolators:
+            self._interpolators[method] = GridInterpolator(self.axes, self.table, method)
+        return self._interpolators[method]
+
+    def __call__(self, altitude, mach, power, method=None):
+        """
+        Interpolate the deck outputs.
+
+        Parameters:
+        altitude (float or array): Altitude in m.
+        mach (float or array): Flight Mach number.
+        power (float or array): Power setting, 0 to 2.
+        method (str): "linear" or "cubic"; defaults to the deck's method.
+
+        Returns:
+        dict: Each deck output, broadcast over the queries.
+        """
+        values = self.interpolator(method)(altitude, mach, power)
+        return {name: values[..., i] for i, name in enumerate(self.outputs)}
+
+    def direct(self, altitude, mach, power):
+        """
+        Evaluate the deck outputs with the full cycle, for comparison.
+        """
+        state = deck_cycle(altitude, mach, power, **self.schedule, **self.overrides)
+        shape = np.broadcast_shapes(np.shape(altitude), np.shape(mach), np.shape(power))
+        return {name: np.broadcast_to(state[name], shape) for name in self.outputs}
+
+
+def error_report(deck, samples=20000, seed=0, methods=("linear", "cubic")):
+    """
+    Compare deck interpolation against direct cycle evaluation.
+
+    Points are drawn uniformly inside the deck grid.
+
+    Parameters:
+    deck (Deck): Deck to check.
+    samples (int): Number of random points.
+    seed (int): Random seed.
+    methods (iterable of str): Interpolation methods to check.
+
+    Returns:
+    dict: {method: {output: {"max_abs", "rms_abs", "max_rel", "rms_rel"}}}.
+    Relative errors are taken against each output's range over the samples.
+    """
+    rng = np.random.default_rng(seed)
+    points = [rng.uniform(axis[0], axis[-1], samples) for axis in deck.axes]
+    exact = deck.direct(*points)
+    report = {}
+    for method in methods:
+        approx = deck(*points, method=method)
+        report[method] = {}
+        for name in deck.outputs:
+            error = approx[name] - exact[name]
+            span = np.ptp(exact[name]) or 1.0
+            report[method][name] = {
+                "max_abs": float(np.max(np.abs(error))),
+                "rms_abs": float(np.sqrt(np.mean(error**2))),
+                "max_rel": float(np.max(np.abs(error)) / span),
+                "rms_rel": float(np.sqrt(np.mean(error**2)) / span),
+            }
+    return report
+
+
+def _grid(text):
+    start, stop, count = text.split(":")
+    return np.linspace(float(start), float(stop), int(count))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or check an engine performance deck.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Run the cycle over a grid and write a deck file.")
+    build.add_argument("path")
+    build.add_argument("--altitudes", type=_grid, default="0:15000:31", help="start:stop:count in m")
+    build.add_argument("--machs", type=_grid, default="0:1.6:33", help="start:stop:count")
+    build.add_argument("--powers", type=_grid, default="0:2:21", help="start:stop:count")
+    report = commands.add_parser("report", help="Compare a deck with direct cycle evaluation.")
+    report.add_argument("path")
+    report.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        deck = generate_deck(args.path, args.altitudes, args.machs, args.powers)
+        print(f"Wrote {args.path}: grid {deck.table.shape[:-1]}, outputs {', '.join(deck.outputs)}")
+    else:
+        deck = Deck(args.path)
+        for method, outputs in error_report(deck, args.samples).items():
+            for name, errors in outputs.items():
+                print(f"{method:>6} {name:>14}: max {errors['max_abs']:.4g} ({errors['max_rel']:.3%} of range), "
+                      f"rms {errors['rms_abs']:.4g} ({errors['rms_rel']:.3%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+"""
+Sweeps and Monte Carlo runs sharded across machines over plain TCP.
+
+A coordinator holds the run spec (see jetsim.campaign) and its checkpoint.
+Workers on any machine connect, receive the spec once, then evaluate the
+chunks they are sent and stream back each chunk's statistics, and with
+--results the raw rows, which the coordinator records in its checkpoint
+and results file. Nothing beyond the standard library and numpy is needed
+on either side.
+
+Work is balanced by stealing: each worker owns a deque of contiguous
+chunks and takes from its front; a worker whose deque runs dry steals the
+back half of the longest deque (the unassigned chunks count as one). When
+nothing is left to steal, an idle worker re-runs the oldest chunk still
+out with a slower worker, and whichever copy finishes first counts, so a
+straggling or vanished node does not hold up the end of the run. Chunks of
+a worker that disconnects go back to the unassigned pool. A chunk that
+raises on a worker fails the run: the worker sends the traceback and the
+coordinator stops and raises WorkerError with it. Each worker
+keeps a few chunks in flight so it never waits on the network.
+
+Results match a local campaign run exactly: chunks are deterministic and
+the statistics are merged in chunk order.
+
+Messages are a 4-byte big-endian header length, a JSON header and an
+optional binary payload of header["nbytes"] bytes (little-endian float64).
+There is no authentication: bind to a trusted network only.
+
+    python -m jetsim.distributed coordinator run.ckpt --port 9100 sweep rp=10:40:301 f=0.015:0.025:201 T06=2000:2400:41
+    python -m jetsim.distributed worker coordinator-host:9100
+    python -m jetsim.distributed coordinator run.ckpt --local-workers 4 montecarlo --samples 100000000 --set f=0.018:0.024
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+import traceback
+
+import numpy as np
+
+from jetsim.batch import ResultWriter
+from jetsim.campaign import (add_run_commands, checkpoint_summary, chunk_evaluator, chunk_statistics, input_names,
+                             on_sigterm, open_checkpoint, print_summary, spec_from_args)
+
+DEFAULT_PORT = 9100
+_LENGTH = struct.Struct(">I")
+MAX_HEADER_BYTES = 1 << 24
+MAX_PAYLOAD_BYTES = 1 << 31
+
+
+class WorkerError(RuntimeError):
+    """Raised by the coordinator when a worker fails to evaluate a chunk."""
+
+
+def _encode(message, payload=b""):
+    header = json.dumps({**message, "nbytes": len(payload)}).encode()
+    return _LENGTH.pack(len(header)) + header + payload
+
+
+def _decode_header(data):
+    message = json.loads(data)
+    if not isinstance(message, dict) or not 0 <= message.get("nbytes", 0) <= MAX_PAYLOAD_BYTES:
+        raise ValueError("Malformed message header.")
+    return message
+
+
+async def _read_message(reader):
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if length > MAX_HEADER_BYTES:
+        raise ValueError("Message header too large.")
+    message = _decode_header(await reader.readexactly(length))
+    return message, await reader.readexactly(message.get("nbytes", 0))
+
+
+def _read_exactly(stream, n):
+    data = stream.read(n)
+    if len(data) != n:
+        raise ConnectionError("Connection closed by the coordinator.")
+    return data
+
+
+def _receive(stream):
+    (length,) = _LENGTH.unpack(_read_exactly(stream, _LENGTH.size))
+    if length > MAX_HEADER_BYTES:
+        raise ValueError("Message header too large.")
+    message = _decode_header(_read_exactly(stream, length))
+    return message, _read_exactly(stream, message.get("nbytes", 0))
+
+
+class _Worker:
+    def __init__(self, name):
+        self.name = name
+        self.queue = collections.deque()  # owned chunks, taken from the front, stolen from the back
+        self.in_flight = {}  # chunk -> time sent
+        self.chunks = 0
+        self.steals = 0
+        self.backups = 0
+
+
+class Coordinator:
+    """
+    Hands out the chunks of a run to TCP workers and collects their results.
+
+    Parameters:
+    spec (dict): Run spec from campaign.sweep_spec or campaign.monte_carlo_spec.
+    checkpoint (str): Checkpoint file; an existing one is resumed. None
+        keeps the state in memory only.
+    seed (int): Run seed for Monte Carlo specs; see campaign.open_checkpoint.
+    results (str): .csv or .jsonl file the raw rows (case index, inputs,
+        outputs) are appended to as they arrive; None keeps statistics only.
+        Rows of chunks finished after the last checkpoint write come again
+        after a resume; the case column tells them apart.
+    prefetch (int): Chunks kept in flight per worker.
+    every (float): Seconds between checkpoint writes.
+    """
+
+    def __init__(self, spec, checkpoint=None, seed=None, results=None, prefetch=2, every=30.0):
+        self.spec = spec
+        self.state = open_checkpoint(checkpoint, spec, seed)
+        self.prefetch = max(1, prefetch)
+        self.every = every
+        self.unassigned = collections.deque(int(chunk) for chunk in np.flatnonzero(~self.state.done))
+        self.workers = {}
+        self.retired = []
+        self.chunks_run = 0
+        self.port = None
+        self._results_path = results
+        self._writer = None
+        self._backed_up = set()
+        self._saved = time.monotonic()
+        self._changed = None
+        self._finished = None
+        self._error = None
+        self._connections = {}  # handler task -> stream writer
+
+    def _finished_all(self):
+        return bool(self.state.done.all())
+
+    def _steal(self, worker):
+        """
+        Refill an empty deque with the back half of the longest one.
+        """
+        victims = [self.unassigned] + [other.queue for other in self.workers.values() if other is not worker]
+        victim = max(victims, key=len)
+        if not victim:
+            return False
+        # Unassigned chunks are shared out between all connected workers; owned ones are halved.
+        share = len(victim) // len(self.workers) if victim is self.unassigned else len(victim) // 2
+        stolen = [victim.pop() for _ in range(max(share, 1))]
+        worker.queue.extend(reversed(stolen))
+        if victim is not self.unassigned:
+            worker.steals += 1
+        return True
+
+    def _next_chunk(self, worker):
+        while worker.queue or self._steal(worker):
+            chunk = worker.queue.popleft()
+            if not self.state.done[chunk]:
+                return chunk
+        # Nothing left to steal: back up the oldest chunk still out with another worker.
+        candidates = [(sent, chunk) for other in self.workers.values() if other is not worker
+                      for chunk, sent in other.in_flight.items()
+                      if chunk not in self._backed_up and chunk not in worker.in_flight]
+        if not candidates:
+            return None
+        _, chunk = min(candidates)
+        self._backed_up.add(chunk)
+        worker.backups += 1
+        return chunk
+
+    async def _dispatch(self, worker, writer):
+        while len(worker.in_flight) < self.prefetch:
+            chunk = self._next_chunk(worker)
+            if chunk is None:
+                break
+            worker.in_flight[chunk] = time.monotonic()
+            writer.write(_encode({"type": "chunk", "chunk": chunk}))
+        await writer.drain()
+
+    def _record(self, worker, message, payload):
+        chunk = int(message["chunk"])
+        worker.in_flight.pop(chunk, None)
+        if self.state.done[chunk]:
+            return  # the other copy of a backed-up chunk finished first
+        statistics = np.array(message["statistics"], dtype=float)
+        if statistics.shape != self.state.statistics.shape[1:]:
+            raise ValueError(f"Worker {worker.name} sent statistics of the wrong shape.")
+        if self._writer is not None:
+            rows = np.frombuffer(payload, dtype="<f8").reshape(-1, len(self._writer.columns))
+            cases = rows[:, 0].astype(np.int64).tolist()
+            self._writer.write([(case, *row) for case, row in zip(cases, rows[:, 1:].tolist())])
+        self.state.statistics[chunk] = statistics
+        self.state.done[chunk] = True
+        worker.chunks += 1
+        self.chunks_run += 1
+        if time.monotonic() - self._saved >= self.every:
+            self.state.save()
+            self._saved = time.monotonic()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+        if self._finished_all() or self._error is not None:
+            self._finished.set()
+
+    async def _connection(self, reader, writer):
+        worker = None
+        self._connections[asyncio.current_task()] = writer
+        try:
+            message, _ = await _read_message(reader)
+            if message.get("type") != "hello":
+                raise ValueError("Expected a hello message.")
+            peer = writer.get_extra_info("peername")
+            name = f"{message.get('worker') or 'worker'}@{peer[0] if peer else '?'}#{len(self.workers) + len(self.retired)}"
+            worker = self.workers[name] = _Worker(name)
+            writer.write(_encode({"type": "run", "spec": self.spec, "entropy": self.state.entropy,
+                                  "raw": self._writer is not None}))
+            while not self._finished_all() and self._error is None:
+                await self._dispatch(worker, writer)
+                if worker.in_flight:
+                    message, payload = await _read_message(reader)
+                    if message.get("type") == "error":
+                        self._error = WorkerError(f"Worker {worker.name} failed on chunk {message.get('chunk')}:\n"
+                                                  f"{message.get('traceback', '').rstrip()}")
+                        self._notify()
+                        break
+                    if message.get("type") != "result":
+                        raise ValueError(f"Unexpected message '{message.get('type')}'.")
+                    self._record(worker, message, payload)
+                    self._notify()
+                else:
+                    # Idle until a result or a lost worker changes what is left.
+                    await self._changed.wait()
+            writer.write(_encode({"type": "done"}))
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # the worker went away; its chunks are handed out again below
+        except ValueError as exc:
+            print(f"Dropping {worker.name if worker else 'a worker'}: {exc}", file=sys.stderr)
+        finally:
+            if worker is not None:
+                del self.workers[worker.name]
+                self.retired.append(worker)
+                lost = [chunk for chunk in list(worker.queue) + sorted(worker.in_flight)
+                        if not self.state.done[chunk]]
+                self.unassigned.extendleft(reversed(lost))
+                worker.queue.clear()
+                worker.in_flight.clear()
+                self._notify()
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+    async def run_async(self, host="127.0.0.1", port=DEFAULT_PORT, local_workers=0):
+        """
+        Serve workers until every chunk is done.
+
+        Parameters:
+        host (str): Address to listen on; "0.0.0.0" accepts remote workers.
+        port (int): TCP port; 0 picks a free one (see the port attribute).
+        local_workers (int): Worker processes to start on this machine.
+
+        Returns:
+        dict: Summary as campaign.run_chunks, plus "workers": {name:
+        {"chunks", "steals", "backups"}}.
+
+        Raises WorkerError with the worker's traceback if a chunk fails;
+        the chunks finished before then stay in the checkpoint.
+        """
+        self._changed = asyncio.Event()
+        self._finished = asyncio.Event()
+        if self._finished_all():
+            self._finished.set()
+        if self._results_path is not None:
+            columns = ["case"] + input_names(self.spec) + list(self.spec["outputs"])
+            self._writer = ResultWriter(self._results_path, columns, append=self.state.resumed > 0)
+        processes = []
+        try:
+            server = await asyncio.start_server(self._connection, host, port)
+            self.port = server.sockets[0].getsockname()[1]
+            address = f"{'127.0.0.1' if host in ('0.0.0.0', '') else host}:{self.port}"
+            for i in range(local_workers):
+                processes.append(await asyncio.create_subprocess_exec(
+                    sys.executable, "-m", "jetsim.distributed", "worker", address, "--name", f"local{i}"))
+            async with server:
+                await self._finished.wait()
+                # Workers still running a duplicate of a finished chunk are let go now.
+                for writer in list(self._connections.values()):
+                    writer.write(_encode({"type": "done"}))
+                    writer.close()
+                await asyncio.gather(*self._connections, return_exceptions=True)
+                # Keep listening until the local workers have been told the run is done.
+                for process in processes:
+                    await process.wait()
+        finally:
+            for process in processes:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+            self.state.save()
+            if self._writer is not None:
+                self._writer.close()
+        if self._error is not None:
+            raise self._error
+        summary = checkpoint_summary(self.state, self.spec["outputs"], self.chunks_run)
+        summary["workers"] = {worker.name: {"chunks": worker.chunks, "steals": worker.steals,
+                                            "backups": worker.backups}
+                              for worker in self.retired + list(self.workers.values())}
+        return summary
+
+    def run(self, host="127.0.0.1", port=DEFAULT_PORT, local_workers=0):
+        """
+        Blocking form of run_async.
+        """
+        return asyncio.run(self.run_async(host, port, local_workers))
+
+
+def _address(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def run_worker(address, name=None, delay=0.0, connect_timeout=60.0):
+    """
+    Evaluate chunks for a coordinator until it says the run is done.
+
+    Parameters:
+    address (str): Coordinator host:port.
+    name (str): Worker name in the coordinator's report; defaults to the host name.
+    delay (float): Extra seconds per chunk, to try out rebalancing on uneven workers.
+    connect_timeout (float): Seconds to keep retrying while the coordinator starts.
+
+    Returns:
+    int: Chunks evaluated.
+
+    A chunk that raises is reported to the coordinator, which fails the
+    run, and the exception is raised here too.
+    """
+    host, port = _address(address)
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+    count = 0
+    with connection, connection.makefile("rb") as stream:
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.sendall(_encode({"type": "hello", "worker": name or socket.gethostname(), "pid": os.getpid()}))
+        try:
+            message, _ = _receive(stream)
+        except ConnectionError:
+            return count  # the run finished before this worker joined
+        if message.get("type") != "run":
+            return count
+        raw = message["raw"]
+        evaluate = chunk_evaluator(message["spec"], message["entropy"])
+        while True:
+            try:
+                message, _ = _receive(stream)
+            except ConnectionError:
+                break
+            if message.get("type") != "chunk":
+                break
+            chunk = message["chunk"]
+            payload = b""
+            try:
+                if raw:
+                    cases, inputs, values = evaluate(chunk, with_inputs=True)
+                    payload = np.column_stack([cases, inputs, values]).astype("<f8").tobytes()
+                else:
+                    values = evaluate(chunk)
+            except Exception:
+                try:
+                    connection.sendall(_encode({"type": "error", "chunk": chunk, "traceback": traceback.format_exc()}))
+                except ConnectionError:
+                    pass
+                raise
+            if delay:
+                time.sleep(delay)
+            result = {"type": "result", "chunk": chunk, "statistics": chunk_statistics(values).tolist()}
+            try:
+                connection.sendall(_encode(result, payload))
+            except ConnectionError:
+                break  # the coordinator finished with another copy of this chunk
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweeps and Monte Carlo runs sharded across machines over TCP.")
+    roles = parser.add_subparsers(dest="role", required=True)
+    worker = roles.add_parser("worker", help="Evaluate chunks for a coordinator.")
+    worker.add_argument("address", metavar="HOST:PORT")
+    worker.add_argument("--name")
+    worker.add_argument("--delay", type=float, default=0.0, help="Extra seconds per chunk (testing).")
+    coordinator = roles.add_parser("coordinator", help="Hand out a run to workers and collect the results.")
+    coordinator.add_argument("checkpoint", help="Checkpoint file; an existing one is resumed.")
+    coordinator.add_argument("--host", default="127.0.0.1", help="Address to listen on (0.0.0.0 for remote workers).")
+    coordinator.add_argument("--port", type=int, default=DEFAULT_PORT)
+    coordinator.add_argument("--local-workers", type=int, default=0, help="Worker processes to start here.")
+    coordinator.add_argument("--prefetch", type=int, default=2, help="Chunks in flight per worker.")
+    coordinator.add_argument("--every", type=float, default=30.0, help="Seconds between checkpoint writes.")
+    coordinator.add_argument("--results", help="Append raw rows to this .csv or .jsonl file.")
+    add_run_commands(coordinator.add_subparsers(dest="command", required=True), argparse.ArgumentParser(add_help=False))
+    args = parser.parse_args(argv)
+
+    if args.role == "worker":
+        try:
+            count = run_worker(args.address, args.name, args.delay)
+        except OSError as exc:
+            parser.error(f"cannot reach the coordinator at {args.address}: {exc}")
+        print(f"{args.name or socket.gethostname()}: {count} chunks")
+        return
+    spec = spec_from_args(args, coordinator)
+    signal.signal(signal.SIGTERM, on_sigterm)
+    started = time.perf_counter()
+    try:
+        summary = Coordinator(spec, args.checkpoint, getattr(args, "seed", None), args.results, args.prefetch,
+                              args.every).run(args.host, args.port, args.local_workers)
+    except ValueError as exc:
+        parser.error(str(exc))
+    except WorkerError as exc:
+        sys.exit(str(exc))
+    except KeyboardInterrupt:
+        return
+    workers = summary.pop("workers")
+    print_summary(summary, time.perf_counter() - started)
+    for name, row in workers.items():
+        print(f"{name:>24}: {row['chunks']} chunks, {row['steals']} steals, {row['backups']} backups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Design of experiments over the cycle inputs.
+
+Latin hypercube and Sobol samples fill a box of input ranges with far
+fewer points than a full grid needs once more than two or three inputs
+vary. Both give points in the unit cube; sample() scales them into the
+input ranges as cycle overrides.
+
+    X = sample(DEFAULT_RANGES, 1024, method="sobol")
+    state = run_cycle(**X)
+"""
+import numpy as np
+
+from jetsim.cycle import DESIGN_POINT
+
+# Input ranges sampled by default: the design point's neighbourhood plus
+# the flight conditions and throttle settings sweeps usually cover.
+DEFAULT_RANGES = {
+    "P1": (10000.0, 101325.0),
+    "T1": (216.65, 320.0),
+    "V1": (0.0, 500.0),
+    "m_flow": (50.0, 150.0),
+    "rp": (10.0, 40.0),
+    "eta_c": (0.80, 0.92),
+    "f": (0.015, 0.025),
+    "n_turbine": (0.90, 0.99),
+    "T06": (2000.0, 2400.0),
+    "M_e": (1.2, 2.5),
+    "P_ambient": (10000.0, 101325.0),
+}
+
+METHODS = ("sobol", "lhs", "random")
+
+# Sobol direction numbers (Joe and Kuo, new-joe-kuo-6.21201) for dimensions
+# 2 and up: (degree s, coefficients a, initial m_1..m_s). Dimension 1 is the
+# van der Corput sequence.
+_JOE_KUO = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+SOBOL_MAX_DIMENSIONS = len(_JOE_KUO) + 1
+_BITS = 32
+
+
+def _direction_numbers(d):
+    """
+    Direction numbers v[j, k] (scaled by 2**_BITS) for the first d dimensions.
+    """
+    v = np.zeros((d, _BITS), dtype=np.uint64)
+    v[0] = [1 << (_BITS - 1 - k) for k in range(_BITS)]
+    for j in range(1, d):
+        s, a, m = _JOE_KUO[j - 1]
+        m = list(m)
+        for k in range(s, _BITS):
+            value = m[k - s] ^ (m[k - s] << s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    value ^= m[k - i] << i
+            m.append(value)
+        v[j] = [m[k] << (_BITS - 1 - k) for k in range(_BITS)]
+    return v
+
+
+def sobol(n, d, skip=0, scramble=False, seed=None):
+    """
+    Sobol low-discrepancy points in the unit cube.
+
+    Parameters:
+    n (int): Number of points; powers of two keep the balance properties.
+    d (int): Dimensions, up to SOBOL_MAX_DIMENSIONS.
+    skip (int): Points of the sequence to skip first.
+    scramble (bool): Apply a random digital shift (XOR) per dimension,
+        which keeps the net structure but removes the point at the origin.
+    seed (int): Random seed for the scramble.
+
+    Returns:
+    array: Points, shape (n, d), in [0, 1).
+    """
+    if not 1 <= d <= SOBOL_MAX_DIMENSIONS:
+        raise ValueError(f"Sobol sampling supports 1 to {SOBOL_MAX_DIMENSIONS} dimensions, got {d}.")
+    if n + skip > 1 << _BITS:
+        raise ValueError("Too many Sobol points.")
+    v = _direction_numbers(d)
+    # Gray-code order: point i is the XOR of v[:, k] over the set bits k of i ^ (i >> 1).
+    index = np.arange(skip, skip + n, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    x = np.zeros((n, d), dtype=np.uint64)
+    for k in range(int(gray.max()).bit_length() if n else 0):
+        bit = ((gray >> np.uint64(k)) & np.uint64(1)).astype(bool)
+        x[bit] ^= v[:, k]
+    if scramble:
+        x ^= np.random.default_rng(seed).integers(0, 1 << _BITS, d, dtype=np.uint64)
+    return x.astype(float) / float(1 << _BITS)
+
+
+def latin_hypercube(n, d, seed=None, candidates=1):
+    """
+    Latin hypercube points in the unit cube.
+
+    Each dimension is cut into n equal strata with one point in each,
+    placed at random within its stratum.
+
+    Parameters:
+    n (int): Number of points.
+    d (int): Dimensions.
+    seed (int): Random seed.
+    candidates (int): Designs drawn; the one with the largest minimum
+        distance between points (maximin) is kept.
+
+    Returns:
+    array: Points, shape (n, d), in [0, 1).
+    """
+    rng = np.random.default_rng(seed)
+    best, best_distance = None, -1.0
+    for _ in range(candidates):
+        strata = np.argsort(rng.random((n, d)), axis=0)
+        points = (strata + rng.random((n, d))) / n
+        if candidates == 1:
+            return points
+        gaps = points[:, None, :] - points[None, :, :]
+        distance = np.sqrt((gaps**2).sum(-1))
+        distance[np.diag_indices(n)] = np.inf
+        if distance.min() > best_distance:
+            best, best_distance = points, distance.min()
+    return best
+
+
+def sample(ranges=None, n=1024, method="sobol", seed=0):
+    """
+    Sample cycle inputs over a box of ranges.
+
+    Parameters:
+    ranges (dict): {input: (low, high)}; defaults to DEFAULT_RANGES.
+    n (int): Number of points.
+    method (str): "sobol" (scrambled), "lhs" or "random".
+    seed (int): Random seed.
+
+    Returns:
+    dict: {input: array of n values}, usable as run_cycle overrides.
+    """
+    ranges = DEFAULT_RANGES if ranges is None else ranges
+    for name in ranges:
+        if name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle input '{name}'.")
+    d = len(ranges)
+    if method == "sobol":
+        unit = sobol(n, d, scramble=True, seed=seed)
+    elif method == "lhs":
+        unit = latin_hypercube(n, d, seed)
+    elif method == "random":
+        unit = np.random.default_rng(seed).random((n, d))
+    else:
+        raise ValueError(f"Unknown sampling method '{method}'; use one of {', '.join(METHODS)}.")
+    low = np.array([low for low, _ in ranges.values()], dtype=float)
+    high = np.array([high for _, high in ranges.values()], dtype=float)
+    points = low + unit * (high - low)
+    return {name: points[:, j] for j, name in enumerate(ranges)}
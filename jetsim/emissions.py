@@ -0,0 +1,178 @@
+"""
+Combustor emission indices (g per kg of fuel) for NOx, CO and UHC, and
+the exit pattern factor.
+
+Lefebvre's correlations, written with the combustor residence time in
+place of the liner volume (air mass flow over volume is the compressor
+exit density over the residence time):
+
+    EI_NOx = 9e-8 P3^1.25 exp(0.01 T_pz) tau R T3 / (P3 T_pz)
+    EI_CO  = 86    rho3 / tau T_pz exp(-0.00345 T_pz) / ((dP/P)^0.5 P3^1.5)
+    EI_UHC = 11764 rho3 / tau T_pz exp(-0.00345 T_pz) / ((dP/P)^0.5 P3^2.5)
+
+with P3 in kPa where it stands alone, T in K, and T_pz the primary-zone
+temperature: the primary air burns at phi / PRIMARY_AIR_FRACTION (up to
+stoichiometric), with the combustor temperature rise scaled to that
+equivalence ratio and to an effective flame cp, and capped at
+FLAME_TEMPERATURE_MAX where dissociation takes over.
+
+The pattern factor (T_peak - T04) / (T04 - T03) follows Lefebvre's liner
+correlation 1 - exp(-1 / (0.07 L/D dP_L/q_ref)), and gives the hot-streak
+temperature T04_peak the turbine nozzle guide vanes see.
+
+Emissions run as a post-processing stage of a streaming batch: each
+chunk's cycle state gains the emission-index columns before it is
+written, so the results file gets them in the same pass.
+
+    python -m jetsim.emissions cases.csv results.csv --residence-time 0.004
+"""
+import argparse
+
+import numpy as np
+
+from jetsim.batch import run_batch
+
+EMISSION_OUTPUTS = ("EI_NOx", "EI_CO", "EI_UHC", "pattern_factor", "T04_peak")
+RESIDENCE_TIME = 5e-3  # s, combustor residence time
+PRIMARY_AIR_FRACTION = 0.35  # share of the combustor air entering the primary zone
+FLAME_CP = 1450.0  # J/(kg*K), effective cp of the primary-zone gas, covering cp(T) and dissociation
+FLAME_TEMPERATURE_MAX = 2400.0  # K, primary-zone temperature cap set by dissociation
+LINER_LENGTH_RATIO = 3.0  # liner length over diameter, L/D
+LINER_LOSS_FACTOR = 20.0  # liner pressure drop over reference dynamic pressure, dP_L/q_ref
+
+
+def primary_zone_temperature(T03, T04, phi, cp_combustor, primary_air_fraction=PRIMARY_AIR_FRACTION,
+                             flame_cp=FLAME_CP, T_max=FLAME_TEMPERATURE_MAX):
+    """
+    Calculate the primary-zone flame temperature.
+
+    Parameters:
+    T03 (float or array): Stagnation temperature at the compressor exit (K)
+    T04 (float or array): Stagnation temperature at the combustor exit (K)
+    phi (float or array): Overall equivalence ratio
+    cp_combustor (float): Specific heat the combustor temperature rise was computed with (J/(kg*K))
+    primary_air_fraction (float): Share of the air entering the primary zone
+    flame_cp (float): Effective cp of the primary-zone gas (J/(kg*K))
+    T_max (float): Primary-zone temperature cap (K)
+
+    Returns:
+    float or array: Primary-zone temperature (K)
+    """
+    phi = np.asarray(phi, dtype=float)
+    phi_pz = np.minimum(phi / primary_air_fraction, 1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scale = np.where(phi > 0, phi_pz / phi, 0.0)
+    return np.minimum(T03 + (T04 - T03) * scale * cp_combustor / flame_cp, T_max)
+
+
+def pattern_factor(length_ratio=LINER_LENGTH_RATIO, loss_factor=LINER_LOSS_FACTOR):
+    """
+    Calculate the combustor exit pattern factor (T_peak - T04) / (T04 - T03).
+
+    Parameters:
+    length_ratio (float or array): Liner length over diameter
+    loss_factor (float or array): Liner pressure drop over reference dynamic pressure
+
+    Returns:
+    float or array: Pattern factor
+    """
+    return 1.0 - np.exp(-1.0 / (0.07 * length_ratio * loss_factor))
+
+
+def emission_indices(P03, T03, T04, phi, p_loss_ratio, cp_combustor, R, residence_time=RESIDENCE_TIME,
+                     primary_air_fraction=PRIMARY_AIR_FRACTION, flame_cp=FLAME_CP,
+                     length_ratio=LINER_LENGTH_RATIO, loss_factor=LINER_LOSS_FACTOR):
+    """
+    Calculate the NOx, CO and UHC emission indices and the exit temperature pattern.
+
+    Parameters:
+    P03 (float or array): Stagnation pressure at the compressor exit (Pa)
+    T03 (float or array): Stagnation temperature at the compressor exit (K)
+    T04 (float or array): Stagnation temperature at the combustor exit (K)
+    phi (float or array): Overall equivalence ratio
+    p_loss_ratio (float or array): Combustor pressure loss ratio dP/P
+    cp_combustor (float): Specific heat of the combustor (J/(kg*K))
+    R (float): Specific gas constant (J/(kg*K))
+    residence_time (float or array): Combustor residence time (s)
+    primary_air_fraction (float): Share of the air entering the primary zone
+    flame_cp (float): Effective cp of the primary-zone gas (J/(kg*K))
+    length_ratio (float): Liner length over diameter
+    loss_factor (float): Liner pressure drop over reference dynamic pressure
+
+    Returns:
+    dict: EI_NOx, EI_CO and EI_UHC in g per kg of fuel, pattern_factor, and
+    T04_peak (K).
+    """
+    T_pz = primary_zone_temperature(T03, T04, phi, cp_combustor, primary_air_fraction, flame_cp)
+    P3_kPa = P03 / 1000.0
+    loading = P03 / (R * T03 * residence_time)  # air mass flow per liner volume, kg/(s*m^3)
+    kinetics = loading * T_pz * np.exp(-0.00345 * T_pz) / np.sqrt(p_loss_ratio)
+    PF = pattern_factor(length_ratio, loss_factor)
+    return {
+        "pattern_factor": np.broadcast_to(PF, np.shape(T04)),
+        "T04_peak": T04 + PF * (T04 - T03),
+        "EI_NOx": 9e-8 * P3_kPa**1.25 * np.exp(0.01 * T_pz) * residence_time * R * T03 / (P03 * T_pz),
+        "EI_CO": 86.0 * kinetics / P3_kPa**1.5,
+        "EI_UHC": 11764.0 * kinetics / P3_kPa**2.5,
+    }
+
+
+class Emissions:
+    """
+    Post-processing stage adding emission indices and the exit pattern to a chunk's cycle state.
+
+    Pass it to run_batch(post=...) to add the EMISSION_OUTPUTS columns to
+    the results as each chunk streams through.
+
+    Parameters:
+    residence_time (float): Combustor residence time (s).
+    primary_air_fraction (float): Share of the air entering the primary zone.
+    flame_cp (float): Effective cp of the primary-zone gas (J/(kg*K)).
+    length_ratio (float): Liner length over diameter.
+    loss_factor (float): Liner pressure drop over reference dynamic pressure.
+    """
+
+    inputs = ("P03", "T03", "T04", "phi", "p_loss_ratio", "cp_combustor", "R")
+    outputs = EMISSION_OUTPUTS
+
+    def __init__(self, residence_time=RESIDENCE_TIME, primary_air_fraction=PRIMARY_AIR_FRACTION, flame_cp=FLAME_CP,
+                 length_ratio=LINER_LENGTH_RATIO, loss_factor=LINER_LOSS_FACTOR):
+        if residence_time <= 0:
+            raise ValueError("Residence time must be positive.")
+        if not 0 < primary_air_fraction <= 1:
+            raise ValueError("Primary air fraction must be between 0 and 1.")
+        self.residence_time = residence_time
+        self.primary_air_fraction = primary_air_fraction
+        self.flame_cp = flame_cp
+        self.length_ratio = length_ratio
+        self.loss_factor = loss_factor
+
+    def __call__(self, state):
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            return emission_indices(**{name: state[name] for name in self.inputs},
+                                    residence_time=self.residence_time,
+                                    primary_air_fraction=self.primary_air_fraction, flame_cp=self.flame_cp,
+                                    length_ratio=self.length_ratio, loss_factor=self.loss_factor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a case file with emission indices added to the results.")
+    parser.add_argument("cases", help="Input case file (.csv or .jsonl).")
+    parser.add_argument("results", help="Output file (.csv or .jsonl).")
+    parser.add_argument("--outputs", default="thrust,tsfc,T04,phi",
+                        help="Comma-separated cycle outputs to write before the emission indices.")
+    parser.add_argument("--residence-time", type=float, default=RESIDENCE_TIME, help="Combustor residence time in s.")
+    parser.add_argument("--primary-air-fraction", type=float, default=PRIMARY_AIR_FRACTION)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--liner-length-ratio", type=float, default=LINER_LENGTH_RATIO)
+    parser.add_argument("--liner-loss-factor", type=float, default=LINER_LOSS_FACTOR)
+    args = parser.parse_args(argv)
+    stage = Emissions(args.residence_time, args.primary_air_fraction,
+                      length_ratio=args.liner_length_ratio, loss_factor=args.liner_loss_factor)
+    outputs = args.outputs.split(",") + list(EMISSION_OUTPUTS)
+    count = run_batch(args.cases, args.results, outputs, args.chunk_size, post=(stage,))
+    print(f"Ran {count} cases with emission indices into {args.results}")
+
+
+if __name__ == "__main__":
+    main()
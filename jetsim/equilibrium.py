@@ -0,0 +1,478 @@
+"""
+Chemical-equilibrium properties of Jet-A/air combustion products.
+
+The linear energy balances of the combustor and afterburner take a
+constant cp and ignore dissociation, so they overpredict the temperature
+rise at high T04 and T06. Here the products (N2, O2, Ar, CO2, H2O, CO, H2,
+OH, H, O, NO) are put in equilibrium by Gibbs energy minimization
+(element potentials, as in NASA CEA) once, offline, over a (T, P, f) grid,
+and the mixture enthalpy, equilibrium cp, isentropic exponent and gas
+constant are stored as a compressed table. At run time batches of points
+only interpolate in that table; no equilibrium is solved per point.
+
+Enthalpies are absolute (elements at 298.15 K are zero), per kg of
+products of 1 kg of air and f kg of Jet-A (C12H23), whose heat of
+formation is set so burning it releases LHV.
+
+    equilibrium_properties(T=2400.0, P=1e6, f=0.05)     # {"h", "cp", "gamma", "R"}
+    fidelity.run_fidelity({"combustor": "equilibrium", "afterburner": "equilibrium"})
+
+    python -m jetsim.equilibrium
+"""
+import argparse
+import functools
+import hashlib
+import os
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+from jetsim.cycle import afterburner, combustor, run_cycle
+from jetsim.interpolate import GridInterpolator
+
+R_UNIVERSAL = 8.314462618  # J/(mol*K)
+P_REFERENCE = 101325.0  # Pa, standard-state pressure of the thermodynamic data
+T_REFERENCE = 298.15  # K
+
+# NASA 7-coefficient polynomials, (200-1000 K, 1000-6000 K):
+# cp/R = a0 + a1 T + a2 T^2 + a3 T^3 + a4 T^4, a5 and a6 set h and s.
+SPECIES = {
+    "N2": ([3.298677, 1.4082404e-3, -3.963222e-6, 5.641515e-9, -2.444854e-12, -1020.8999, 3.950372],
+           [2.92664, 1.4879768e-3, -5.68476e-7, 1.0097038e-10, -6.753351e-15, -922.7977, 5.980528]),
+    "O2": ([3.78245636, -2.99673416e-3, 9.84730201e-6, -9.68129509e-9, 3.24372837e-12, -1063.94356, 3.65767573],
+           [3.28253784, 1.48308754e-3, -7.57966669e-7, 2.09470555e-10, -2.16717794e-14, -1088.45772, 5.45323129]),
+    "Ar": ([2.5, 0.0, 0.0, 0.0, 0.0, -745.375, 4.366],
+           [2.5, 0.0, 0.0, 0.0, 0.0, -745.375, 4.366]),
+    "CO2": ([2.35677352, 8.98459677e-3, -7.12356269e-6, 2.45919022e-9, -1.43699548e-13, -48371.9697, 9.90105222],
+            [3.85746029, 4.41437026e-3, -2.21481404e-6, 5.23490188e-10, -4.72084164e-14, -48759.166, 2.27163806]),
+    "H2O": ([4.19864056, -2.0364341e-3, 6.52040211e-6, -5.48797062e-9, 1.77197817e-12, -30293.7267, -0.849032208],
+            [3.03399249, 2.17691804e-3, -1.64072518e-7, -9.7041987e-11, 1.68200992e-14, -30004.2971, 4.9667701]),
+    "CO": ([3.57953347, -6.1035368e-4, 1.01681433e-6, 9.07005884e-10, -9.04424499e-13, -14344.086, 3.50840928],
+           [2.71518561, 2.06252743e-3, -9.98825771e-7, 2.30053008e-10, -2.03647716e-14, -14151.8724, 7.81868772]),
+    "H2": ([2.34433112, 7.98052075e-3, -1.9478151e-5, 2.01572094e-8, -7.37611761e-12, -917.935173, 0.683010238],
+           [3.3372792, -4.94024731e-5, 4.99456778e-7, -1.79566394e-10, 2.00255376e-14, -950.158922, -3.20502331]),
+    "OH": ([3.99201543, -2.40131752e-3, 4.61793841e-6, -3.88113333e-9, 1.3641147e-12, 3615.08056, -0.103925458],
+           [3.09288767, 5.48429716e-4, 1.26505228e-7, -8.79461556e-11, 1.17412376e-14, 3858.657, 4.4766961]),
+    "H": ([2.5, 0.0, 0.0, 0.0, 0.0, 25473.6599, -0.446682853],
+          [2.50000001, -2.30842973e-11, 1.61561948e-14, -4.73515235e-18, 4.98197357e-22, 25473.6599, -0.446682914]),
+    "O": ([3.1682671, -3.27931884e-3, 6.64306396e-6, -6.12806624e-9, 2.11265971e-12, 29122.2592, 2.05193346],
+          [2.56942078, -8.59741137e-5, 4.19484589e-8, -1.00177799e-11, 1.22833691e-15, 29217.5791, 4.78433864]),
+    "NO": ([4.2184763, -4.638976e-3, 1.1041022e-5, -9.3361354e-9, 2.803577e-12, 9844.623, 2.2808464],
+           [3.2606056, 1.1911043e-3, -4.2917048e-7, 6.9457669e-11, -4.0336099e-15, 9920.9746, 6.3693027]),
+}
+SPECIES_NAMES = tuple(SPECIES)
+T_SWITCH = 1000.0  # K, where the low and high temperature polynomials meet
+
+ATOMIC_MASS = {"C": 12.011, "H": 1.008, "O": 15.999, "N": 14.007, "Ar": 39.948}  # g/mol
+ELEMENTS = tuple(ATOMIC_MASS)
+FORMULAS = {"N2": {"N": 2}, "O2": {"O": 2}, "Ar": {"Ar": 1}, "CO2": {"C": 1, "O": 2}, "H2O": {"H": 2, "O": 1},
+            "CO": {"C": 1, "O": 1}, "H2": {"H": 2}, "OH": {"O": 1, "H": 1}, "H": {"H": 1}, "O": {"O": 1},
+            "NO": {"N": 1, "O": 1}}
+AIR = {"N2": 0.78084, "O2": 0.20946, "Ar": 0.0097}  # mole fractions, CO2 and trace gases counted as Ar
+FUEL_HC_RATIO = 23.0 / 12.0  # Jet-A as C12H23
+
+PROPERTIES = ("h", "cp", "gamma", "R")
+DEFAULT_TABLE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "jetsim", "equilibrium")
+
+GIBBS_TOLERANCE = 5e-8  # relative change of the mole numbers at convergence
+GIBBS_MAX_ITERATIONS = 200
+DIFFERENCE_STEP = 1e-3  # relative step in T and P for the equilibrium derivatives
+NEWTON_STEPS = 6  # temperature from enthalpy, and the afterburner fuel-air ratio
+F_STEP = 1e-5  # fuel-air ratio step for dh/df
+ENERGY_TOLERANCE = 1000.0  # J/kg, afterburner energy balance residual beyond which T06 is out of reach
+
+_COEFFICIENTS = np.array([SPECIES[name] for name in SPECIES_NAMES]).transpose(1, 0, 2)  # (range, species, 7)
+_ATOMS = np.array([[FORMULAS[name].get(element, 0) for name in SPECIES_NAMES] for element in ELEMENTS], dtype=float)
+_MOLAR_MASS = _ATOMS.T @ np.array([ATOMIC_MASS[element] for element in ELEMENTS]) / 1000.0  # kg/mol
+_AIR_MOLES = 1.0 / sum(fraction * _MOLAR_MASS[SPECIES_NAMES.index(name)] for name, fraction in AIR.items())  # per kg
+_FUEL_MOLES = 1000.0 / (ATOMIC_MASS["C"] + FUEL_HC_RATIO * ATOMIC_MASS["H"])  # of CH_y per kg of fuel
+F_STOICH = AIR["O2"] * _AIR_MOLES / (_FUEL_MOLES * (1 + FUEL_HC_RATIO / 4))
+
+# Table grid. Temperature is uniform and pressure uniform in ln P. The fuel-air
+# ratio nodes close in towards stoichiometric, where h(f) bends sharply as the
+# O2 runs out, with a node on it and two just rich of it.
+TABLE_T = np.linspace(300.0, 3300.0, 121)  # K
+TABLE_P = np.geomspace(1e4, 1e7, 13)  # Pa
+TABLE_F = np.concatenate([F_STOICH * np.sin(np.linspace(0.0, np.pi / 2, 17)), F_STOICH * np.array([1.01, 1.03])])
+
+
+def _thermo(T):
+    """
+    Standard-state enthalpy h/(R T) and entropy s/R of every species, shape T.shape + (species,).
+    """
+    a = _COEFFICIENTS[(T >= T_SWITCH).astype(np.intp)]
+    T = T[..., None]
+    a0, a1, a2, a3, a4, a5, a6 = (a[..., k] for k in range(7))
+    h = a0 + T * (a1 / 2 + T * (a2 / 3 + T * (a3 / 4 + T * a4 / 5))) + a5 / T
+    s = a0 * np.log(T) + T * (a1 + T * (a2 / 2 + T * (a3 / 3 + T * a4 / 4))) + a6
+    return h, s
+
+
+def _element_moles(f):
+    """
+    Moles of each element per kg of products of 1 kg of air and f kg of fuel.
+    """
+    air = np.zeros(len(ELEMENTS))
+    for name, fraction in AIR.items():
+        air += fraction * _AIR_MOLES * _ATOMS[:, SPECIES_NAMES.index(name)]
+    fuel = np.zeros(len(ELEMENTS))
+    fuel[ELEMENTS.index("C")] = _FUEL_MOLES
+    fuel[ELEMENTS.index("H")] = FUEL_HC_RATIO * _FUEL_MOLES
+    f = np.asarray(f, dtype=float)[..., None]
+    return (air + f * fuel) / (1 + f)
+
+
+def equilibrium_composition(T, P, f):
+    """
+    Equilibrium mole numbers of the products by Gibbs energy minimization.
+
+    Newton iteration on the element potentials and the total mole number,
+    with the step limits of NASA CEA, for all points at once.
+
+    Parameters:
+    T (float or array): Temperature (K)
+    P (float or array): Pressure (Pa)
+    f (float or array): Fuel-air ratio
+
+    Returns:
+    array: Moles of each species in SPECIES_NAMES per kg of products,
+    shape (points, species) over the flattened broadcast shape of the inputs.
+    """
+    T, P, f = (np.ravel(x) for x in np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (T, P, f))))
+    points, species, elements = len(T), len(SPECIES_NAMES), len(ELEMENTS)
+    b = _element_moles(f)
+    h, s = _thermo(T)
+    g = h - s + np.log(P / P_REFERENCE)[:, None]  # chemical potential at unit mole fraction, over R T
+    ln_N = np.full(points, np.log(35.0))
+    ln_n = np.broadcast_to(ln_N[:, None] - np.log(species), (points, species)).copy()
+    active = np.arange(points)
+    for _ in range(GIBBS_MAX_ITERATIONS):
+        ln, lN = ln_n[active], ln_N[active]
+        n, N = np.exp(ln), np.exp(lN)
+        mu = g[active] + ln - lN[:, None]
+        an = n[:, None, :] * _ATOMS  # (points, elements, species)
+        carried = an.sum(axis=2)
+        matrix = np.empty((len(active), elements + 1, elements + 1))
+        matrix[:, :elements, :elements] = an @ _ATOMS.T
+        matrix[:, :elements, elements] = carried
+        matrix[:, elements, :elements] = carried
+        matrix[:, elements, elements] = n.sum(axis=1) - N
+        rhs = np.empty((len(active), elements + 1))
+        rhs[:, :elements] = b[active] - carried + np.einsum("pes,ps->pe", an, mu)
+        rhs[:, elements] = N - n.sum(axis=1) + (n * mu).sum(axis=1)
+        try:
+            step = np.linalg.solve(matrix, rhs[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            # Cold rich points leave as many species as elements; take the least-squares step.
+            step = (np.linalg.pinv(matrix) @ rhs[..., None])[..., 0]
+        d_ln_N = step[:, elements]
+        d_ln_n = step[:, :elements] @ _ATOMS - mu + d_ln_N[:, None]
+        # CEA step limits: major species may grow by at most e^2 per step, and
+        # trace species may not jump above a mole fraction of 1e-4.
+        fraction = ln - lN[:, None]
+        major = fraction > np.log(1e-8)
+        growth = np.maximum(5 * np.abs(d_ln_N), np.where(major & (d_ln_n > 0), d_ln_n, 0.0).max(axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trace = np.where(~major & (d_ln_n >= 0), np.abs((-fraction - 9.2103404) / (d_ln_n - d_ln_N[:, None])),
+                             np.inf).min(axis=1)
+            damping = np.minimum(1.0, np.minimum(2 / growth, trace))
+        ln_n[active] = ln + damping[:, None] * d_ln_n
+        ln_N[active] = lN + damping * d_ln_N
+        error = np.maximum((n * np.abs(d_ln_n)).sum(axis=1) / n.sum(axis=1), np.abs(d_ln_N))
+        active = active[error >= GIBBS_TOLERANCE]
+        if not len(active):
+            break
+    else:
+        raise ValueError(f"Equilibrium did not converge at {len(active)} points.")
+    return np.exp(ln_n)
+
+
+def _enthalpy_and_moles(T, P, f):
+    n = equilibrium_composition(T, P, f)
+    h, _ = _thermo(np.ravel(T))
+    return R_UNIVERSAL * np.ravel(T) * (n * h).sum(axis=1), n.sum(axis=1)
+
+
+def build_table(T=TABLE_T, P=TABLE_P, f=TABLE_F):
+    """
+    Solve the equilibrium over a grid and tabulate the mixture properties.
+
+    cp is the equilibrium (reacting) value dh/dT at constant P, and gamma
+    the isentropic exponent, both from central differences of the
+    equilibrium state in T and P.
+
+    Parameters:
+    T (array): Temperature axis (K)
+    P (array): Pressure axis (Pa)
+    f (array): Fuel-air ratio axis
+
+    Returns:
+    dict: Axes T, P and f, and the table "values" of shape
+    (len(T), len(P), len(f), len(PROPERTIES)).
+    """
+    grid = np.meshgrid(T, P, f, indexing="ij")
+    TT, PP, FF = (np.ravel(x) for x in grid)
+    h, N = _enthalpy_and_moles(TT, PP, FF)
+    up, down = 1 + DIFFERENCE_STEP, 1 - DIFFERENCE_STEP
+    h_hot, N_hot = _enthalpy_and_moles(TT * up, PP, FF)
+    h_cold, N_cold = _enthalpy_and_moles(TT * down, PP, FF)
+    _, N_high = _enthalpy_and_moles(TT, PP * up, FF)
+    _, N_low = _enthalpy_and_moles(TT, PP * down, FF)
+    R = R_UNIVERSAL * N
+    cp = (h_hot - h_cold) / (TT * (up - down))
+    dlnV_dlnT = 1 + np.log(N_hot / N_cold) / np.log(up / down)
+    dlnV_dlnP = -1 + np.log(N_high / N_low) / np.log(up / down)
+    cv = cp + R * dlnV_dlnT**2 / dlnV_dlnP
+    gamma = -cp / cv / dlnV_dlnP
+    values = np.stack([h, cp, gamma, R], axis=-1).reshape(grid[0].shape + (len(PROPERTIES),))
+    return {"T": np.asarray(T, dtype=float), "P": np.asarray(P, dtype=float), "f": np.asarray(f, dtype=float),
+            "values": values}
+
+
+def _table_key():
+    digest = hashlib.sha256()
+    for array in (TABLE_T, TABLE_P, TABLE_F, _COEFFICIENTS, _ATOMS, np.array(list(AIR.values())),
+                  np.array([FUEL_HC_RATIO, T_SWITCH, GIBBS_TOLERANCE, DIFFERENCE_STEP])):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def table_path(directory=None):
+    """
+    Where the table for the current grid and thermodynamic data is stored.
+
+    Parameters:
+    directory (str): Table directory; defaults to DEFAULT_TABLE_DIR.
+
+    Returns:
+    str: Path of the .npz file.
+    """
+    return os.path.join(directory or DEFAULT_TABLE_DIR, f"jet-a-air-{_table_key()}.npz")
+
+
+def save_table(table, path):
+    """
+    Write a table as a compressed .npz file, atomically.
+
+    Parameters:
+    table (dict): Table from build_table.
+    path (str): Output path.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            np.savez_compressed(handle, **table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class EquilibriumTable:
+    """
+    Vectorized lookup of equilibrium product properties.
+
+    Parameters:
+    table (dict): Axes T, P, f and values, as from build_table.
+    """
+
+    def __init__(self, table):
+        self.T, self.P, self.f = table["T"], table["P"], table["f"]
+        self._interpolate = GridInterpolator((self.T, np.log(self.P), self.f), table["values"])
+
+    def properties(self, T, P, f):
+        """
+        Interpolate the product properties.
+
+        Parameters:
+        T (float or array): Temperature (K)
+        P (float or array): Pressure (Pa)
+        f (float or array): Fuel-air ratio
+
+        Returns:
+        dict: h (J/kg), cp (J/(kg*K)), gamma and R (J/(kg*K)), with the
+        broadcast shape of the inputs. Points off the grid are clamped to it.
+        """
+        values = self._interpolate(T, np.log(P), f)
+        return {name: values[..., k] for k, name in enumerate(PROPERTIES)}
+
+    def temperature(self, h, P, f, guess):
+        """
+        Temperature at which the products have enthalpy h.
+
+        Parameters:
+        h (float or array): Enthalpy (J/kg)
+        P (float or array): Pressure (Pa)
+        f (float or array): Fuel-air ratio
+        guess (float or array): Starting temperature (K)
+
+        Returns:
+        array: Temperature (K)
+        """
+        T = np.clip(guess, self.T[0], self.T[-1])
+        for _ in range(NEWTON_STEPS):
+            values = self._interpolate(T, np.log(P), f)
+            T = np.clip(T - (values[..., 0] - h) / values[..., 1], self.T[0], self.T[-1])
+        return T
+
+
+@functools.lru_cache(maxsize=None)
+def load_table(path=None):
+    """
+    Load the equilibrium table, building and storing it on first use.
+
+    Parameters:
+    path (str): Table file; defaults to table_path().
+
+    Returns:
+    EquilibriumTable: The table.
+    """
+    path = path or table_path()
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return EquilibriumTable({name: data[name] for name in data.files})
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        pass  # missing or damaged: solve it again
+    table = build_table()
+    save_table(table, path)
+    return EquilibriumTable(table)
+
+
+def equilibrium_properties(T, P, f):
+    """
+    Equilibrium enthalpy, cp, isentropic exponent and gas constant of the products.
+
+    Parameters:
+    T (float or array): Temperature (K)
+    P (float or array): Pressure (Pa)
+    f (float or array): Fuel-air ratio
+
+    Returns:
+    dict: h (J/kg), cp (J/(kg*K)), gamma and R (J/(kg*K)).
+    """
+    return load_table().properties(T, P, f)
+
+
+def fuel_enthalpy(LHV):
+    """
+    Absolute enthalpy of the fuel at 298.15 K whose combustion releases LHV.
+
+    Parameters:
+    LHV (float or array): Lower heating value (J/kg)
+
+    Returns:
+    float or array: Fuel enthalpy (J/kg)
+    """
+    h, _ = _thermo(np.array([T_REFERENCE]))
+    formation = dict(zip(SPECIES_NAMES, R_UNIVERSAL * T_REFERENCE * h[0]))
+    return LHV + _FUEL_MOLES * (formation["CO2"] + FUEL_HC_RATIO / 2 * formation["H2O"])
+
+
+def combustor_equilibrium(P03, T03, f, n_b, LHV, cp_combustor, f_stoich, p_loss_ratio, m_flow):
+    """
+    Combustor with T04 from the energy balance on equilibrium products.
+
+    The unburnt share (1 - n_b) of the heating value is not released.
+
+    Returns:
+    dict: The ideal combustor's outputs with T04 replaced.
+    """
+    result = combustor(P03, T03, f, n_b, LHV, cp_combustor, f_stoich, p_loss_ratio, m_flow)
+    table = load_table()
+    h_air = table.properties(T03, P03, 0.0)["h"]
+    h_products = (h_air + f * (fuel_enthalpy(LHV) - (1 - n_b) * LHV)) / (1 + f)
+    result["T04"] = table.temperature(h_products, result["P04"], f, result["T04"])
+    return result
+
+
+def combustor_equilibrium_error(T03, T04, P04, f, cp_combustor):
+    """
+    Relative T04 error of the ideal combustor from the mean cp of the products.
+    """
+    table = load_table()
+    rise = T04 - T03
+    cp_mean = (table.properties(T04, P04, f)["h"] - table.properties(T03, P04, f)["h"]) / rise
+    return np.abs(rise * (cp_combustor / ((1 + f) * cp_mean) - 1) / T04)
+
+
+def afterburner_equilibrium(P05, T05, T06, f, cp_ab, LHV, n_ab, m_total, ab_loss):
+    """
+    Afterburner with f_ab from the energy balance on equilibrium products.
+
+    The turbine exit gas has the combustor's products at fuel-air ratio f;
+    the afterburner fuel raises it to f + f_ab * (1 + f).
+
+    Returns:
+    dict: The ideal afterburner's outputs with f_ab and the flows from it
+    replaced; NaN where no fuel-air ratio in the table reaches T06.
+    """
+    result = afterburner(P05, T05, T06, cp_ab, LHV, n_ab, m_total, ab_loss)
+    table = load_table()
+    h05 = table.properties(T05, P05, f)["h"]
+    h_fuel = fuel_enthalpy(LHV) - (1 - n_ab) * LHV
+    # Per kg of turbine exit gas: (1 + f_ab) * h06 - h05 - f_ab * h_fuel = 0. h06 depends
+    # strongly on f_ab through the heat of formation of the products, so Newton on f_ab,
+    # kept to fuel-air ratios in the table.
+    low, high = -f / (1 + f), (table.f[-1] - F_STEP - f) / (1 + f)
+    f_ab = np.clip(result["f_ab"], low, high)
+    for _ in range(NEWTON_STEPS):
+        f_total = f + f_ab * (1 + f)
+        h06 = table.properties(T06, result["P06"], f_total)["h"]
+        dh06_df = (table.properties(T06, result["P06"], f_total + F_STEP)["h"] - h06) / F_STEP
+        residual = (1 + f_ab) * h06 - h05 - f_ab * h_fuel
+        f_ab = np.clip(f_ab - residual / (h06 + (1 + f_ab) * (1 + f) * dh06_df - h_fuel), low, high)
+    h06 = table.properties(T06, result["P06"], f + f_ab * (1 + f))["h"]
+    # Dissociation caps the temperature even at stoichiometric: T06 out of reach is NaN.
+    f_ab = np.where(np.abs((1 + f_ab) * h06 - h05 - f_ab * h_fuel) > ENERGY_TOLERANCE, np.nan, f_ab)
+    result["f_ab"] = f_ab
+    result["m_fuel_ab"] = f_ab * m_total
+    result["m_ab"] = m_total + result["m_fuel_ab"]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the equilibrium table and compare it with the ideal cycle.")
+    parser.add_argument("--rebuild", action="store_true", help="Solve the table again even if it is stored.")
+    parser.add_argument("--points", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    path = table_path()
+    if args.rebuild or not os.path.exists(path):
+        started = time.perf_counter()
+        save_table(build_table(), path)
+        print(f"Solved {TABLE_T.size * TABLE_P.size * TABLE_F.size} equilibrium points in "
+              f"{time.perf_counter() - started:.1f} s into {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+    load_table.cache_clear()
+    table = load_table()
+
+    for T in (1500.0, 2000.0, 2400.0, 2800.0):
+        p = table.properties(T, 1e6, 0.05)
+        print(f"T {T:6.0f} K, 10 bar, f 0.05: cp {float(p['cp']):7.1f}  gamma {float(p['gamma']):.4f}  "
+              f"R {float(p['R']):6.1f}")
+
+    rng = np.random.default_rng(0)
+    inputs = {"rp": rng.uniform(10.0, 40.0, args.points), "f": rng.uniform(0.01, 0.045, args.points)}
+    ideal = run_cycle(**inputs)
+    started = time.perf_counter()
+    burnt = combustor_equilibrium(ideal["P03"], ideal["T03"], inputs["f"], ideal["n_b"], ideal["LHV"],
+                                  ideal["cp_combustor"], ideal["f_stoich"], ideal["p_loss_ratio"], ideal["m_flow"])
+    elapsed = time.perf_counter() - started
+    print(f"Combustor on {args.points} points: {elapsed * 1000:.1f} ms")
+    dT = ideal["T04"] - burnt["T04"]
+    print(f"Ideal T04 overprediction: mean {dT.mean():.1f} K, max {dT.max():.1f} K "
+          f"(at ideal T04 {ideal['T04'][np.argmax(dT)]:.0f} K)")
+    for T06 in (1800.0, 2000.0, 2200.0, 2400.0):
+        reheat = afterburner_equilibrium(ideal["P05"], ideal["T05"], T06, inputs["f"], ideal["cp_ab"], ideal["LHV"],
+                                         ideal["n_ab"], ideal["m_total"], ideal["ab_loss"])
+        reached = np.isfinite(reheat["f_ab"])
+        f_ab = ideal["cp_ab"] * (T06 - ideal["T05"]) / (ideal["n_ab"] * ideal["LHV"] - ideal["cp_ab"] * T06)
+        ratio = np.median(reheat["f_ab"][reached] / f_ab[reached]) if reached.any() else np.nan
+        print(f"T06 {T06:.0f} K: reached on {reached.mean():6.1%} of points, median f_ab equilibrium/ideal {ratio:.3f}")
+
+
+if __name__ == "__main__":
+    main()
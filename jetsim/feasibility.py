@@ -0,0 +1,255 @@
+"""
+Early feasibility pruning for large sweeps.
+
+Constraints are vectorized checks on cycle variables. Each one runs as
+soon as the stations producing its variables have run (constraints on
+inputs alone run before the inlet), and the points that fail are
+compacted out of every array before the next station, with the first
+failed constraint recorded as the point's reason. Downstream stations
+only see the surviving points, so a sweep that is mostly infeasible runs
+in proportion to its feasible part.
+
+    result = run_feasible(f=np.linspace(0.005, 0.06, 100000))
+    result.values["thrust"]      # NaN where pruned
+    result.counts()              # {reason: points}
+
+    python -m jetsim.feasibility
+"""
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, STATIONS, cycle_inputs, run_cycle
+
+T04_MAX = 2000.0  # K, Turbine inlet temperature limit of the (cooled) blade material
+AB_HEAT_MARGIN = 0.05  # Fraction of n_ab * LHV left after heating the flow to T06
+
+# A named check: function(**variables) -> boolean array, True where feasible.
+Constraint = namedtuple("Constraint", ["name", "variables", "function"])
+
+FEASIBLE = 0  # reason code of points that passed every constraint
+COMPACT_FRACTION = 0.1  # compact once this share of the remaining points has failed
+
+_STAGE = {name: index for index, station in enumerate(STATIONS) for name in station.outputs}
+
+
+def default_constraints(T04_max=T04_MAX, ab_margin=AB_HEAT_MARGIN):
+    """
+    The standard limits on the cycle.
+
+    Parameters:
+    T04_max (float): Turbine inlet temperature limit (K).
+    ab_margin (float): Smallest allowed (n_ab * LHV - cp_ab * T06) / (n_ab * LHV);
+        near zero the afterburner fuel-air ratio f_ab blows up.
+
+    Returns:
+    tuple: Constraint records.
+    """
+    return (
+        Constraint("non-physical exit Mach", ("M_e",), lambda M_e: M_e > 0),
+        Constraint("non-physical flight speed", ("V1",), lambda V1: V1 >= 0),
+        Constraint("afterburner heat margin", ("n_ab", "LHV", "cp_ab", "T06"),
+                   lambda n_ab, LHV, cp_ab, T06: n_ab * LHV - cp_ab * T06 > ab_margin * n_ab * LHV),
+        Constraint("T04 above turbine limit", ("T04",), lambda T04: T04 <= T04_max),
+        Constraint("turbine cannot drive compressor", ("T05_prime",), lambda T05_prime: T05_prime > 0),
+        Constraint("T06 below T05", ("T05", "T06"), lambda T05, T06: T06 >= T05),
+        Constraint("no thrust", ("thrust",), lambda thrust: thrust > 0),
+    )
+
+
+DEFAULT_CONSTRAINTS = default_constraints()
+
+
+class FeasibilityResult:
+    """
+    Outputs of a pruned run, scattered back onto every point.
+
+    Attributes:
+    values (dict): Requested outputs, shape (points,), NaN where pruned.
+    reason (array): Reason code per point: FEASIBLE, or 1 + the index of
+        the first failed constraint in `reasons`.
+    reasons (tuple of str): Constraint names, in code order.
+    feasible (array): Boolean mask of the points that passed.
+    evaluations (dict): Points each station ran on.
+    """
+
+    def __init__(self, values, reason, reasons, evaluations):
+        self.values = values
+        self.reason = reason
+        self.reasons = tuple(reasons)
+        self.feasible = reason == FEASIBLE
+        self.evaluations = evaluations
+
+    def counts(self):
+        """
+        Points pruned by each constraint.
+
+        Returns:
+        dict: {constraint name: points}, only constraints that pruned any.
+        """
+        counts = np.bincount(self.reason, minlength=len(self.reasons) + 1)
+        return {name: int(count) for name, count in zip(self.reasons, counts[1:]) if count}
+
+
+def _stage(constraint):
+    """
+    Index of the station after which a constraint can run; -1 for inputs only.
+    """
+    stage = -1
+    for name in constraint.variables:
+        if name in _STAGE:
+            stage = max(stage, _STAGE[name])
+        elif name not in DESIGN_POINT:
+            raise ValueError(f"Constraint '{constraint.name}' uses unknown variable '{name}'.")
+    return stage
+
+
+def _all_finite(**values):
+    ok = True
+    for value in values.values():
+        ok = ok & np.isfinite(value)
+    return ok
+
+
+def run_feasible(constraints=DEFAULT_CONSTRAINTS, outputs=("thrust", "tsfc", "T04", "m_fuel_total"),
+                 check_finite=False, **overrides):
+    """
+    Run the cycle over arrays of inputs, dropping points as soon as they fail a constraint.
+
+    Parameters:
+    constraints (iterable of Constraint): Checks to apply; see default_constraints.
+    outputs (iterable of str): Outputs to return.
+    check_finite (bool): Also prune points where a station output that is
+        passed on (or returned) is not finite (reason "<station> output not
+        finite"). Off by default: NaN reaches thrust and fails "no thrust".
+    **overrides: Input values (floats or arrays) replacing the design point.
+
+    Returns:
+    FeasibilityResult: Outputs over the flattened broadcast shape of the inputs.
+    """
+    constraints = tuple(constraints)
+    outputs = tuple(outputs)
+    for name in outputs:
+        if name not in CYCLE_OUTPUTS and name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle output '{name}'.")
+    inputs = cycle_inputs(**overrides)
+    shape = np.broadcast_shapes(*(np.shape(value) for value in inputs.values()))
+    n = int(np.prod(shape))
+    # Varying inputs become flat arrays that get compacted; scalars stay scalars.
+    state = {name: np.broadcast_to(value, shape).ravel() if np.ndim(value) else value
+             for name, value in inputs.items()}
+
+    reasons = [constraint.name for constraint in constraints]
+    stages = {}
+    for code, constraint in enumerate(constraints, 1):
+        stages.setdefault(_stage(constraint), []).append((code, constraint))
+    # Variables still read after each stage: only these are compacted when points drop out.
+    needed = {}
+    later = set(outputs)
+    for stage in range(len(STATIONS) - 1, -2, -1):
+        needed[stage] = set(later)
+        if stage >= 0:
+            later.update(STATIONS[stage].inputs)
+        for _, constraint in stages.get(stage, ()):
+            later.update(constraint.variables)
+    if check_finite:
+        for index, station in enumerate(STATIONS):
+            passed_on = tuple(name for name in station.outputs if name in needed[index] or name in outputs)
+            if passed_on:
+                reasons.append(f"{station.name} output not finite")
+                stages.setdefault(index, []).insert(0, (len(reasons), Constraint(reasons[-1], passed_on, _all_finite)))
+
+    alive = np.arange(n)
+    failed = None  # points of `alive` that failed but were not compacted out yet
+    reason = np.zeros(n, dtype=np.int16)
+    evaluations = {}
+
+    def prune(stage):
+        nonlocal alive, failed
+        checks = stages.get(stage, ())
+        if not checks or not len(alive):
+            return
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            masks = [np.broadcast_to(constraint.function(**{name: state[name] for name in constraint.variables}),
+                                     alive.shape) for _, constraint in checks]
+        ok = np.logical_and.reduce(masks) if len(masks) > 1 else masks[0]
+        if ok.all():
+            return
+        # Record the first failed constraint of each newly failed point.
+        new = ~ok if failed is None else ~ok & ~failed
+        index = np.flatnonzero(new)
+        if len(checks) == 1:
+            codes = checks[0][0]
+        else:
+            codes = np.zeros(len(index), dtype=np.int16)
+            for (code, _), mask in zip(reversed(checks), reversed(masks)):
+                codes = np.where(mask[index], codes, code)
+        reason[alive[index]] = codes
+        failed = ~ok if failed is None else failed | ~ok
+        if stage == len(STATIONS) - 1 or np.count_nonzero(failed) < COMPACT_FRACTION * len(alive):
+            return  # not worth copying every array; failed points run on and are blanked at the end
+        # Gather by index: one nonzero pass for all arrays instead of one per boolean mask.
+        keep = np.flatnonzero(~failed)
+        alive = alive.take(keep)
+        failed = None
+        for name in list(state):
+            if name not in needed[stage]:
+                del state[name]
+            elif np.ndim(state[name]):
+                state[name] = state[name].take(keep)
+
+    prune(-1)
+    for index, station in enumerate(STATIONS):
+        if not len(alive):
+            break
+        evaluations[station.name] = len(alive)
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            result = station.function(**{name: state[name] for name in station.inputs})
+        state.update(result)
+        prune(index)
+
+    # Scatter the survivors back; points that failed without being compacted out become NaN.
+    values = {}
+    for name in outputs:
+        if not len(alive):
+            values[name] = np.full(n, np.nan)
+            continue
+        value = np.broadcast_to(state[name], alive.shape)
+        if failed is not None:
+            value = np.where(failed, np.nan, value)
+        if len(alive) == n:  # nothing was compacted out: alive is still every point, in order
+            values[name] = value.astype(float, copy=failed is None)
+        else:
+            values[name] = np.full(n, np.nan)
+            values[name][alive] = value
+    return FeasibilityResult(values, reason, reasons, evaluations)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time feasibility pruning on sweeps of growing infeasible share.")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    rp = rng.uniform(10.0, 40.0, args.points)
+    print(f"{'f range':>14} {'feasible':>9} {'full cycle':>11} {'pruned':>9} {'speed-up':>9}")
+    for f_high in (0.022, 0.03, 0.045, 0.08, 0.2):
+        f = rng.uniform(0.015, f_high, args.points)
+        timings = []
+        for run in (lambda: run_cycle(rp=rp, f=f), lambda: run_feasible(rp=rp, f=f)):
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                result = run()
+            timings.append((time.perf_counter() - started) / args.repeat)
+        share = result.feasible.mean()
+        print(f"{f'0.015-{f_high}':>14} {share:>9.1%} {timings[0] * 1000:>9.1f}ms {timings[1] * 1000:>7.1f}ms "
+              f"{timings[0] / timings[1]:>8.2f}x")
+    for name, count in result.counts().items():
+        print(f"  {name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Fleet-wide component health estimation.
+
+Each engine contributes recorded operating points (stagnation sensors at
+stations 2 to 6, plus any measured cycle inputs such as f or m_flow), and
+has its own health parameters (see gaspath.PARAMETERS) shared by all of
+its points. The compressor, combustor, turbine and afterburner kernels
+are run from the measured compressor face and pressure ratio, and the
+parameters are fitted to the downstream sensors by Gauss-Newton.
+
+All engines are solved together: points are stacked into (engines,
+points) arrays, padded with NaN where an engine has fewer points, so each
+Gauss-Newton step is one vectorized kernel run per parameter and one
+batched (engines, p, p) solve. Engines are split into shards that run in
+separate processes.
+
+    python -m jetsim.fleet --engines 500 --points 200 --workers 4
+"""
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from jetsim.cycle import DESIGN_POINT, cycle_inputs, run_cycle, run_stations
+from jetsim.gaspath import PARAMETERS, SENSORS
+
+MODEL_STATIONS = ("compressor", "combustor", "turbine", "afterburner")
+FITTED_SENSORS = ("T03", "T04", "P04", "T05", "P05", "P06")  # P03 sets rp; T06 sets the reheat
+
+FleetFit = namedtuple("FleetFit", ["parameters", "converged", "stalled", "iterations", "rms"])
+
+
+def stack_engines(engines):
+    """
+    Stack per-engine point records into padded fleet arrays.
+
+    Parameters:
+    engines (list of dict): For each engine, 1-D arrays of its points, one
+        per sensor or cycle input; engines may have different point counts.
+
+    Returns:
+    dict: Arrays of shape (engines, most points), NaN-padded.
+    """
+    names = sorted(set().union(*engines)) if engines else []
+    width = max(len(next(iter(engine.values()))) for engine in engines) if engines else 0
+    fleet = {}
+    for name in names:
+        column = np.full((len(engines), width), np.nan)
+        for i, engine in enumerate(engines):
+            if name in engine:
+                values = np.asarray(engine[name], dtype=float)
+                column[i, :len(values)] = values
+        fleet[name] = column
+    return fleet
+
+
+def model_sensors(fleet, theta):
+    """
+    Run the station kernels for every point with the given health parameters.
+
+    Parameters:
+    fleet (dict): Fleet arrays, shape (engines, points).
+    theta (array): Health parameters, shape (engines, len(PARAMETERS)).
+
+    Returns:
+    array: Modelled FITTED_SENSORS, shape (engines, points, len(FITTED_SENSORS)).
+    """
+    state = cycle_inputs(**{name: fleet[name] for name in fleet if name in DESIGN_POINT},
+                         **{name: theta[:, j, None] for j, name in enumerate(PARAMETERS)})
+    state["rp"] = fleet["P03"] / fleet["P02"]
+    state["P02"], state["T02"], state["T06"] = fleet["P02"], fleet["T02"], fleet["T06"]
+    run_stations(state, MODEL_STATIONS)
+    shape = fleet["P02"].shape
+    return np.stack([np.broadcast_to(state[name], shape) for name in FITTED_SENSORS], axis=-1)
+
+
+def _residuals(fleet, measured, valid, theta):
+    with np.errstate(invalid="ignore"):
+        r = (model_sensors(fleet, theta) - measured) / measured
+    return np.where(valid, r, 0.0).reshape(len(theta), -1)
+
+
+def fit_shard(fleet, theta0=None, tol=1e-10, max_iterations=20):
+    """
+    Gauss-Newton fit of every engine in one process.
+
+    Parameters:
+    fleet (dict): Fleet arrays, shape (engines, points).
+    theta0 (array): Starting parameters; defaults to the design point.
+    tol (float): Stop when every relative parameter step is below this.
+    max_iterations (int): Gauss-Newton steps before giving up.
+
+    Returns:
+    FleetFit: see fit_fleet.
+    """
+    missing = [name for name in SENSORS if name not in fleet]
+    if missing:
+        raise ValueError(f"Fleet data is missing {', '.join(missing)}.")
+    measured = np.stack([fleet[name] for name in FITTED_SENSORS], axis=-1)
+    # A point drives the model only if its inputs were recorded.
+    inputs_ok = np.isfinite(fleet["P02"]) & np.isfinite(fleet["T02"]) & np.isfinite(fleet["P03"]) & np.isfinite(fleet["T06"])
+    for name in fleet:
+        if name in DESIGN_POINT:
+            inputs_ok &= np.isfinite(fleet[name])
+    valid = np.isfinite(measured) & inputs_ok[..., None]
+    fleet = {name: np.where(inputs_ok, values, np.nanmean(values)) for name, values in fleet.items()}
+
+    n_engines, p = len(fleet["P02"]), len(PARAMETERS)
+    theta = np.tile([DESIGN_POINT[name] for name in PARAMETERS], (n_engines, 1)) if theta0 is None else np.array(theta0, dtype=float)
+    r = _residuals(fleet, measured, valid, theta)
+    cost = np.einsum("em,em->e", r, r)
+    iterations = np.zeros(n_engines, dtype=int)
+    converged = np.zeros(n_engines, dtype=bool)
+    stalled = np.zeros(n_engines, dtype=bool)
+    active = np.ones(n_engines, dtype=bool)
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        # Forward-difference Jacobian, one kernel run per parameter for the whole fleet.
+        J = np.empty(r.shape + (p,))
+        for j in range(p):
+            h = 1e-7 * np.maximum(np.abs(theta[:, j]), 1e-2)
+            shifted = theta.copy()
+            shifted[:, j] += h
+            J[..., j] = (_residuals(fleet, measured, valid, shifted) - r) / h[:, None]
+        # Normal equations per engine, with a tiny ridge for parameters no sensor sees.
+        JTJ = np.einsum("emi,emj->eij", J, J)
+        JTJ += 1e-12 * np.trace(JTJ, axis1=1, axis2=2)[:, None, None] * np.eye(p)
+        step = -np.linalg.solve(JTJ, np.einsum("emi,em->ei", J, r)[..., None])[..., 0]
+        step[~active] = 0.0
+        # Halve steps that do not reduce the cost.
+        scale = np.ones(n_engines)
+        for _ in range(8):
+            trial = theta + scale[:, None] * step
+            r_trial = _residuals(fleet, measured, valid, trial)
+            cost_trial = np.einsum("em,em->e", r_trial, r_trial)
+            worse = active & ~(cost_trial <= cost)
+            if not worse.any():
+                break
+            scale[worse] *= 0.5
+        accept = active & (cost_trial <= cost)
+        theta[accept], r[accept], cost[accept] = trial[accept], r_trial[accept], cost_trial[accept]
+        iterations[active] += 1
+        small = np.max(np.abs(scale[:, None] * step) / np.maximum(np.abs(theta), 1e-2), axis=1) < tol
+        converged |= active & small
+        # No step along the Gauss-Newton direction lowered the cost: stop, but this is not a fit.
+        stalled |= active & ~small & ~accept
+        active &= ~(converged | stalled)
+
+    count = np.maximum(valid.reshape(n_engines, -1).sum(axis=1), 1)
+    return FleetFit({name: theta[:, j] for j, name in enumerate(PARAMETERS)}, converged, stalled, iterations,
+                    np.sqrt(cost / count))
+
+
+def _fit_shard_args(args):
+    return fit_shard(*args)
+
+
+def fit_fleet(fleet, workers=None, shards=None, tol=1e-10, max_iterations=20):
+    """
+    Fit health parameters for every engine in a fleet.
+
+    Parameters:
+    fleet (dict): Fleet arrays, shape (engines, points), e.g. from
+        stack_engines. Needs every sensor in gaspath.SENSORS; cycle inputs
+        such as f or m_flow are optional.
+    workers (int): Processes; defaults to the CPU count. 1 fits in this process.
+    shards (int): Engine shards; defaults to one per worker.
+    tol (float): Stop when every relative parameter step is below this.
+    max_iterations (int): Gauss-Newton steps before giving up.
+
+    Returns:
+    FleetFit: parameters ({name: (engines,) array}); converged mask (the
+    parameter step fell below tol); stalled mask (the line search could
+    not lower the cost before that, so the fit stopped short); Gauss-Newton
+    iterations and RMS relative sensor residual per engine.
+    """
+    workers = workers or os.cpu_count() or 1
+    n_engines = len(fleet["P02"])
+    shards = min(shards or workers, n_engines) or 1
+    bounds = np.linspace(0, n_engines, shards + 1).astype(int)
+    pieces = [({name: values[a:b] for name, values in fleet.items()}, None, tol, max_iterations)
+              for a, b in zip(bounds[:-1], bounds[1:])]
+    if workers == 1 or shards == 1:
+        results = [fit_shard(*piece) for piece in pieces]
+    else:
+        with ProcessPoolExecutor(min(workers, shards)) as pool:
+            results = list(pool.map(_fit_shard_args, pieces))
+    return FleetFit(
+        {name: np.concatenate([result.parameters[name] for result in results]) for name in PARAMETERS},
+        np.concatenate([result.converged for result in results]),
+        np.concatenate([result.stalled for result in results]),
+        np.concatenate([result.iterations for result in results]),
+        np.concatenate([result.rms for result in results]),
+    )
+
+
+def simulate_fleet(engines=100, points=50, spread=0.02, noise=1e-4, seed=0):
+    """
+    Synthetic fleet data with random health and operating points.
+
+    Parameters:
+    engines (int): Number of engines.
+    points (int): Operating points per engine.
+    spread (float): Standard deviation of each engine's health parameters,
+        relative to the design point.
+    noise (float): Relative standard deviation of the sensor noise.
+    seed (int): Random seed.
+
+    Returns:
+    tuple: Fleet arrays (engines, points) and the true parameters
+    ({name: (engines,) array}).
+    """
+    rng = np.random.default_rng(seed)
+    truth = {name: DESIGN_POINT[name] * (1 + spread * rng.standard_normal(engines)) for name in PARAMETERS}
+    operating = {
+        "f": rng.uniform(0.016, 0.025, (engines, points)),
+        "rp": rng.uniform(20.0, 32.0, (engines, points)),
+        "T06": rng.uniform(1800.0, 2400.0, (engines, points)),
+    }
+    state = run_cycle(**operating, **{name: values[:, None] for name, values in truth.items()})
+    fleet = {name: np.broadcast_to(state[name], (engines, points)) * (1 + noise * rng.standard_normal((engines, points)))
+             for name in SENSORS}
+    fleet["f"] = operating["f"]
+    return fleet, truth
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit component health across a synthetic fleet.")
+    parser.add_argument("--engines", type=int, default=500)
+    parser.add_argument("--points", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    fleet, truth = simulate_fleet(args.engines, args.points)
+    started = time.perf_counter()
+    fit = fit_fleet(fleet, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"Fitted {args.engines} engines x {args.points} points in {elapsed:.2f} s, "
+          f"{int(fit.converged.sum())} converged, {int(fit.stalled.sum())} stalled, mean {fit.iterations.mean():.1f} iterations")
+    for name in PARAMETERS:
+        error = fit.parameters[name] - truth[name]
+        print(f"{name:>13}: rms error {np.sqrt(np.mean(error**2)):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Streaming gas-path analysis of recorded station sensor data.
+
+A sensor log holds stagnation pressures and temperatures at stations 2 to
+6, one row per sample, optionally with a time column and measured
+operating inputs such as the fuel-air ratio f or the air mass flow m_flow.
+Every other cycle input takes its design-point value.
+
+Each component model is linear in one effective parameter (for the
+compressor, in 1/eta_c), so the station functions evaluated at parameter
+values 0 and 1 give the regressor of a scalar least-squares fit:
+
+    eta_c         T03 - T02 = (1/eta_c) * ideal temperature rise
+    n_b           T04 - T03 = n_b * f * LHV / cp_combustor
+    p_loss_ratio  P03 - P04 = p_loss_ratio * P03
+    n_turbine     T04 - T05 = n_turbine * (T04 - T05_prime)
+    ab_loss       P05 - P06 = ab_loss * P05
+
+Fits run over a sliding window of samples, carried across chunks, so the
+log is read once in fixed-size chunks and memory does not grow with its
+length. Samples with a missing (blank or null) sensor drop out of the
+fits that need it.
+
+    python -m jetsim.gaspath simulate log.csv --duration 600 --rate 100
+    python -m jetsim.gaspath analyse log.csv series.csv --window 200
+"""
+import argparse
+import csv
+import json
+import time
+
+import numpy as np
+
+from jetsim.batch import ResultWriter, file_format, parse_number
+from jetsim.cycle import (DESIGN_POINT, afterburner_functions, combustor_functions, compressor_functions,
+                          run_cycle, turbine_functions)
+
+TIME = "time"
+SENSORS = ("P02", "T02", "P03", "T03", "P04", "T04", "P05", "T05", "P06", "T06")
+PARAMETERS = ("eta_c", "n_b", "p_loss_ratio", "n_turbine", "ab_loss")
+
+
+def _regressions(columns):
+    """
+    Per-sample (regressor, response) pairs for each parameter.
+    """
+    def inputs(name):
+        return columns.get(name, DESIGN_POINT[name])
+
+    P02, T02, P03, T03 = columns["P02"], columns["T02"], columns["P03"], columns["T03"]
+    P04, T04, P05, T05, P06 = columns["P04"], columns["T04"], columns["P05"], columns["T05"], columns["P06"]
+    f, m_flow = inputs("f"), inputs("m_flow")
+
+    ideal_rise = compressor_functions.calculate_stag_temperature_2(T02, 1.0, inputs("gamma"), P03, P02) - T02
+    heat_rise = combustor_functions.calculate_T04(T03, 1.0, f, inputs("LHV"), inputs("cp_combustor")) - T03
+    # W_compressor is the compressor-exit energy flow, as in cycle.compressor.
+    W_compressor = compressor_functions.energy_flow_2(compressor_functions.calculate_stag_enthalpy_2(T03, inputs("cp")), m_flow)
+    m_total = combustor_functions.calculate_mass_flow_total(m_flow, f)
+    T05_prime = turbine_functions.calculate_T05_prime(T04, W_compressor, inputs("cp_turbine"), m_total)
+    return {
+        "eta_c": (ideal_rise, T03 - T02),  # slope is 1/eta_c
+        "n_b": (heat_rise, T04 - T03),
+        "p_loss_ratio": (P03 - combustor_functions.calculate_P04(P03, 1.0), P03 - P04),
+        "n_turbine": (T04 - turbine_functions.calculate_T05(T04, 1.0, T05_prime), T04 - T05),
+        "ab_loss": (P05 - afterburner_functions.calculate_P06(P05, loss_fraction=1.0), P05 - P06),
+    }
+
+
+class GasPathAnalyser:
+    """
+    Sliding-window least-squares estimates of component parameters.
+
+    Feed chunks of sensor samples in log order; each call returns one
+    estimate per sample, fitted over that sample and the window - 1 before
+    it (fewer at the start of the log).
+
+    Parameters:
+    window (int): Samples per least-squares fit; 1 inverts each sample exactly.
+    baseline (dict): Reference parameter values for the degradation deltas;
+        defaults to the design point.
+    """
+
+    def __init__(self, window=100, baseline=None):
+        if window < 1:
+            raise ValueError("window must be at least 1.")
+        self.window = window
+        self.baseline = {name: DESIGN_POINT[name] for name in PARAMETERS}
+        self.baseline.update(baseline or {})
+        # Running sums of x*y, x*x and sample counts for the last window - 1 samples.
+        self._carry = np.zeros((0, len(PARAMETERS), 3))
+        self.samples = 0
+
+    def update(self, columns):
+        """
+        Estimate the parameters at every sample of a chunk.
+
+        Parameters:
+        columns (dict): Sensor arrays (all of SENSORS, NaN where missing) and
+            optional operating-input arrays, one value per sample.
+
+        Returns:
+        dict: Each parameter and its change from the baseline, d_<name>,
+        as arrays over the chunk (NaN where the window holds no valid sample).
+        """
+        missing = [name for name in SENSORS if name not in columns]
+        if missing:
+            raise ValueError(f"Sensor log is missing {', '.join(missing)}.")
+        n = len(columns["P02"])
+        terms = np.empty((n, len(PARAMETERS), 3))
+        with np.errstate(invalid="ignore"):
+            for j, (x, y) in enumerate(_regressions(columns)[name] for name in PARAMETERS):
+                x, y = np.broadcast_to(x, (n,)), np.broadcast_to(y, (n,))
+                valid = np.isfinite(x) & np.isfinite(y)
+                terms[:, j, 0] = np.where(valid, x * y, 0.0)
+                terms[:, j, 1] = np.where(valid, x * x, 0.0)
+                terms[:, j, 2] = valid
+
+        stacked = np.concatenate([self._carry, terms])
+        totals = np.cumsum(stacked, axis=0)
+        totals = np.concatenate([np.zeros((1,) + totals.shape[1:]), totals])
+        # Window sums ending at each new sample.
+        end = np.arange(len(self._carry) + 1, len(stacked) + 1)
+        start = np.maximum(end - self.window, 0)
+        sums = totals[end] - totals[start]
+        self._carry = stacked[max(len(stacked) - (self.window - 1), 0):] if self.window > 1 else stacked[:0]
+        self.samples += n
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = np.where(sums[..., 2] > 0, sums[..., 0] / sums[..., 1], np.nan)
+        result = {}
+        for j, name in enumerate(PARAMETERS):
+            value = 1.0 / slope[:, j] if name == "eta_c" else slope[:, j]
+            result[name] = value
+            result["d_" + name] = value - self.baseline[name]
+        return result
+
+
+def _csv_chunks(handle, path, chunk_size):
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [name.strip() for name in header]
+    _check_columns(header, f"{path}:1")
+    rows = []
+    first_line = 2
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != len(header):
+            raise ValueError(f"{path}:{reader.line_num}: expected {len(header)} fields, got {len(row)}.")
+        rows.append(row)
+        if len(rows) == chunk_size:
+            yield _csv_block(header, rows, path, first_line)
+            rows = []
+            first_line = reader.line_num + 1
+    if rows:
+        yield _csv_block(header, rows, path, first_line)
+
+
+def _csv_block(header, rows, path, first_line):
+    try:
+        block = np.array(rows, dtype=float)
+    except ValueError:
+        # Slow path: blank cells are missing samples, anything else is an error.
+        block = np.empty((len(rows), len(header)))
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                if not value.strip():
+                    block[i, j] = np.nan
+                    continue
+                try:
+                    block[i, j] = float(value)
+                except ValueError:
+                    raise ValueError(f"{path}:{first_line + i}: '{header[j]}' must be a number, got {value!r}.") from None
+    return {name: block[:, j] for j, name in enumerate(header)}
+
+
+def _jsonl_chunks(handle, path, chunk_size):
+    records = []
+    names = None
+    for line_number, line in enumerate(handle, 1):
+        if not line.strip():
+            continue
+        where = f"{path}:{line_number}"
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{where}: invalid JSON ({exc.msg}).") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"{where}: each line must be a JSON object.")
+        if names is None:
+            names = list(record)
+            _check_columns(names, where)
+        for name, value in record.items():
+            if name not in names:
+                raise ValueError(f"{where}: column '{name}' is not in the first record.")
+            # null is a missing sample; anything else must be a number.
+            record[name] = np.nan if value is None else parse_number(value, name, where)
+        records.append(record)
+        if len(records) == chunk_size:
+            yield _jsonl_block(names, records)
+            records = []
+    if records:
+        yield _jsonl_block(names, records)
+
+
+def _jsonl_block(names, records):
+    return {
+        name: np.fromiter((r.get(name, np.nan) for r in records), float, len(records))
+        for name in names
+    }
+
+
+def _check_columns(names, where):
+    for name in names:
+        if name != TIME and name not in SENSORS and name not in DESIGN_POINT:
+            raise ValueError(f"{where}: unknown column '{name}'.")
+    missing = [name for name in SENSORS if name not in names]
+    if missing:
+        raise ValueError(f"{where}: sensor log is missing {', '.join(missing)}.")
+
+
+def read_sensor_log(path, chunk_size=65536):
+    """
+    Stream a sensor log in array chunks.
+
+    Parameters:
+    path (str): Sensor log (.csv, .jsonl or .ndjson) with SENSORS columns,
+        an optional time column and optional cycle-input columns.
+    chunk_size (int): Samples per chunk.
+
+    Yields:
+    dict: Column arrays for each chunk; missing values are NaN.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    chunks = _csv_chunks if file_format(path) == "csv" else _jsonl_chunks
+    with open(path, newline="") as handle:
+        yield from chunks(handle, path, chunk_size)
+
+
+def analyse_log(log_path, series_path, window=100, baseline=None, chunk_size=65536):
+    """
+    Run the gas-path analysis over a sensor log and write the degradation series.
+
+    Parameters:
+    log_path (str): Sensor log, see read_sensor_log.
+    series_path (str): Output file (.csv or .jsonl): time (or sample
+        index), each parameter and its change from the baseline.
+    window (int): Samples per least-squares fit.
+    baseline (dict): Reference parameter values; defaults to the design point.
+    chunk_size (int): Samples per chunk.
+
+    Returns:
+    dict: samples, wall time in s, samples per second, and the recorded
+    duration and realtime factor (recorded / wall time) when the log has
+    a time column.
+    """
+    analyser = GasPathAnalyser(window, baseline)
+    columns = [TIME] + [name for p in PARAMETERS for name in (p, "d_" + p)]
+    writer = ResultWriter(series_path, columns)
+    first_time = last_time = None
+    started = time.perf_counter()
+    try:
+        for chunk in read_sensor_log(log_path, chunk_size):
+            n = len(chunk["P02"])
+            times = chunk[TIME] if TIME in chunk else np.arange(analyser.samples, analyser.samples + n, dtype=float)
+            if TIME in chunk and n:
+                first_time = times[0] if first_time is None else first_time
+                last_time = times[-1]
+            estimates = analyser.update(chunk)
+            writer.write(zip(times.tolist(), *(estimates[name].tolist() for name in columns[1:])))
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+    summary = {
+        "samples": analyser.samples,
+        "wall_time": elapsed,
+        "samples_per_second": analyser.samples / elapsed if elapsed > 0 else float("inf"),
+    }
+    if first_time is not None:
+        summary["recorded_duration"] = float(last_time - first_time)
+        summary["realtime_factor"] = summary["recorded_duration"] / elapsed if elapsed > 0 else float("inf")
+    return summary
+
+
+def simulate_log(path, duration=600.0, rate=100.0, drift=None, noise=1e-4, seed=0, chunk_size=65536):
+    """
+    Write a synthetic sensor log from the cycle with drifting components.
+
+    Parameters:
+    path (str): Output log (.csv or .jsonl).
+    duration (float): Recorded time in s.
+    rate (float): Samples per second.
+    drift (dict): Change in each parameter over the log, e.g. {"eta_c": -0.02};
+        defaults to a slow loss of compressor and turbine efficiency.
+    noise (float): Relative standard deviation of the sensor noise.
+    seed (int): Random seed.
+    chunk_size (int): Samples generated at a time.
+
+    Returns:
+    int: Number of samples written.
+    """
+    drift = {"eta_c": -0.02, "n_turbine": -0.01} if drift is None else drift
+    for name in drift:
+        if name not in PARAMETERS:
+            raise ValueError(f"Unknown component parameter '{name}'.")
+    rng = np.random.default_rng(seed)
+    samples = int(duration * rate)
+    writer = ResultWriter(path, [TIME] + list(SENSORS))
+    try:
+        for start in range(0, samples, chunk_size):
+            t = np.arange(start, min(start + chunk_size, samples)) / rate
+            fraction = t / duration
+            state = run_cycle(**{name: DESIGN_POINT[name] + change * fraction for name, change in drift.items()})
+            readings = [np.broadcast_to(state[name], t.shape) * (1 + noise * rng.standard_normal(t.shape))
+                        for name in SENSORS]
+            writer.write(zip(t.tolist(), *(column.tolist() for column in readings)))
+    finally:
+        writer.close()
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gas-path analysis of recorded station sensor data.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    analyse = commands.add_parser("analyse", help="Estimate component parameters over a sensor log.")
+    analyse.add_argument("log", help="Sensor log (.csv or .jsonl).")
+    analyse.add_argument("series", help="Degradation series output (.csv or .jsonl).")
+    analyse.add_argument("--window", type=int, default=100, help="Samples per least-squares fit.")
+    analyse.add_argument("--chunk-size", type=int, default=65536)
+    simulate = commands.add_parser("simulate", help="Write a synthetic sensor log with drifting components.")
+    simulate.add_argument("log")
+    simulate.add_argument("--duration", type=float, default=600.0, help="Recorded time in s.")
+    simulate.add_argument("--rate", type=float, default=100.0, help="Samples per second.")
+    simulate.add_argument("--noise", type=float, default=1e-4, help="Relative sensor noise.")
+    args = parser.parse_args(argv)
+
+    if args.command == "simulate":
+        count = simulate_log(args.log, args.duration, args.rate, noise=args.noise)
+        print(f"Wrote {count} samples to {args.log}")
+        return
+    summary = analyse_log(args.log, args.series, args.window, chunk_size=args.chunk_size)
+    line = f"Analysed {summary['samples']} samples in {summary['wall_time']:.2f} s ({summary['samples_per_second']:.0f}/s)"
+    if "realtime_factor" in summary:
+        line += f", {summary['realtime_factor']:.0f}x realtime"
+    print(line)
+
+
+if __name__ == "__main__":
+    main()
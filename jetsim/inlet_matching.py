@@ -0,0 +1,262 @@
+"""
+Inlet-engine airflow matching with fixed capture and throat areas.
+
+The cycle takes m_flow as an input, so the inlet never has to supply what
+the engine asks for. Here the inlet geometry is fixed (sized at the design
+point, as in inlet_main.py) and the engine demands a constant corrected
+flow at the compressor face. At every flight condition:
+
+    in supersonic flight the inlet can pass at most the free-stream tube
+    of the capture area (normal shock at the lip), and at any speed at
+    most the flow that chokes its throat;
+    if the engine demands less, it gets its demand and the rest of the
+    capture stream tube spills around the lip;
+    if it demands more, it gets the limit and the face total pressure
+    drops (supercritical operation) until its corrected flow matches.
+
+At constant corrected flow the throat's mass-flow parameter is the same
+at every flight condition, so a throat sized by size_inlet stays at its
+design Mach number and never chokes: the capture area is the only limit.
+The throat limit only bites for a geometry whose throat is too small for
+the engine's corrected flow. The throat's mass-flow parameter, choked
+flow limit and Mach number are therefore worked out once per geometry;
+only inlet-limited points look their throat Mach number up again, in a
+cached table of the mass-flow parameter m sqrt(T0) / (A P0). The matched
+face state is handed to the cycle so the inlet is not run twice.
+
+    geometry = size_inlet()
+    state = run_matched(geometry, **flight_condition(altitude, mach))
+    state["m_flow"], state["spillage"], state["recovery"]
+
+    python -m jetsim.inlet_matching
+"""
+import argparse
+import functools
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from jetsim.atmosphere import flight_condition
+from jetsim.cycle import STATION_NAMES, cycle_inputs, inlet, run_cycle, run_stations
+from jetsim.nozzle_offdesign import bisect_monotonic, normal_shock_total_pressure_ratio
+
+T_REF = 288.15  # K, corrected-flow reference temperature
+P_REF = 101325.0  # Pa, corrected-flow reference pressure
+FACE_VELOCITY = 125.0  # m/s, compressor-face velocity at the design point (V2 in inlet_main.py)
+MFP_POINTS = 1025  # subsonic Mach numbers in the mass-flow-parameter table
+MATCH_OUTPUTS = ("m_flow", "recovery", "spillage", "capture_ratio", "M_throat", "inlet_limited")
+
+InletGeometry = namedtuple("InletGeometry", ["A_capture", "A_throat", "corrected_flow"])
+InletGeometry.__doc__ = """
+Fixed inlet geometry and the engine's demand: capture and throat areas
+(m^2), and the corrected mass flow m sqrt(T02 / T_REF) / (P02 / P_REF)
+(kg/s) the compressor draws.
+"""
+
+
+def mass_flow_parameter(M, gamma, R):
+    """
+    Calculate the mass-flow parameter m sqrt(T0) / (A P0) at a Mach number.
+
+    Parameters:
+    M (float or array): Mach number
+    gamma (float): Specific heat ratio
+    R (float): Specific gas constant (J/(kg*K))
+
+    Returns:
+    float or array: Mass-flow parameter (kg*sqrt(K)/(s*N))
+    """
+    return np.sqrt(gamma / R) * M * (1 + (gamma - 1) / 2 * M**2) ** (-(gamma + 1) / (2 * (gamma - 1)))
+
+
+@functools.lru_cache(maxsize=None)
+def _mfp_table(gamma, R):
+    """
+    Subsonic Mach numbers on a uniform grid of u = sqrt(1 - mfp / mfp_choked).
+
+    M is smooth in u right up to choking, where it is not in mfp itself,
+    and a uniform grid is looked up by arithmetic instead of a search.
+    """
+    choked = float(mass_flow_parameter(1.0, gamma, R))
+    u = np.linspace(0.0, 1.0, MFP_POINTS)
+    M = bisect_monotonic(lambda M: mass_flow_parameter(M, gamma, R), choked * (1 - u**2), 0.0, 1.0, increasing=True)
+    M[0], M[-1] = 1.0, 0.0
+    M.setflags(write=False)
+    return choked, M
+
+
+def mach_from_mass_flow_parameter(mfp, gamma, R):
+    """
+    Subsonic Mach number at a mass-flow parameter, from the cached table.
+
+    Parameters:
+    mfp (float or array): Mass-flow parameter m sqrt(T0) / (A P0)
+    gamma (float): Specific heat ratio
+    R (float): Specific gas constant (J/(kg*K))
+
+    Returns:
+    array: Mach number, 1 at and above the choked value.
+    """
+    choked, M = _mfp_table(float(gamma), float(R))
+    x = np.sqrt(np.clip(1 - np.asarray(mfp, dtype=float) / choked, 0.0, 1.0)) * (len(M) - 1)
+    i = np.minimum(x.astype(np.intp), len(M) - 2)
+    t = x - i
+    return M[i] * (1 - t) + M[i + 1] * t
+
+
+@functools.lru_cache(maxsize=None)
+def _throat(geometry, gamma, R):
+    """
+    The throat's mass-flow parameter at the engine's corrected flow, the
+    throttle its choked flow allows (1 when it passes the whole demand)
+    and its Mach number, all fixed by the geometry.
+    """
+    throat_mfp = geometry.corrected_flow * np.sqrt(T_REF) / (P_REF * geometry.A_throat)
+    limit = np.minimum(mass_flow_parameter(1.0, gamma, R) / throat_mfp, 1.0)
+    return throat_mfp, limit, mach_from_mass_flow_parameter(throat_mfp, gamma, R)
+
+
+def size_inlet(face_velocity=FACE_VELOCITY, **overrides):
+    """
+    Size the inlet at a design point.
+
+    The capture area passes the design flow in the free-stream tube, the
+    throat passes it at the compressor-face velocity, and the corrected
+    flow is the engine's at the design face conditions.
+
+    Parameters:
+    face_velocity (float): Compressor-face velocity at the design point (m/s).
+    **overrides: Scalar input values replacing the design point.
+
+    Returns:
+    InletGeometry: The sized inlet.
+    """
+    inputs = cycle_inputs(**overrides)
+    P1, T1, V1, m_flow = (float(inputs[name]) for name in ("P1", "T1", "V1", "m_flow"))
+    gamma, cp, R = (float(inputs[name]) for name in ("gamma", "cp", "R"))
+    if V1 <= 0:
+        raise ValueError("The design point needs a flight speed to size the capture area.")
+    face = inlet(P1, T1, V1, inputs["eta_i"], inputs["eta_p"], gamma, cp)
+    T02, P02 = float(face["T02"]), float(face["P02"])
+    M_face = face_velocity / float(np.sqrt(gamma * R * (T02 - face_velocity**2 / (2 * cp))))
+    if M_face >= 1:
+        raise ValueError("The compressor-face velocity must be subsonic.")
+    return InletGeometry(
+        A_capture=m_flow / (P1 / (R * T1) * V1),
+        A_throat=m_flow * float(np.sqrt(T02)) / (P02 * float(mass_flow_parameter(M_face, gamma, R))),
+        corrected_flow=m_flow * float(np.sqrt(T02 / T_REF)) / (P02 / P_REF),
+    )
+
+
+def match_inlet(geometry, P1, T1, V1, eta_i, eta_p, gamma, cp, R):
+    """
+    Match the inlet airflow to the engine's demand.
+
+    Parameters:
+    geometry (InletGeometry): Inlet areas and engine corrected flow.
+    P1, T1, V1 (float or array): Free-stream static pressure (Pa),
+        temperature (K) and velocity (m/s).
+    eta_i, eta_p, gamma, cp, R: As in the cycle's inlet.
+
+    Returns:
+    dict: m_flow (kg/s) and eta_p (including the normal-shock loss above
+    Mach 1 and any supercritical loss) to run the cycle with, and the
+    compressor-face T02 and P02 they give; recovery P02 / P0 of the free
+    stream; spillage (kg/s) and capture_ratio, the captured stream tube
+    over the capture area (above 1 with pre-entry suction at low speed);
+    M_throat; and inlet_limited, True where the capture area or a choked
+    throat held the flow below the engine's demand.
+    """
+    face = inlet(P1, T1, V1, eta_i, eta_p, gamma, cp)
+    T02 = face["T02"]
+    M1_sq = V1**2 / (gamma * R * T1)
+    supersonic = M1_sq > 1
+    # The shock ratio is exactly 1 at Mach 1, so it needs no mask below it.
+    shock = normal_shock_total_pressure_ratio(np.maximum(M1_sq, 1.0), gamma, squared=True) if np.any(supersonic) else 1.0
+    demand = geometry.corrected_flow * np.sqrt(T_REF) / P_REF * face["P02"] * shock / np.sqrt(T02)
+    capture = P1 / (R * T1) * V1 * geometry.A_capture  # free-stream tube of the capture area
+    # At constant corrected flow the throat's mass-flow parameter, and so its
+    # choked flow over the demand, is the same at every flight condition.
+    throat_mfp, limit, M_design = _throat(geometry, float(gamma), float(R))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        throttle = np.where(supersonic, np.minimum(capture / demand, limit), limit)
+        m_flow = demand * throttle
+        capture_ratio = m_flow / capture
+    # Supercritical: the face pressure falls until the corrected flow matches what gets through.
+    inlet_limited = throttle < 1
+    M_throat = np.full(np.shape(throttle), M_design)
+    if inlet_limited.any():
+        M_throat[inlet_limited] = mach_from_mass_flow_parameter(throat_mfp * throttle[inlet_limited], gamma, R)
+    shock_throttle = shock * throttle
+    P02 = face["P02"] * shock_throttle
+    return {
+        "m_flow": m_flow,
+        "eta_p": eta_p * shock_throttle,
+        "T02": T02,
+        "P02": P02,
+        "recovery": P02 / (P1 * (1 + (gamma - 1) / 2 * M1_sq) ** (gamma / (gamma - 1))),
+        "spillage": np.maximum(capture - m_flow, 0.0),
+        "capture_ratio": capture_ratio,
+        "M_throat": M_throat,
+        "inlet_limited": inlet_limited,
+    }
+
+
+def run_matched(geometry=None, **overrides):
+    """
+    Run the cycle with the inlet supplying the airflow.
+
+    Parameters:
+    geometry (InletGeometry): Inlet and engine demand; sized at the design
+        point when None.
+    **overrides: Input values (floats or arrays) replacing the design
+        point; m_flow comes from the matching.
+
+    Returns:
+    dict: The cycle state, with the matching outputs (MATCH_OUTPUTS) added.
+    The inlet station is not rerun: the matched face state feeds the
+    compressor directly.
+    """
+    if "m_flow" in overrides:
+        raise ValueError("m_flow is set by the inlet matching; change the geometry's corrected flow instead.")
+    if geometry is None:
+        geometry = size_inlet()
+    inputs = cycle_inputs(**overrides)
+    inputs.update(match_inlet(geometry, *(inputs[name] for name in ("P1", "T1", "V1", "eta_i", "eta_p", "gamma", "cp", "R"))))
+    return run_stations(inputs, STATION_NAMES[1:])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match the inlet to the engine over a flight envelope.")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    geometry = size_inlet()
+    print(f"Capture area {geometry.A_capture:.3f} m^2, throat area {geometry.A_throat:.3f} m^2, "
+          f"corrected flow {geometry.corrected_flow:.1f} kg/s")
+    print(f"{'altitude':>9} {'Mach':>5} {'m_flow':>8} {'spillage':>9} {'capture':>8} {'recovery':>9} "
+          f"{'M_throat':>9} {'thrust':>10}")
+    altitude, mach = np.meshgrid([0.0, 6000.0, 11000.0], [0.0, 0.4, 0.8, 1.2, 1.6, 2.0], indexing="ij")
+    state = run_matched(geometry, **flight_condition(altitude.ravel(), mach.ravel()))
+    for k, (h, M) in enumerate(zip(altitude.ravel(), mach.ravel())):
+        print(f"{h:>9.0f} {M:>5.1f} {state['m_flow'][k]:>8.1f} {state['spillage'][k]:>9.1f} "
+              f"{state['capture_ratio'][k]:>8.2f} {state['recovery'][k]:>9.3f} {state['M_throat'][k]:>9.3f}"
+              f"{'*' if state['inlet_limited'][k] else ' '}{state['thrust'][k]:>10.0f}")
+    print("* inlet-limited: capture stream tube below the demand (supercritical)")
+
+    rng = np.random.default_rng(0)
+    inputs = flight_condition(rng.uniform(0.0, 15000.0, args.points), rng.uniform(0.0, 2.0, args.points))
+    timings = []
+    for run in (lambda: run_cycle(**inputs), lambda: run_matched(geometry, **inputs)):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            run()
+        timings.append((time.perf_counter() - started) / args.repeat)
+    print(f"{args.points} envelope points: cycle {timings[0] * 1000:.1f} ms, with inlet matching "
+          f"{timings[1] * 1000:.1f} ms ({timings[1] / timings[0] - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Vectorized interpolation on rectilinear grids.
+"""
+import itertools
+
+import numpy as np
+
+METHODS = {"linear": 2, "cubic": 4}  # nodes per axis in the interpolation stencil
+
+
+class GridInterpolator:
+    """
+    Multilinear or tensor-product cubic interpolation on a rectilinear grid.
+
+    Cubic interpolation uses the four nearest nodes along each axis
+    (Lagrange), so it works on non-uniform grids. Queries outside the grid
+    are clamped to its edges.
+
+    Parameters:
+    axes (sequence of 1-D arrays): Increasing grid coordinates along each axis.
+    values (array): Table with shape (len(axes[0]), ..., len(axes[-1])) plus
+        any trailing output dimensions. Memory-mapped arrays work as-is.
+    method (str): "linear" or "cubic".
+    """
+
+    def __init__(self, axes, values, method="linear"):
+        if method not in METHODS:
+            raise ValueError(f"Unknown interpolation method '{method}'; use one of {', '.join(METHODS)}.")
+        self.method = method
+        self.axes = tuple(np.asarray(axis, dtype=float) for axis in axes)
+        self.values = values if isinstance(values, np.ndarray) else np.asarray(values)
+        grid_shape = tuple(len(axis) for axis in self.axes)
+        if self.values.shape[:len(grid_shape)] != grid_shape:
+            raise ValueError(f"Table shape {self.values.shape} does not match grid shape {grid_shape}.")
+        for axis in self.axes:
+            if len(axis) < METHODS[method] or np.any(np.diff(axis) <= 0):
+                raise ValueError(f"{method} interpolation needs at least {METHODS[method]} strictly increasing points per axis.")
+        self.grid_shape = grid_shape
+        self.output_shape = self.values.shape[len(grid_shape):]
+        # Flat view: one row per grid node, so each stencil node is gathered with one take.
+        self._flat = self.values.reshape(-1, *self.output_shape)
+        self._strides = [int(np.prod(grid_shape[i + 1:])) for i in range(len(grid_shape))]
+        # Uniform axes are located arithmetically instead of by binary search.
+        self._uniform = [np.allclose(np.diff(axis), axis[1] - axis[0], rtol=1e-9, atol=0) for axis in self.axes]
+
+    def _cell(self, d, x):
+        axis = self.axes[d]
+        if self._uniform[d]:
+            i = ((x - axis[0]) * ((len(axis) - 1) / (axis[-1] - axis[0]))).astype(np.intp)
+        else:
+            i = np.searchsorted(axis, x, side="right") - 1
+        return np.clip(i, 0, len(axis) - 2)
+
+    def _stencil(self, d, x):
+        axis = self.axes[d]
+        x = np.clip(x, axis[0], axis[-1])
+        i = self._cell(d, x)
+        if self.method == "linear":
+            t = (x - axis[i]) / (axis[i + 1] - axis[i])
+            return [i, i + 1], [1.0 - t, t]
+        start = np.clip(i - 1, 0, len(axis) - 4)
+        nodes = [start + k for k in range(4)]
+        points = [axis[node] for node in nodes]
+        weights = []
+        for k in range(4):
+            w = 1.0
+            for m in range(4):
+                if m != k:
+                    w = w * (x - points[m]) / (points[k] - points[m])
+            weights.append(w)
+        return nodes, weights
+
+    def __call__(self, *coords):
+        """
+        Interpolate at query points.
+
+        Parameters:
+        *coords (float or array): One coordinate per axis, broadcast together.
+
+        Returns:
+        array: Interpolated values with the broadcast query shape plus the output dimensions.
+        """
+        if len(coords) != len(self.axes):
+            raise ValueError(f"Expected {len(self.axes)} coordinates, got {len(coords)}.")
+        coords = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in coords))
+        shape = coords[0].shape
+        stencils = [self._stencil(d, x.ravel()) for d, x in enumerate(coords)]
+        trailing = (1,) * len(self.output_shape)
+        result = 0.0
+        for corner in itertools.product(range(METHODS[self.method]), repeat=len(self.axes)):
+            index = 0
+            weight = 1.0
+            for d, k in enumerate(corner):
+                nodes, weights = stencils[d]
+                index = index + nodes[k] * self._strides[d]
+                weight = weight * weights[k]
+            result = result + weight.reshape(weight.shape + trailing) * self._flat[index]
+        return np.reshape(result, shape + self.output_shape)
@@ -0,0 +1,202 @@
+"""
+Mission fuel burn for many missions at once.
+
+A mission is a time series of altitude, Mach number and power setting
+(0 idle, 1 max dry, 2 max reheat; see deck.power_schedule). integrate_missions
+runs the engine at every time step of every mission and integrates fuel
+burned, afterburner time and impulse with the trapezoidal rule. Time steps
+are processed in blocks, each block one vectorized call across all missions,
+with the running totals carried from block to block, so memory stays
+bounded however long the missions are.
+
+The engine is either the full cycle (deck_cycle) or a Deck interpolated
+from a file; both run a few million steps per second.
+
+    python -m jetsim.mission --missions 5000
+"""
+import argparse
+import collections
+import time
+
+import numpy as np
+
+from jetsim.deck import Deck, deck_cycle
+
+MISSION_OUTPUTS = ("thrust", "m_fuel_total")
+BLOCK_POINTS = 1 << 20  # engine evaluations per vectorized call
+
+MissionResult = collections.namedtuple(
+    "MissionResult", ("fuel", "afterburner_time", "impulse", "duration", "thrust", "fuel_burned"))
+MissionResult.__doc__ = """
+Totals per mission, shape (missions,): fuel (kg), afterburner_time (s),
+impulse (N*s) and duration (s). thrust (N) and fuel_burned (cumulative,
+kg) are (missions, steps) histories, or None unless asked for.
+"""
+
+
+def mission_power(throttle, afterburner=0.0):
+    """
+    Combine a dry throttle and an afterburner setting into a power setting.
+
+    Parameters:
+    throttle (float or array): Dry throttle, 0 (idle) to 1 (max dry).
+    afterburner (float or array): Reheat setting, 0 (off) to 1 (max); any
+        reheat runs the core at max dry.
+
+    Returns:
+    array: Power setting, 0 to 2.
+    """
+    throttle = np.asarray(throttle, dtype=float)
+    afterburner = np.asarray(afterburner, dtype=float)
+    if np.any(throttle < 0) or np.any(throttle > 1) or np.any(afterburner < 0) or np.any(afterburner > 1):
+        raise ValueError("Throttle and afterburner settings must be between 0 and 1.")
+    return np.where(afterburner > 0, 1.0 + afterburner, throttle)
+
+
+def integrate_missions(time, altitude, mach, power, engine=None, history=False, block_points=BLOCK_POINTS,
+                       **overrides):
+    """
+    Integrate fuel burn, afterburner time and impulse over many missions.
+
+    Parameters:
+    time (array): Time in s, shape (steps,) shared by all missions or
+        (missions, steps). Missions shorter than the longest are padded
+        with NaN times at the end.
+    altitude, mach, power (array): Altitude in m, Mach number and power
+        setting (0 to 2), each broadcastable to (missions, steps).
+    engine (Deck or str): Deck, or deck file, to interpolate; None runs
+        the full cycle at every step.
+    history (bool): Also return the thrust and cumulative fuel histories.
+    block_points (int): Engine evaluations per vectorized call.
+    **overrides: Cycle inputs replacing the design point (full cycle only).
+
+    Returns:
+    MissionResult: Totals per mission, and the histories if asked for.
+    """
+    time = np.asarray(time, dtype=float)
+    shape = np.broadcast_shapes(np.shape(time), np.shape(altitude), np.shape(mach), np.shape(power))
+    if len(shape) == 1:
+        shape = (1,) + shape
+    if len(shape) != 2:
+        raise ValueError("Mission inputs must have shape (steps,) or (missions, steps).")
+    missions, steps = shape
+    time, altitude, mach, power = (np.broadcast_to(np.asarray(value, dtype=float), shape)
+                                   for value in (time, altitude, mach, power))
+    valid = np.isfinite(time)
+    if np.any(valid[:, 1:] & ~valid[:, :-1]):
+        raise ValueError("Mission times may only be padded with NaN at the end.")
+    if np.any(np.diff(time, axis=1)[valid[:, 1:]] < 0):
+        raise ValueError("Mission times must be increasing.")
+    if isinstance(engine, str):
+        engine = Deck(engine)
+    if engine is not None and overrides:
+        raise ValueError("Cycle overrides apply to the full cycle only; build them into the deck instead.")
+
+    fuel = np.zeros(missions)
+    afterburner_time = np.zeros(missions)
+    impulse = np.zeros(missions)
+    thrust_history = np.full(shape, np.nan) if history else None
+    fuel_history = np.full(shape, np.nan) if history else None
+    previous = None  # (time, thrust, fuel flow, reheat) at the last step of the previous block
+    block = max(1, block_points // missions)
+    for start in range(0, steps, block):
+        stop = min(start + block, steps)
+        window = valid[:, start:stop]
+        # Evaluate only the real steps; padding stays NaN.
+        thrust = np.full(window.shape, np.nan)
+        fuel_flow = np.full(window.shape, np.nan)
+        rows, columns = np.nonzero(window)
+        if len(rows):
+            args = (altitude[:, start:stop][rows, columns], mach[:, start:stop][rows, columns],
+                    power[:, start:stop][rows, columns])
+            state = engine(*args) if engine is not None else deck_cycle(*args, **overrides)
+            thrust[rows, columns] = state["thrust"]
+            fuel_flow[rows, columns] = state["m_fuel_total"]
+        reheat = (power[:, start:stop] > 1.0).astype(float)
+        t = time[:, start:stop]
+        if previous is not None:
+            # Prepend the previous block's last step so its interval is counted.
+            t, thrust_ext, flow_ext, reheat_ext = (np.concatenate([p[:, None], x], axis=1) for p, x in
+                                                   zip(previous, (t, thrust, fuel_flow, reheat)))
+        else:
+            thrust_ext, flow_ext, reheat_ext = thrust, fuel_flow, reheat
+        dt = np.diff(t, axis=1)
+        interval = np.isfinite(dt)
+        dt = np.where(interval, dt, 0.0)
+        burned = np.where(interval, 0.5 * (flow_ext[:, 1:] + flow_ext[:, :-1]) * dt, 0.0)
+        cumulative = fuel[:, None] + np.cumsum(burned, axis=1)
+        afterburner_time += (0.5 * (reheat_ext[:, 1:] + reheat_ext[:, :-1]) * dt).sum(axis=1)
+        impulse += np.where(interval, 0.5 * (thrust_ext[:, 1:] + thrust_ext[:, :-1]) * dt, 0.0).sum(axis=1)
+        if history:
+            thrust_history[:, start:stop] = thrust
+            cumulative_block = cumulative if previous is not None else np.concatenate(
+                [fuel[:, None], cumulative], axis=1)
+            fuel_history[:, start:stop] = np.where(window, cumulative_block[:, -window.shape[1]:], np.nan)
+        fuel = cumulative[:, -1] if cumulative.shape[1] else fuel
+        previous = (t[:, -1], thrust_ext[:, -1], flow_ext[:, -1], reheat_ext[:, -1])
+    first = time[:, 0]
+    last = np.where(valid.any(axis=1), time[np.arange(missions), valid.sum(axis=1) - 1], np.nan)
+    return MissionResult(fuel, afterburner_time, impulse, last - first, thrust_history, fuel_history)
+
+
+def synthetic_missions(missions, duration=3600.0, dt=10.0, seed=0):
+    """
+    Random climb, cruise, dash and descent missions for fleet studies.
+
+    Each mission climbs at max dry power to a cruise altitude, cruises,
+    makes a reheat dash of random length, and descends at idle.
+
+    Parameters:
+    missions (int): Number of missions.
+    duration (float): Mission length in s.
+    dt (float): Time step in s.
+    seed (int): Random seed.
+
+    Returns:
+    dict: time (steps,), and altitude, mach and power (missions, steps).
+    """
+    rng = np.random.default_rng(seed)
+    time = np.arange(0.0, duration + 0.5 * dt, dt)
+    u = time / duration
+    cruise_altitude = rng.uniform(6000.0, 12000.0, (missions, 1))
+    cruise_mach = rng.uniform(0.6, 0.9, (missions, 1))
+    climb_end = rng.uniform(0.1, 0.2, (missions, 1))
+    dash_start = rng.uniform(0.4, 0.6, (missions, 1))
+    dash_end = dash_start + rng.uniform(0.02, 0.1, (missions, 1))
+    descent_start = rng.uniform(0.8, 0.9, (missions, 1))
+    cruise_power = rng.uniform(0.5, 0.8, (missions, 1))
+    reheat = rng.uniform(0.3, 1.0, (missions, 1))
+
+    climb = np.clip(u / climb_end, 0.0, 1.0)
+    descent = np.clip((u - descent_start) / (1.0 - descent_start), 0.0, 1.0)
+    altitude = cruise_altitude * climb * (1.0 - descent)
+    dash = (u >= dash_start) & (u < dash_end)
+    mach = np.where(dash, 1.4, 0.3 + (cruise_mach - 0.3) * climb * (1.0 - 0.5 * descent))
+    power = np.where(u < climb_end, 1.0, np.where(u >= descent_start, 0.0, cruise_power))
+    power = np.where(dash, 1.0 + reheat, power)
+    return {"time": time, "altitude": altitude, "mach": mach, "power": power}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Integrate fuel burn over synthetic missions.")
+    parser.add_argument("--missions", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=3600.0, help="Mission length in s.")
+    parser.add_argument("--dt", type=float, default=10.0, help="Time step in s.")
+    parser.add_argument("--deck", help="Interpolate this deck file instead of running the full cycle.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    missions = synthetic_missions(args.missions, args.duration, args.dt, args.seed)
+    started = time.perf_counter()
+    result = integrate_missions(**missions, engine=args.deck)
+    elapsed = time.perf_counter() - started
+    steps = args.missions * len(missions["time"])
+    print(f"{args.missions} missions, {steps} engine evaluations in {elapsed:.2f} s "
+          f"({steps / elapsed / 1e6:.2f} M steps/s)")
+    for name, values, unit in (("fuel", result.fuel, "kg"), ("afterburner_time", result.afterburner_time, "s"),
+                               ("mean thrust", result.impulse / result.duration / 1000, "kN")):
+        print(f"{name:>17}: mean {values.mean():.4g} {unit}, min {values.min():.4g}, max {values.max():.4g}")
+
+
+if __name__ == "__main__":
+    main()
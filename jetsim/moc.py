@@ -0,0 +1,424 @@
+"""
+Minimum-length diverging nozzle contours by the method of characteristics.
+
+The nozzle turns the flow through a centred expansion at a sharp-cornered
+throat of radius 1, with uniform flow just above Mach 1 across the throat
+(a straight sonic line would make the characteristics vertical).
+Characteristics from the throat and the corner fan cross and reflect off
+the axis in the kernel; the corner angle theta_max is iterated until the
+last fan characteristic reaches the axis at the design exit Mach, from
+which a straight characteristic bounds the uniform exit flow. The wall is
+the streamline through the corner: on every characteristic between the
+kernel and the exit flow it sits where the mass flow from the axis equals
+the throat mass flow.
+
+Axisymmetric flow uses the compatibility relations with their source
+terms (planar=True drops them). The net is solved front by front: each
+front holds the points whose C+ and C- neighbours are already known and
+is one vectorized unit-process call. Designed contours are cached by
+(M_e, gamma, resolution).
+
+    contour = design_contour(M_e=2.0, gamma=1.3333)
+    contour.x, contour.r          # wall, in throat radii
+
+    python -m jetsim.moc
+"""
+import argparse
+import functools
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from jetsim.cycle import nozzle_functions, run_cycle
+from jetsim.nozzle_offdesign import bisect_monotonic
+
+DEFAULT_RESOLUTION = 40  # characteristics from the throat, and again in the corner expansion fan
+CACHE_SIZE = 256  # designed contours kept in memory
+INITIAL_MACH = 1.02  # uniform flow across the throat, just supersonic so characteristics are not vertical
+CORRECTOR_STEPS = 2  # corrector passes of the unit processes
+NEWTON_STEPS = 4  # per inverse Prandtl-Meyer evaluation inside the net
+THETA_TOLERANCE = 1e-10  # rad, on the axis Prandtl-Meyer angle when iterating theta_max
+
+Contour = namedtuple("Contour", ["x", "r", "theta_max", "length", "area_ratio", "mass_error"])
+Contour.__doc__ = """
+Designed wall, in throat radii (half-heights if planar), from the throat
+corner (0, 1) to the exit lip. x and r are read-only arrays; theta_max is
+the wall angle at the corner (rad); area_ratio is the exit-to-throat area
+ratio of the wall; mass_error is the relative mass-flow defect across the
+last fan characteristic, a check on the resolution.
+"""
+
+
+def prandtl_meyer(M, gamma):
+    """
+    Calculate the Prandtl-Meyer angle.
+
+    Parameters:
+    M (float or array): Mach number, at least 1.
+    gamma (float): Specific heat ratio.
+
+    Returns:
+    array: Prandtl-Meyer angle (rad).
+    """
+    M = np.asarray(M, dtype=float)
+    k = (gamma + 1) / (gamma - 1)
+    root = np.sqrt(np.maximum(M**2 - 1, 0.0))
+    return np.sqrt(k) * np.arctan(root / np.sqrt(k)) - np.arctan(root)
+
+
+def mach_from_prandtl_meyer(nu, gamma):
+    """
+    Calculate the Mach number at a Prandtl-Meyer angle.
+
+    Parameters:
+    nu (float or array): Prandtl-Meyer angle (rad), 0 or more.
+    gamma (float): Specific heat ratio.
+
+    Returns:
+    array: Mach number.
+    """
+    nu = np.asarray(nu, dtype=float)
+    if np.any(nu < 0) or np.any(nu >= prandtl_meyer(np.inf, gamma)):
+        raise ValueError("Prandtl-Meyer angle out of range.")
+    return bisect_monotonic(lambda M: prandtl_meyer(M, gamma), nu, 1.0, 100.0, increasing=True)
+
+
+def _mach_angle(nu, gamma, mu):
+    """
+    Mach angle at a Prandtl-Meyer angle, by Newton steps from a nearby Mach angle mu.
+    """
+    M = 1 / np.sin(mu)
+    for _ in range(NEWTON_STEPS):
+        root = np.sqrt(M**2 - 1)
+        step = (prandtl_meyer(M, gamma) - nu) * M * (1 + 0.5 * (gamma - 1) * M**2) / root
+        M = np.maximum(M - step, 0.5 * (M + 1))  # never step past the sonic point
+    return np.arcsin(1 / M)
+
+
+def _source(theta, r, mu, sign, planar):
+    """
+    Axisymmetric source term of the C+ (sign +1) or C- (sign -1) compatibility relation, per unit dx.
+    """
+    if planar:
+        return 0.0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        term = np.sin(mu) * np.sin(theta) / (r * np.cos(theta + sign * mu))
+    return np.where(r > 0, term, 0.0)
+
+
+def _interior(a, b, gamma, planar):
+    """
+    Unit process for interior points: the point on the C+ through a and the C- through b.
+
+    a and b are (x, r, theta, nu, mu) tuples of arrays; along C+ theta - nu
+    changes by -Q+ dx and along C- theta + nu by +Q- dx.
+    """
+    xa, ra, ta, na, ma = a
+    xb, rb, tb, nb, mb = b
+    r, theta, mu = ra, ta, ma  # predictor: coefficients from the known points alone
+    theta_b, mu_b = tb, mb
+    for _ in range(CORRECTOR_STEPS + 1):
+        # Coefficients at the mean of each known point and the new one.
+        t_plus, m_plus, r_plus = 0.5 * (ta + theta), 0.5 * (ma + mu), 0.5 * (ra + r)
+        t_minus, m_minus, r_minus = 0.5 * (tb + theta_b), 0.5 * (mb + mu_b), 0.5 * (rb + r)
+        slope_plus = np.tan(t_plus + m_plus)
+        slope_minus = np.tan(t_minus - m_minus)
+        x = (rb - ra + slope_plus * xa - slope_minus * xb) / (slope_plus - slope_minus)
+        r = ra + slope_plus * (x - xa)
+        plus = ta - na - _source(t_plus, r_plus, m_plus, 1, planar) * (x - xa)
+        minus = tb + nb + _source(t_minus, r_minus, m_minus, -1, planar) * (x - xb)
+        theta = theta_b = 0.5 * (minus + plus)
+        nu = 0.5 * (minus - plus)
+        mu = mu_b = _mach_angle(nu, gamma, mu)
+    return x, r, theta, nu, mu
+
+
+def _axis(b, gamma, planar):
+    """
+    Unit process for axis points: where the C- through b meets the axis (theta = 0).
+    """
+    xb, rb, tb, nb, mb = b
+    mu = mb
+    for _ in range(CORRECTOR_STEPS + 1):
+        t_minus, m_minus, r_minus = 0.5 * tb, 0.5 * (mb + mu), 0.5 * rb
+        x = xb - rb / np.tan(t_minus - m_minus)
+        nu = tb + nb + _source(t_minus, r_minus, m_minus, -1, planar) * (x - xb)
+        mu = _mach_angle(nu, gamma, mu)
+    return x, np.zeros_like(x), np.zeros_like(x), nu, mu
+
+
+def _solve(net, fronts, gamma, planar):
+    """
+    Fill a net front by front.
+
+    net is a tuple of (x, r, theta, nu, mu) flat arrays holding the given
+    points; each front is (points, C+ neighbours, C- neighbours, axis
+    points, their C- neighbours) as index arrays, every neighbour solved in
+    an earlier front.
+    """
+    for points, a, b, axis, axis_b in fronts:
+        if len(points):
+            for value, new in zip(net, _interior(tuple(v[a] for v in net), tuple(v[b] for v in net), gamma, planar)):
+                value[points] = new
+        if len(axis):
+            for value, new in zip(net, _axis(tuple(v[axis_b] for v in net), gamma, planar)):
+                value[axis] = new
+
+
+def _fronts(size, interior, axis):
+    """
+    Group points into fronts: each point goes one front after the later of its neighbours.
+
+    interior maps point -> (C+ neighbour, C- neighbour) and axis maps point ->
+    C- neighbour; the other points below size are given.
+    """
+    level = np.zeros(size, dtype=int)
+    for point in sorted(list(interior) + list(axis)):
+        level[point] = 1 + (max(level[n] for n in interior[point]) if point in interior else level[axis[point]])
+    fronts = []
+    for depth in range(1, level.max() + 1):
+        points = [p for p in np.flatnonzero(level == depth) if p in interior]
+        on_axis = [p for p in np.flatnonzero(level == depth) if p in axis]
+        fronts.append((np.array(points, dtype=int), np.array([interior[p][0] for p in points], dtype=int),
+                       np.array([interior[p][1] for p in points], dtype=int),
+                       np.array(on_axis, dtype=int), np.array([axis[p] for p in on_axis], dtype=int)))
+    return fronts
+
+
+@functools.lru_cache(maxsize=None)
+def _kernel_net(resolution):
+    """
+    Topology of the kernel: points 0..n of the initial line (axis to corner),
+    then the corner states of the n fan characteristics, then the points
+    where C- characteristics cross C+ ones or reach the axis.
+
+    Returns:
+    tuple: (points, fronts, points of the last fan characteristic from the corner to the axis).
+    """
+    n = resolution
+    interior, axis = {}, {}
+    size = 2 * n + 1
+    plus = []  # latest point of each C+ characteristic, in the order a C- from above crosses them
+
+    def march(point):
+        nonlocal size
+        line = [point]
+        for k, a in enumerate(plus):
+            interior[size] = (a, line[-1])
+            plus[k] = size
+            line.append(size)
+            size += 1
+        axis[size] = line[-1]
+        plus.append(size)
+        line.append(size)
+        size += 1
+        return line
+
+    for origin in range(1, n + 1):  # C- characteristics from the initial line
+        plus.insert(0, origin - 1)
+        march(origin)
+    for fan in range(n + 1, 2 * n + 1):  # the corner expansion
+        line = march(fan)
+    return size, _fronts(size, interior, axis), np.array(line)
+
+
+def _kernel(theta_max, resolution, gamma, planar):
+    """
+    Solve the kernel: uniform flow at INITIAL_MACH across the initial line
+    x = 0 and a centred expansion to theta_max at the corner (0, 1).
+    """
+    n = resolution
+    size, fronts, last = _kernel_net(n)
+    net = tuple(np.zeros(size) for _ in range(5))
+    x, r, theta, nu, mu = net
+    nu_0 = prandtl_meyer(INITIAL_MACH, gamma)
+    r[:n + 1] = np.linspace(0.0, 1.0, n + 1)
+    r[n + 1:2 * n + 1] = 1.0
+    theta[n + 1:2 * n + 1] = np.linspace(theta_max / n, theta_max, n)
+    nu[:2 * n + 1] = nu_0 + theta[:2 * n + 1]  # along the C+ through the corner, theta - nu stays -nu_0
+    mu[:2 * n + 1] = np.arcsin(1 / INITIAL_MACH)
+    mu[n + 1:2 * n + 1] = _mach_angle(nu[n + 1:2 * n + 1], gamma, mu[n + 1:2 * n + 1])
+    _solve(net, fronts, gamma, planar)
+    return tuple(value[last] for value in net)
+
+
+def _exit_region(line, M_e, gamma, r_exit, planar):
+    """
+    The net between the last fan characteristic and the straight characteristic
+    bounding the uniform exit flow: point (j, k) is where the C+ through point
+    j of the last fan characteristic (from the corner to the axis) crosses the
+    C- through point k of the exit characteristic. Row p - 1 is the exit
+    characteristic, column 0 the last fan characteristic.
+    """
+    p = len(line[0])
+    m = p - 1
+    net = tuple(np.zeros((p, m + 1)) for _ in range(5))
+    for value, last in zip(net, line):
+        value[:, 0] = last
+    x, r, theta, nu, mu = net
+    mu_e = np.arcsin(1 / M_e)
+    r[-1, 1:] = r_exit * np.arange(1, m + 1) / m
+    x[-1, 1:] = x[-1, 0] + r[-1, 1:] / np.tan(mu_e)
+    nu[-1, 1:] = prandtl_meyer(M_e, gamma)
+    mu[-1, 1:] = mu_e
+
+    index = np.arange(p * (m + 1)).reshape(p, m + 1)
+    fronts = []
+    none = np.array([], dtype=int)
+    for d in range(2, p + m):
+        k = np.arange(max(1, d - p + 1), min(m, d - 1) + 1)
+        j = p - 1 + k - d
+        fronts.append((index[j, k], index[j, k - 1], index[j + 1, k], none, none))
+    _solve(tuple(value.reshape(-1) for value in net), fronts, gamma, planar)
+    return net
+
+
+def _mass_flow(net, gamma, planar):
+    """
+    Mass flow, as a fraction of the choked mass flow of the throat, from the
+    axis up each C- of the exit region: uniform exit flow below the exit
+    characteristic, then across the C- up to each point.
+    """
+    x, r, theta, nu, mu = (value[::-1] for value in net)  # rows from the exit characteristic up
+    # rho V / (rho* a*) is the inverse of the isentropic area ratio.
+    flux = np.sin(mu) / nozzle_functions.calculate_area_ratio(1 / np.sin(mu), gamma)
+    integrand = flux if planar else 2 * r * flux
+    ds = np.hypot(np.diff(x, axis=0), np.diff(r, axis=0))
+    crossed = np.cumsum(0.5 * (integrand[1:] + integrand[:-1]) * ds, axis=0)
+    below = (r[0] if planar else r[0] ** 2) / nozzle_functions.calculate_area_ratio(1 / np.sin(mu[0]), gamma)
+    return x, r, np.vstack([below, below + crossed])
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _design(M_e, gamma, resolution, planar):
+    nu_e = prandtl_meyer(M_e, gamma)
+    nu_0 = prandtl_meyer(INITIAL_MACH, gamma)
+
+    def axis_defect(theta_max):
+        line = _kernel(theta_max, resolution, gamma, planar)
+        return line[3][-1] - nu_e, line
+
+    # Secant on theta_max. A planar nozzle turns half the expansion at the
+    # corner; an axisymmetric one turns less, the rest coming from the
+    # convergence of the flow towards the axis.
+    turn = nu_e - nu_0
+    guesses = [0.5 * turn, 0.45 * turn] if planar else [0.25 * turn, 0.2 * turn]
+    defects = [axis_defect(theta)[0] for theta in guesses]
+    for _ in range(50):
+        theta_max = guesses[1] - defects[1] * (guesses[1] - guesses[0]) / (defects[1] - defects[0])
+        defect, line = axis_defect(theta_max)
+        guesses, defects = [guesses[1], theta_max], [defects[1], defect]
+        if abs(defect) < THETA_TOLERANCE:
+            break
+    else:
+        raise ValueError(f"Corner angle did not converge for M_e = {M_e}, gamma = {gamma}.")
+
+    # Same mass flow as the initial line, of unit radius.
+    throat = 1.0 / nozzle_functions.calculate_area_ratio(INITIAL_MACH, gamma)
+    area_ratio = nozzle_functions.calculate_area_ratio(M_e, gamma) * throat
+    r_exit = area_ratio if planar else np.sqrt(area_ratio)
+    x, r, mass = _mass_flow(_exit_region(line, M_e, gamma, r_exit, planar), gamma, planar)
+    # The wall crosses each C- where the mass flow reaches that of the throat.
+    reached = mass >= throat
+    top = np.argmax(reached, axis=0)
+    columns = np.flatnonzero(reached.any(axis=0) & (top > 0))
+    columns = columns[(columns > 0) & (columns < mass.shape[1] - 1)]  # the corner and the exit lip are known
+    upper, lower = top[columns], top[columns] - 1
+    share = (throat - mass[lower, columns]) / (mass[upper, columns] - mass[lower, columns])
+    wall_x = np.concatenate([[0.0], x[lower, columns] + share * (x[upper, columns] - x[lower, columns]),
+                             [x[0, -1]]])
+    wall_r = np.concatenate([[1.0], r[lower, columns] + share * (r[upper, columns] - r[lower, columns]),
+                             [r_exit]])
+    keep = np.concatenate([[True], np.diff(wall_x) > 0])  # drop points the interpolation put out of order
+    wall_x, wall_r = wall_x[keep], wall_r[keep]
+    for value in (wall_x, wall_r):
+        value.setflags(write=False)
+    return Contour(wall_x, wall_r, float(theta_max), float(wall_x[-1]), float(area_ratio),
+                   float(mass[-1, 0] / throat - 1.0))
+
+
+def design_contour(M_e, gamma, resolution=DEFAULT_RESOLUTION, planar=False):
+    """
+    Design the minimum-length diverging contour for an exit Mach number.
+
+    Results are cached by (M_e, gamma, resolution, planar); the returned
+    arrays are shared between calls and read-only.
+
+    Parameters:
+    M_e (float): Design exit Mach number, above INITIAL_MACH.
+    gamma (float): Specific heat ratio.
+    resolution (int): Characteristics from the throat, and again in the corner fan.
+    planar (bool): Design a two-dimensional nozzle instead of an axisymmetric one.
+
+    Returns:
+    Contour: Wall coordinates in throat radii and design checks.
+    """
+    if np.ndim(M_e) or np.ndim(gamma):
+        raise ValueError("A contour is designed for one M_e and gamma; loop over arrays.")
+    if not M_e > INITIAL_MACH:
+        raise ValueError(f"The design exit Mach number must be above {INITIAL_MACH}.")
+    if not gamma > 1:
+        raise ValueError("The specific heat ratio must be above 1.")
+    if int(resolution) < 2:
+        raise ValueError("The resolution must be at least 2 characteristics.")
+    return _design(float(M_e), float(gamma), int(resolution), bool(planar))
+
+
+def cycle_contour(resolution=DEFAULT_RESOLUTION, **overrides):
+    """
+    Design the nozzle contour for the cycle's exit Mach number and gamma_nozzle.
+
+    Parameters:
+    resolution (int): Characteristics from the throat, and again in the corner fan.
+    **overrides: Scalar cycle inputs replacing the design point.
+
+    Returns:
+    Contour: Wall coordinates in throat radii and design checks.
+    """
+    state = run_cycle(**overrides)
+    return design_contour(state["M_e"], state["gamma_nozzle"], resolution)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Design the minimum-length nozzle contour of the cycle.")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Override a cycle input, e.g. --set M_e=2.5.")
+    parser.add_argument("--resolution", type=int, default=DEFAULT_RESOLUTION)
+    parser.add_argument("--planar", action="store_true", help="Design a two-dimensional nozzle.")
+    parser.add_argument("--plot", action="store_true", help="Plot the contour (needs matplotlib).")
+    args = parser.parse_args(argv)
+    overrides = {}
+    for item in args.set:
+        name, _, value = item.partition("=")
+        overrides[name] = float(value)
+
+    state = run_cycle(**overrides)
+    M_e, gamma = state["M_e"], state["gamma_nozzle"]
+    timings = []
+    for _ in range(2):
+        started = time.perf_counter()
+        contour = design_contour(M_e, gamma, args.resolution, args.planar)
+        timings.append(time.perf_counter() - started)
+    target = nozzle_functions.calculate_area_ratio(M_e, gamma)
+    print(f"M_e = {M_e:.3f}, gamma = {gamma:.4f}, {'planar' if args.planar else 'axisymmetric'}, "
+          f"{args.resolution} characteristics")
+    print(f"corner angle {np.degrees(contour.theta_max):.3f} deg, length {contour.length:.3f} throat radii")
+    print(f"wall exit area ratio {contour.area_ratio:.4f} (calculate_area_ratio {target:.4f} from a sonic throat), "
+          f"throat mass flow error {contour.mass_error:.2e}")
+    print(f"designed in {timings[0] * 1000:.1f} ms, cached in {timings[1] * 1e6:.1f} us")
+    if args.plot:
+        import matplotlib.pyplot as plt
+        figure, ax = plt.subplots(figsize=(10, 4))
+        ax.plot(contour.x, contour.r, color="blue", linewidth=2)
+        ax.plot(contour.x, -contour.r, color="blue", linewidth=2)
+        ax.fill_between(contour.x, contour.r, -contour.r, color="lightblue", alpha=0.5)
+        ax.set_aspect("equal")
+        ax.set_xlabel("x / throat radius")
+        ax.set_ylabel("r / throat radius")
+        ax.set_title(f"Minimum-length nozzle, M_e = {M_e:.2f}")
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
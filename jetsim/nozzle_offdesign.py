@@ -0,0 +1,244 @@
+"""
+Off-design converging-diverging nozzle with back-pressure regime classification.
+
+nozzle_functions.py assumes the nozzle runs at its design exit Mach. Here
+the nozzle geometry (exit-to-throat area ratio) and back pressure are
+given, and each point is classified from the nozzle pressure ratio:
+
+    SUBSONIC         back pressure above the first critical pressure; no choking
+    SHOCK_IN_NOZZLE  a normal shock stands in the diverging section
+    OVEREXPANDED     supersonic exit below the back pressure; shocks outside
+    IDEAL            supersonic exit at the back pressure
+    UNDEREXPANDED    supersonic exit above the back pressure; expansion outside
+
+Every point is solved with array masks, no Python loop over points.
+
+    python -m jetsim.nozzle_offdesign
+"""
+import argparse
+
+import numpy as np
+
+from jetsim.atmosphere import standard_atmosphere
+from jetsim.cycle import nozzle_functions, run_cycle
+
+NO_FLOW, SUBSONIC, SHOCK_IN_NOZZLE, OVEREXPANDED, IDEAL, UNDEREXPANDED = range(6)
+REGIME_NAMES = ("no flow", "subsonic", "shock in nozzle", "over-expanded", "ideal", "under-expanded")
+
+
+def pressure_ratio(M, gamma):
+    """
+    Calculate the static-to-stagnation pressure ratio p/p0 at a Mach number.
+    """
+    return nozzle_functions.calculate_P_exit(1.0, M, gamma)
+
+
+def normal_shock_pressure_ratio(M1, gamma):
+    """
+    Calculate the static pressure ratio p2/p1 across a normal shock.
+    """
+    return 1 + 2 * gamma / (gamma + 1) * (M1**2 - 1)
+
+
+def normal_shock_total_pressure_ratio(M1, gamma, *, squared=False):
+    """
+    Calculate the stagnation pressure ratio p02/p01 across a normal shock.
+
+    With squared=True, M1 is the square of the upstream Mach number.
+    """
+    M1_sq = M1 if squared else M1**2
+    return (((gamma + 1) * M1_sq) / ((gamma - 1) * M1_sq + 2)) ** (gamma / (gamma - 1)) * (
+        (gamma + 1) / (2 * gamma * M1_sq - (gamma - 1))) ** (1 / (gamma - 1))
+
+
+def bisect_monotonic(func, target, lo, hi, increasing, iterations=60):
+    """
+    Solve func(x) = target elementwise by bisection, for a func monotonic on [lo, hi].
+
+    Parameters:
+    func (callable): Vectorized function of x.
+    target (float or array): Values to reach; the result has its shape.
+    lo, hi (float or array): Bracket, broadcast against target.
+    increasing (bool): True if func increases with x on the bracket.
+    iterations (int): Halvings; 60 resolves a unit bracket to rounding.
+
+    Returns:
+    array: x, clamped to the bracket where the target lies outside it.
+    """
+    lo = np.broadcast_to(np.asarray(lo, dtype=float), np.shape(target)).copy()
+    hi = np.broadcast_to(np.asarray(hi, dtype=float), np.shape(target)).copy()
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        above = (func(mid) > target) == increasing
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    return 0.5 * (lo + hi)
+
+
+def mach_from_area_ratio(area_ratio, gamma, supersonic):
+    """
+    Calculate the Mach number at an area ratio A/A*.
+
+    Parameters:
+    area_ratio (float or array): Area ratio A/A*, at least 1.
+    gamma (float): Specific heat ratio.
+    supersonic (bool): True for the supersonic branch, False for the subsonic one.
+
+    Returns:
+    array: Mach number.
+    """
+    area_ratio = np.asarray(area_ratio, dtype=float)
+    if np.any(area_ratio < 1):
+        raise ValueError("Area ratio A/A* cannot be below 1.")
+
+    def area(M):
+        return nozzle_functions.calculate_area_ratio(M, gamma)
+
+    if supersonic:
+        return bisect_monotonic(area, area_ratio, 1.0, 100.0, increasing=True)
+    return bisect_monotonic(area, area_ratio, 1e-9, 1.0, increasing=False)
+
+
+def choked_mass_flux(P0, T0, gamma, R):
+    """
+    Calculate the mass flow per unit throat area of a choked throat, kg/(s*m^2).
+    """
+    return P0 / np.sqrt(R * T0) * np.sqrt(gamma) * (2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1)))
+
+
+def offdesign_nozzle(P0, T0, area_ratio, P_back, gamma, R, m_dot=None, A_throat=None, u0=0.0, m_ram=0.0,
+                     ideal_rtol=1e-3):
+    """
+    Solve a converging-diverging nozzle at given geometry and back pressure.
+
+    Give either the mass flow (the throat is sized to pass it, as with a
+    variable-throat afterburning nozzle) or a fixed throat area.
+
+    Parameters:
+    P0 (float or array): Nozzle inlet stagnation pressure in Pa.
+    T0 (float or array): Nozzle inlet stagnation temperature in K.
+    area_ratio (float or array): Exit-to-throat area ratio Ae/At.
+    P_back (float or array): Back (ambient) pressure in Pa.
+    gamma (float): Specific heat ratio.
+    R (float): Specific gas constant in J/(kg*K).
+    m_dot (float or array): Mass flow through the nozzle in kg/s.
+    A_throat (float or array): Throat area in m^2.
+    u0 (float or array): Flight velocity in m/s, for ram drag.
+    m_ram (float or array): Mass flow charged with ram drag in kg/s.
+    ideal_rtol (float): Relative exit/back pressure mismatch still counted as ideal expansion.
+
+    Returns:
+    dict: regime code, exit Mach, pressure, temperature and velocity,
+    mass flow, throat and exit areas, shock area ratio A_shock/At (NaN
+    without a shock in the nozzle) and thrust in N.
+    """
+    if (m_dot is None) == (A_throat is None):
+        raise ValueError("Give exactly one of m_dot or A_throat.")
+    P0, T0, area_ratio, P_back = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (P0, T0, area_ratio, P_back)))
+
+    M_sub = mach_from_area_ratio(area_ratio, gamma, supersonic=False)
+    M_sup = mach_from_area_ratio(area_ratio, gamma, supersonic=True)
+    p_first = P0 * pressure_ratio(M_sub, gamma)  # choked, subsonic everywhere downstream
+    p_design = P0 * pressure_ratio(M_sup, gamma)  # shock-free supersonic exit
+    p_second = p_design * normal_shock_pressure_ratio(M_sup, gamma)  # normal shock at the exit plane
+
+    regime = np.full(P0.shape, UNDEREXPANDED, dtype=np.int8)
+    regime[(P_back > p_design) & (P_back < p_second)] = OVEREXPANDED
+    regime[np.abs(P_back - p_design) <= ideal_rtol * p_design] = IDEAL
+    regime[P_back >= p_second] = SHOCK_IN_NOZZLE
+    regime[P_back >= p_first] = SUBSONIC
+    regime[P_back >= P0] = NO_FLOW
+
+    M_e = M_sup.copy()
+    P_e = p_design.copy()
+    shock_area_ratio = np.full(P0.shape, np.nan)
+
+    subsonic = regime == SUBSONIC
+    if np.any(subsonic):
+        # Exit static pressure equals back pressure.
+        ratio = (P0[subsonic] / P_back[subsonic]) ** ((gamma - 1) / gamma)
+        M_e[subsonic] = np.sqrt(2 / (gamma - 1) * (ratio - 1))
+        P_e[subsonic] = P_back[subsonic]
+
+    shocked = regime == SHOCK_IN_NOZZLE
+    if np.any(shocked):
+        # Mass conservation across the shock gives Pe*Ae/(P0*At) = (p/p0 * A/A*)(Me).
+        c = (2 / (gamma + 1)) ** ((gamma + 1) / (2 * (gamma - 1)))
+        k = (c * P0[shocked] / (P_back[shocked] * area_ratio[shocked])) ** 2
+        M_exit = np.sqrt((np.sqrt(1 + 2 * (gamma - 1) * k) - 1) / (gamma - 1))
+        total_ratio = P_back[shocked] / (P0[shocked] * pressure_ratio(M_exit, gamma))
+        M_shock = bisect_monotonic(lambda M: normal_shock_total_pressure_ratio(M, gamma), total_ratio,
+                                  1.0, M_sup[shocked], increasing=False)
+        shock_area_ratio[shocked] = nozzle_functions.calculate_area_ratio(M_shock, gamma)
+        M_e[shocked] = M_exit
+        P_e[shocked] = P_back[shocked]
+
+    no_flow = regime == NO_FLOW
+    M_e[no_flow] = 0.0
+    P_e[no_flow] = P_back[no_flow]
+
+    T_e = nozzle_functions.calculate_T_exit(T0, M_e, gamma)
+    V_e = nozzle_functions.calculate_velocity_exit(M_e, gamma, R, T_e)
+    rho_e = nozzle_functions.calculate_density_exit(P_e, T_e, R)
+    exit_flux = rho_e * V_e  # kg/(s*m^2) at the exit plane
+    if A_throat is not None:
+        A_throat = np.broadcast_to(np.asarray(A_throat, dtype=float), P0.shape)
+        A_e = A_throat * area_ratio
+        m_dot = np.where(subsonic | no_flow, exit_flux * A_e, choked_mass_flux(P0, T0, gamma, R) * A_throat)
+    else:
+        m_dot = np.broadcast_to(np.asarray(m_dot, dtype=float), P0.shape)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            A_e = np.where(no_flow, np.nan, m_dot / exit_flux)
+        A_throat = A_e / area_ratio
+
+    thrust = nozzle_functions.calculate_thrust(m_dot, m_ram, u0, V_e, P_e, P_back, A_e)
+    return {
+        "regime": regime,
+        "M_e": M_e,
+        "P_e": P_e,
+        "T_e": T_e,
+        "V_e": V_e,
+        "m_dot": m_dot,
+        "A_throat": A_throat,
+        "A_e": A_e,
+        "shock_area_ratio": shock_area_ratio,
+        "thrust": np.where(no_flow, 0.0, thrust),
+    }
+
+
+def offdesign_thrust(state, area_ratio, P_back=None):
+    """
+    Rework a cycle state's nozzle for a fixed area ratio.
+
+    Parameters:
+    state (dict): Cycle state from run_cycle (needs P06, T06, m_ab, m_total, u0).
+    area_ratio (float or array): Nozzle exit-to-throat area ratio.
+    P_back (float or array): Back pressure in Pa; defaults to the state's P_ambient.
+
+    Returns:
+    dict: offdesign_nozzle results.
+    """
+    return offdesign_nozzle(state["P06"], state["T06"], area_ratio,
+                            state["P_ambient"] if P_back is None else P_back,
+                            state["gamma_nozzle"], state["R"], m_dot=state["m_ab"],
+                            u0=state["u0"], m_ram=state["m_total"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Altitude sweep of the design-point nozzle at fixed geometry.")
+    parser.add_argument("--area-ratio", type=float, default=None, help="Ae/At; defaults to the design M_e area ratio.")
+    args = parser.parse_args(argv)
+    state = run_cycle()
+    area_ratio = state["area_ratio"] if args.area_ratio is None else args.area_ratio
+    altitudes = np.arange(0.0, 20001.0, 2500.0)
+    _, P_back, _ = standard_atmosphere(altitudes)
+    result = offdesign_thrust(state, area_ratio, P_back)
+    print(f"Area ratio Ae/At = {float(area_ratio):.3f}, P06 = {state['P06']:.0f} Pa")
+    print(f"{'Alt (m)':>8} {'Pb (Pa)':>9} {'Regime':>16} {'Me':>6} {'Pe (Pa)':>9} {'As/At':>6} {'Thrust (N)':>11}")
+    for i, altitude in enumerate(altitudes):
+        print(f"{altitude:8.0f} {P_back[i]:9.0f} {REGIME_NAMES[result['regime'][i]]:>16} {result['M_e'][i]:6.3f} "
+              f"{result['P_e'][i]:9.0f} {result['shock_area_ratio'][i]:6.3f} {result['thrust'][i]:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Pipeline-parallel station execution over streamed case chunks.
+
+run_batch runs the whole cycle on one chunk before it starts the next.
+Here the reader, every station (inlet, compressor, combustor, turbine,
+afterburner, nozzle), any post-processing stage and the result writer are
+each a worker thread, joined in cycle order by bounded queues: while the
+nozzle works on one chunk the inlet is already on a later one and the
+writer is putting an earlier one on disk. numpy releases the GIL in its
+array loops and the file writes release it in I/O, so the stages overlap.
+
+Chunks travel in buffers holding one preallocated float array per cycle
+variable, sized for a full chunk. A fixed pool of them circulates reader ->
+stations -> writer -> reader, so a sweep of any length allocates its chunk
+arrays once; each station copies its outputs into the buffer it was handed.
+
+Every stage times how long it works, waits for a chunk and waits for room
+downstream. Its occupancy, the share of the wall time it spent working,
+shows the bottleneck: the busiest stage sets the pace and the others wait.
+
+    result = run_pipeline("cases.csv", "results.csv", outputs=("thrust", "tsfc"))
+    result.stages["combustor"].occupancy
+
+    python -m jetsim.pipeline cases.csv results.csv --compare
+"""
+import argparse
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from jetsim.batch import (CASE_ID, ResultWriter, case_records, has_case_ids, parse_number, queue_get, queue_put,
+                          run_batch)
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, STATIONS
+
+QUEUE_DEPTH = 1  # chunks waiting between two stages
+
+StageTime = namedtuple("StageTime", ["busy", "waiting_input", "waiting_output", "occupancy"])
+StageTime.__doc__ = """
+Time (s) a pipeline stage spent working on chunks, waiting for a chunk
+from upstream and waiting for room downstream, and its occupancy, the
+busy time over the pipeline's wall time.
+"""
+
+PipelineResult = namedtuple("PipelineResult", ["cases", "chunks", "elapsed", "stages"])
+PipelineResult.__doc__ = """
+Cases and chunks run, wall time (s), and a StageTime for every stage in
+pipeline order, keyed by stage name.
+"""
+
+
+class _Buffer:
+    def __init__(self, names, chunk_size):
+        self.columns = {name: np.empty(chunk_size) for name in names}
+        self.ids = [""] * chunk_size
+        self.n = 0
+        self.has_ids = False
+        self.present = set()  # columns holding this chunk's values; the rest take the design point
+
+    def column(self, name):
+        return self.columns[name][:self.n]
+
+    def value(self, name):
+        return self.column(name) if name in self.present else DESIGN_POINT[name]
+
+    def store(self, name, value):
+        np.copyto(self.column(name), value)
+        self.present.add(name)
+
+
+class _Stage:
+    def __init__(self, name, work=None):
+        self.name = name
+        self.work = work
+        self.busy = 0.0
+        self.waiting_input = 0.0
+        self.waiting_output = 0.0
+
+
+def _fill(buffer, records, chunk_size):
+    """Parse up to a chunk of records straight into the buffer's arrays."""
+    buffer.n = 0
+    buffer.has_ids = False
+    buffer.present.clear()
+    filled = {}  # rows written so far in each column; gaps take the design point
+    for row, (where, record) in zip(range(chunk_size), records):
+        for name, value in record.items():
+            if name == CASE_ID:
+                if not buffer.has_ids:
+                    buffer.ids[:row] = [""] * row
+                    buffer.has_ids = True
+                buffer.ids[row] = str(value)
+                continue
+            column = buffer.columns[name]
+            start = filled.get(name, 0)
+            if start < row:
+                column[start:row] = DESIGN_POINT[name]
+            column[row] = parse_number(value, name, where)
+            filled[name] = row + 1
+        if buffer.has_ids and CASE_ID not in record:
+            buffer.ids[row] = ""
+        buffer.n = row + 1
+    for name, start in filled.items():
+        buffer.columns[name][start:buffer.n] = DESIGN_POINT[name]
+        buffer.present.add(name)
+    return buffer.n
+
+
+def _read(stage, records, chunk_size, pool, out_queue, stop, errors):
+    try:
+        while True:
+            started = time.perf_counter()
+            buffer = queue_get(pool, stop)
+            got = time.perf_counter()
+            stage.waiting_input += got - started
+            if buffer is None:
+                return
+            n = _fill(buffer, records, chunk_size)
+            done = time.perf_counter()
+            stage.busy += done - got
+            if n == 0:
+                pool.put(buffer)
+                queue_put(out_queue, None, stop)
+                return
+            if not queue_put(out_queue, buffer, stop):
+                return
+            stage.waiting_output += time.perf_counter() - done
+    except BaseException as exc:
+        errors.append(exc)
+        stop.set()
+
+
+def _work(stage, in_queue, out_queue, stop, errors, forward_end=True):
+    try:
+        while True:
+            started = time.perf_counter()
+            buffer = queue_get(in_queue, stop)
+            got = time.perf_counter()
+            stage.waiting_input += got - started
+            if buffer is None:
+                break
+            stage.work(buffer)
+            done = time.perf_counter()
+            stage.busy += done - got
+            if not queue_put(out_queue, buffer, stop):
+                return
+            stage.waiting_output += time.perf_counter() - done
+        if forward_end:
+            queue_put(out_queue, None, stop)
+    except BaseException as exc:
+        errors.append(exc)
+        stop.set()
+
+
+def _station_work(station):
+    def work(buffer):
+        result = station.function(**{name: buffer.value(name) for name in station.inputs})
+        for name in station.outputs:
+            buffer.store(name, result[name])
+    return work
+
+
+def _post_work(post):
+    def work(buffer):
+        result = post({name: buffer.value(name) for name in post.inputs})
+        for name in post.outputs:
+            buffer.store(name, result[name])
+    return work
+
+
+def run_pipeline(cases_path, results_path, outputs=CYCLE_OUTPUTS, chunk_size=4096, buffers=None,
+                 depth=QUEUE_DEPTH, post=()):
+    """
+    Run every case in a case file through a pipeline of station workers.
+
+    Parameters:
+    cases_path (str): Input case file (.csv or .jsonl).
+    results_path (str): Output file (.csv or .jsonl).
+    outputs (iterable of str): Cycle outputs to write for each case.
+    chunk_size (int): Cases per chunk.
+    buffers (int): Chunk buffers in the pool, the most chunks in flight at
+        once; None gives one per stage plus one.
+    depth (int): Chunks each queue between two stages holds.
+    post (iterable): Post-processing stages, as in run_batch, each with
+        `inputs` and `outputs` attributes naming its columns; each runs
+        as a stage of its own after the nozzle, named after its class
+        (numbered when a class appears more than once).
+
+    Returns:
+    PipelineResult: Cases and chunks run, wall time and per-stage timing.
+
+    As in run_batch, the results get a case_id column if the case file
+    has one (see batch.has_case_ids).
+    """
+    outputs = tuple(outputs)
+    post = tuple(post)
+    added = {name for stage in post for name in stage.outputs}
+    for name in outputs:
+        if name not in CYCLE_OUTPUTS and name not in DESIGN_POINT and name not in added:
+            raise ValueError(f"Unknown cycle output '{name}'.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if depth < 1:
+        raise ValueError("depth must be at least 1.")
+
+    workers = [_Stage(station.name, _station_work(station)) for station in STATIONS]
+    # Post stages are named after their class, numbered where a class repeats.
+    post_names = [type(stage).__name__.lower() for stage in post]
+    workers += [_Stage(f"{name}_{i + 1}" if post_names.count(name) > 1 else name, _post_work(stage))
+                for i, (name, stage) in enumerate(zip(post_names, post))]
+    reader = _Stage("reader")
+    writer_stage = _Stage("writer")
+    stages = [reader] + workers + [writer_stage]
+    if buffers is None:
+        buffers = len(stages) + 1
+    if buffers < 1:
+        raise ValueError("buffers must be at least 1.")
+
+    names = list(DESIGN_POINT) + list(CYCLE_OUTPUTS) + sorted(added)
+    pool = queue.Queue()
+    for _ in range(buffers):
+        pool.put(_Buffer(names, chunk_size))
+    queues = [queue.Queue(depth) for _ in range(len(workers) + 1)]
+    stop = threading.Event()
+    errors = []
+    counts = [0, 0]
+    with_ids = has_case_ids(cases_path)
+    writer = ResultWriter(results_path, ([CASE_ID] if with_ids else []) + list(outputs))
+
+    def write(buffer):
+        n = buffer.n
+        columns = [value.tolist() if isinstance(value, np.ndarray) else [value] * n
+                   for value in map(buffer.value, outputs)]
+        if with_ids:
+            columns.insert(0, buffer.ids[:n] if buffer.has_ids else [""] * n)
+        writer.write(zip(*columns))
+        counts[0] += n
+        counts[1] += 1
+
+    writer_stage.work = write
+    started = time.perf_counter()
+    with open(cases_path, newline="") as handle:
+        records = case_records(handle, cases_path)
+        threads = [threading.Thread(target=_read, daemon=True,
+                                    args=(reader, records, chunk_size, pool, queues[0], stop, errors))]
+        for stage, in_queue, out_queue in zip(workers, queues, queues[1:]):
+            threads.append(threading.Thread(target=_work, args=(stage, in_queue, out_queue, stop, errors), daemon=True))
+        threads.append(threading.Thread(target=_work, args=(writer_stage, queues[-1], pool, stop, errors, False),
+                                        daemon=True))
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            stop.set()
+            writer.close()
+    if errors:
+        raise errors[0]
+    elapsed = time.perf_counter() - started
+    return PipelineResult(counts[0], counts[1], elapsed, {
+        stage.name: StageTime(stage.busy, stage.waiting_input, stage.waiting_output,
+                              stage.busy / elapsed if elapsed > 0 else 0.0)
+        for stage in stages
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a case file through a pipeline of concurrent station workers.")
+    parser.add_argument("cases", help="Input case file (.csv or .jsonl).")
+    parser.add_argument("results", help="Output file (.csv or .jsonl).")
+    parser.add_argument("--outputs", default=",".join(CYCLE_OUTPUTS), help="Comma-separated cycle outputs to write.")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--buffers", type=int, default=None, help="Chunk buffers in the pool.")
+    parser.add_argument("--depth", type=int, default=QUEUE_DEPTH, help="Chunks queued between two stages.")
+    parser.add_argument("--compare", action="store_true", help="Also time run_batch on the same file.")
+    args = parser.parse_args(argv)
+    outputs = args.outputs.split(",")
+
+    result = run_pipeline(args.cases, args.results, outputs, args.chunk_size, args.buffers, args.depth)
+    print(f"Ran {result.cases} cases in {result.chunks} chunks into {args.results} in {result.elapsed:.2f} s")
+    bottleneck = max(result.stages, key=lambda name: result.stages[name].busy)
+    print(f"{'stage':>12} {'busy s':>8} {'wait in':>8} {'wait out':>9} {'occupancy':>10}")
+    for name, stage in result.stages.items():
+        print(f"{name:>12} {stage.busy:>8.3f} {stage.waiting_input:>8.3f} {stage.waiting_output:>9.3f} "
+              f"{stage.occupancy:>9.0%} {'#' * round(stage.occupancy * 20)}{' <- bottleneck' if name == bottleneck else ''}")
+    if args.compare:
+        started = time.perf_counter()
+        run_batch(args.cases, args.results, outputs, args.chunk_size)
+        elapsed = time.perf_counter() - started
+        print(f"run_batch: {elapsed:.2f} s; pipeline {elapsed / result.elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Single-precision cycle evaluation and its error against float64.
+
+run_cycle(dtype=np.float32) halves the memory and bandwidth of large
+sweeps. precision_report samples the input space, runs the cycle in both
+precisions and gives the worst-case relative error of every output, so a
+study can pick float32 when its outputs of interest stay within tolerance.
+
+    python -m jetsim.precision --samples 200000
+"""
+import argparse
+
+import numpy as np
+
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, run_cycle
+from jetsim.doe import DEFAULT_RANGES
+
+
+def precision_report(samples=100000, seed=0, dtype=np.float32, ranges=None, outputs=CYCLE_OUTPUTS, **overrides):
+    """
+    Compare the cycle in reduced precision against float64.
+
+    Parameters:
+    samples (int): Random input points, drawn uniformly within the ranges.
+    seed (int): Random seed.
+    dtype (numpy dtype): Reduced precision to check.
+    ranges (dict): {input: (low, high)}; defaults to doe.DEFAULT_RANGES.
+    outputs (iterable of str): Cycle outputs to check.
+    **overrides: Fixed cycle inputs for every sample.
+
+    Returns:
+    dict: {output: {"max_rel", "rms_rel", "max_abs", "max_scaled", "worst"}},
+    where relative errors are |reduced - float64| / |float64|, max_scaled
+    is the largest error over the largest |float64| value (useful where an
+    output such as thrust passes near zero and cancels), and "worst" holds
+    the sampled inputs at the largest relative error. Points where the
+    float64 result is not finite are left out.
+    """
+    ranges = DEFAULT_RANGES if ranges is None else ranges
+    for name in ranges:
+        if name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle input '{name}'.")
+    rng = np.random.default_rng(seed)
+    sampled = {name: rng.uniform(low, high, samples) for name, (low, high) in ranges.items()}
+    inputs = {**overrides, **sampled}
+    exact = run_cycle(**inputs)
+    reduced = run_cycle(dtype, **inputs)
+    report = {}
+    for name in outputs:
+        reference = np.broadcast_to(np.asarray(exact[name], dtype=float), (samples,))
+        value = np.broadcast_to(np.asarray(reduced[name], dtype=float), (samples,))
+        finite = np.isfinite(reference) & (reference != 0)
+        error = np.abs(value - reference)
+        relative = np.where(finite, error / np.where(finite, np.abs(reference), 1.0), 0.0)
+        worst = int(np.argmax(relative))
+        report[name] = {
+            "max_rel": float(relative.max()),
+            "rms_rel": float(np.sqrt(np.mean(relative[finite] ** 2))) if finite.any() else 0.0,
+            "max_abs": float(np.max(np.where(finite, error, 0.0))),
+            "max_scaled": float(np.max(np.where(finite, error, 0.0)) / np.max(np.abs(reference[finite]))) if finite.any() else 0.0,
+            "worst": {input_name: float(values[worst]) for input_name, values in sampled.items()},
+        }
+    return report
+
+
+def select_dtype(tolerance, outputs, report=None, measure="max_rel", **kwargs):
+    """
+    Choose the cheapest precision whose worst error on some outputs is within tolerance.
+
+    Parameters:
+    tolerance (float): Largest acceptable relative error.
+    outputs (iterable of str): Outputs the study relies on.
+    report (dict): A float32 precision_report; one is run if not given.
+    measure (str): Error measure compared with the tolerance, "max_rel" or "max_scaled".
+    **kwargs: Passed to precision_report.
+
+    Returns:
+    numpy dtype: np.float32 or np.float64.
+    """
+    outputs = tuple(outputs)
+    if report is None:
+        report = precision_report(outputs=outputs, **kwargs)
+    worst = max(report[name][measure] for name in outputs)
+    return np.float32 if worst <= tolerance else np.float64
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the float32 error of every cycle output.")
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = precision_report(args.samples, args.seed)
+    print(f"float32 vs float64 over {args.samples} samples")
+    print(f"{'Output':>14} {'Max rel':>10} {'RMS rel':>10} {'Max abs':>11} {'Max/scale':>10}")
+    for name, errors in report.items():
+        print(f"{name:>14} {errors['max_rel']:10.2e} {errors['rms_rel']:10.2e} {errors['max_abs']:11.4g} "
+              f"{errors['max_scaled']:10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Afterburner throttle schedule and wet/dry thrust tables.
+
+The reheat setting runs from 0 (dry, T06 = T05, no afterburner fuel) to 1
+(maximum reheat, T06 = T06_max), with the afterburner efficiency n_ab
+applied to the fuel-air ratio. The core stations run once per flight
+condition; only the afterburner and nozzle are broadcast over reheat.
+
+    python -m jetsim.reheat
+"""
+import argparse
+
+import numpy as np
+
+from jetsim.atmosphere import flight_condition
+from jetsim.cycle import cycle_inputs, run_stations
+from jetsim.interpolate import GridInterpolator
+
+CORE_STATIONS = ("inlet", "compressor", "combustor", "turbine")
+REHEAT_STATIONS = ("afterburner", "nozzle")
+TABLE_OUTPUTS = ("thrust", "m_fuel_total", "f_ab", "augmentation")
+
+
+def reheat_T06(T05, reheat, T06_max):
+    """
+    Calculate the afterburner exit temperature for a reheat setting.
+
+    Parameters:
+    T05 (float or array): Stagnation temperature at the turbine exit (K)
+    reheat (float or array): Reheat setting, 0 (dry) to 1 (maximum)
+    T06_max (float): Afterburner exit temperature at maximum reheat (K)
+
+    Returns:
+    float or array: Afterburner exit temperature (K)
+    """
+    return T05 + reheat * (T06_max - T05)
+
+
+def throttle_sweep(reheat, altitude=0.0, mach=0.0, T06_max=2400.0, **overrides):
+    """
+    Run the cycle over reheat settings and flight conditions.
+
+    Parameters:
+    reheat (float or array): Reheat settings, 0 to 1.
+    altitude (float or array): Altitude in m.
+    mach (float or array): Flight Mach number.
+    T06_max (float): Afterburner exit temperature at maximum reheat (K).
+    **overrides: Other cycle inputs replacing the design point.
+
+    Returns:
+    dict: Cycle state with the reheat axes first and the flight-condition
+    axes after them, plus thrust_dry, m_fuel_dry and augmentation
+    (wet thrust / dry thrust).
+    """
+    if "T06" in overrides:
+        raise ValueError("Set the reheat range with T06_max, not T06.")
+    reheat = np.asarray(reheat, dtype=float)
+    if np.any(reheat < 0) or np.any(reheat > 1):
+        raise ValueError("Reheat settings must be between 0 and 1.")
+    inputs = cycle_inputs(**{**flight_condition(altitude, mach), **overrides})
+    core = run_stations(inputs, CORE_STATIONS)
+    dry = run_stations(dict(core, T06=core["T05"]), REHEAT_STATIONS)
+    T05 = core["T05"]
+    wet = dict(core)
+    wet["T06"] = reheat_T06(T05, reheat.reshape(reheat.shape + (1,) * np.ndim(T05)), T06_max)
+    run_stations(wet, REHEAT_STATIONS)
+    wet["thrust_dry"] = dry["thrust"]
+    wet["m_fuel_dry"] = dry["m_fuel_total"]
+    wet["augmentation"] = wet["thrust"] / dry["thrust"]
+    return wet
+
+
+class ReheatTable:
+    """
+    Wet/dry thrust and fuel-flow table over altitude, Mach and reheat.
+
+    The cycle runs once when the table is built; queries interpolate in
+    the stored float32 table instead of rerunning the afterburner and nozzle.
+
+    Parameters:
+    altitudes (array): Altitude grid in m.
+    machs (array): Flight Mach grid.
+    reheats (array): Reheat grid, starting at 0 (dry) and ending at 1
+        (maximum reheat).
+    T06_max (float): Afterburner exit temperature at maximum reheat (K).
+    **overrides: Other cycle inputs replacing the design point.
+    """
+
+    def __init__(self, altitudes, machs, reheats=np.linspace(0.0, 1.0, 11), T06_max=2400.0, **overrides):
+        self.altitudes = np.asarray(altitudes, dtype=float)
+        self.machs = np.asarray(machs, dtype=float)
+        self.reheats = np.asarray(reheats, dtype=float)
+        if self.reheats.ndim != 1 or len(self.reheats) < 2 or self.reheats[0] != 0 or self.reheats[-1] != 1:
+            raise ValueError("The reheat grid must run from 0 (dry) to 1 (maximum reheat).")
+        self.T06_max = T06_max
+        state = throttle_sweep(self.reheats, self.altitudes[:, None], self.machs[None, :],
+                               T06_max, **overrides)
+        shape = (len(self.reheats), len(self.altitudes), len(self.machs))
+        # (reheat, altitude, Mach, output) -> (altitude, Mach, reheat, output)
+        stacked = np.stack([np.broadcast_to(state[name], shape) for name in TABLE_OUTPUTS], axis=-1)
+        self.table = np.ascontiguousarray(stacked.transpose(1, 2, 0, 3), dtype=np.float32)
+        self._interpolate = GridInterpolator((self.altitudes, self.machs, self.reheats), self.table)
+
+    def query(self, altitude, mach, reheat):
+        """
+        Interpolate thrust, fuel flow, f_ab and augmentation.
+
+        Parameters:
+        altitude (float or array): Altitude in m.
+        mach (float or array): Flight Mach number.
+        reheat (float or array): Reheat setting, 0 to 1.
+
+        Returns:
+        dict: Interpolated TABLE_OUTPUTS, broadcast over the queries.
+        """
+        values = self._interpolate(altitude, mach, reheat)
+        return {name: values[..., i] for i, name in enumerate(TABLE_OUTPUTS)}
+
+    def wet_dry_rows(self):
+        """
+        Dry and maximum-reheat performance at each flight condition.
+
+        Returns:
+        list of tuple: (altitude, Mach, dry thrust, wet thrust, dry fuel flow,
+        wet fuel flow, augmentation) with thrust in N and fuel flow in kg/s.
+        """
+        thrust = self.table[..., TABLE_OUTPUTS.index("thrust")]
+        fuel = self.table[..., TABLE_OUTPUTS.index("m_fuel_total")]
+        rows = []
+        for i, altitude in enumerate(self.altitudes):
+            for j, mach in enumerate(self.machs):
+                dry, wet = float(thrust[i, j, 0]), float(thrust[i, j, -1])
+                rows.append((float(altitude), float(mach), dry, wet,
+                             float(fuel[i, j, 0]), float(fuel[i, j, -1]), wet / dry))
+        return rows
+
+
+def _grid(text):
+    """
+    Parse a comma-separated table axis: at least two increasing numbers.
+    """
+    try:
+        values = [float(value) for value in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"cannot read the values of '{text}'") from None
+    if len(values) < 2 or any(b <= a for a, b in zip(values, values[1:])):
+        raise argparse.ArgumentTypeError(f"the table needs at least two increasing values per axis, got '{text}'")
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a wet/dry thrust and fuel-flow table.")
+    parser.add_argument("--altitudes", type=_grid, default="0,5000,10000",
+                        help="Comma-separated altitudes in m, at least two, increasing.")
+    parser.add_argument("--machs", type=_grid, default="0,0.5,0.9",
+                        help="Comma-separated flight Mach numbers, at least two, increasing.")
+    parser.add_argument("--T06-max", type=float, default=2400.0)
+    args = parser.parse_args(argv)
+    table = ReheatTable(args.altitudes, args.machs, T06_max=args.T06_max)
+    print(f"{'Alt (m)':>8} {'Mach':>5} {'Dry F (kN)':>11} {'Wet F (kN)':>11} {'Dry mf (kg/s)':>14} {'Wet mf (kg/s)':>14} {'Wet/Dry':>8}")
+    for altitude, mach, dry, wet, fuel_dry, fuel_wet, augmentation in table.wet_dry_rows():
+        print(f"{altitude:8.0f} {mach:5.2f} {dry / 1000:11.2f} {wet / 1000:11.2f} {fuel_dry:14.3f} {fuel_wet:14.3f} {augmentation:8.3f}")
+
+
+if __name__ == "__main__":
+    main()
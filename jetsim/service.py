@@ -0,0 +1,324 @@
+"""
+Local cycle-evaluation service.
+
+Single operating-point requests arrive over HTTP/JSON (TCP or a Unix
+socket). Concurrent requests are grouped into micro-batches and evaluated
+with one vectorized run_cycle call per batch.
+
+    python -m jetsim.service --port 8765
+    curl -d '{"f": 0.025, "rp": 28}' http://127.0.0.1:8765/evaluate
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+
+import numpy as np
+
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, run_cycle
+
+
+class ServiceBusy(Exception):
+    """Raised when the pending-request queue is full."""
+
+
+def validate_point(point):
+    """
+    Check a single operating-point request.
+
+    Parameters:
+    point (dict): Cycle input overrides, e.g. {"f": 0.025}.
+
+    Returns:
+    dict: The overrides as floats.
+    """
+    if not isinstance(point, dict):
+        raise ValueError("Request body must be a JSON object of cycle inputs.")
+    checked = {}
+    for name, value in point.items():
+        if name not in DESIGN_POINT:
+            raise ValueError(f"Unknown cycle input '{name}'.")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Cycle input '{name}' must be a number.")
+        try:
+            number = float(value)
+        except OverflowError:
+            raise ValueError(f"Cycle input '{name}' is too large.") from None
+        if not math.isfinite(number):
+            raise ValueError(f"Cycle input '{name}' must be finite.")
+        checked[name] = number
+    return checked
+
+
+def evaluate_batch(points, outputs=CYCLE_OUTPUTS):
+    """
+    Evaluate a list of operating points with one vectorized cycle run.
+
+    Parameters:
+    points (list of dict): Validated cycle input overrides, one per request.
+    outputs (tuple of str): Cycle outputs to return.
+
+    Returns:
+    list of dict: Outputs for each point, in request order.
+    """
+    n = len(points)
+    names = set()
+    for point in points:
+        names.update(point)
+    # Only inputs that some request overrides become arrays; the rest stay scalar.
+    overrides = {
+        name: np.fromiter((point.get(name, DESIGN_POINT[name]) for point in points), float, n)
+        for name in names
+    }
+    state = run_cycle(**overrides)
+    columns = [np.broadcast_to(state[name], (n,)).tolist() for name in outputs]
+    results = []
+    for row in zip(*columns):
+        # JSON has no NaN/inf; report non-physical points as null.
+        results.append({name: value if math.isfinite(value) else None for name, value in zip(outputs, row)})
+    return results
+
+
+class MicroBatcher:
+    """
+    Group concurrent requests into batches for evaluate_batch.
+
+    A batch is closed when it reaches max_batch_size or when batch_window
+    seconds have passed since its first request. At most max_pending
+    requests wait in the queue; beyond that submit raises ServiceBusy.
+    """
+
+    def __init__(self, batch_window=0.002, max_batch_size=1024, max_pending=10000, outputs=CYCLE_OUTPUTS):
+        if batch_window < 0:
+            raise ValueError("batch_window must be non-negative.")
+        if max_batch_size < 1 or max_pending < 1:
+            raise ValueError("max_batch_size and max_pending must be at least 1.")
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.outputs = tuple(outputs)
+        self.batches = 0
+        self.requests = 0
+        self.busy_time = 0.0
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.max_pending)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(ServiceBusy("Service is shutting down."))
+
+    async def submit(self, point):
+        """
+        Queue one validated operating point and wait for its result.
+
+        Parameters:
+        point (dict): Validated cycle input overrides.
+
+        Returns:
+        dict: Cycle outputs for the point.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((point, future))
+        except asyncio.QueueFull:
+            raise ServiceBusy("Too many pending requests.") from None
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            points = [point for point, _ in batch]
+            start = time.perf_counter()
+            try:
+                # Off the event loop, so requests keep queueing while a batch runs.
+                results = await loop.run_in_executor(None, evaluate_batch, points, self.outputs)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            self.busy_time += time.perf_counter() - start
+            self.batches += 1
+            self.requests += len(batch)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "busy_time": self.busy_time,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_pending": self.max_pending,
+        }
+
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+async def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    headers = [
+        f"HTTP/1.1 {status} {_REASONS[status]}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: keep-alive" if keep_alive else "Connection: close",
+    ]
+    if status == 503:
+        headers.append("Retry-After: 1")
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, version = request_line.decode("latin-1").split()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+    return method, path, body, keep_alive
+
+
+class CycleService:
+    """
+    HTTP/JSON front end for a MicroBatcher.
+
+    Routes:
+    POST /evaluate  one operating point (JSON object of cycle inputs)
+    GET  /health    liveness check
+    GET  /stats     batching statistics
+    """
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+
+    async def handle(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.batcher.stats()
+        if path != "/evaluate":
+            return 404, {"error": f"No route for {path}."}
+        if method != "POST":
+            return 405, {"error": "Use POST for /evaluate."}
+        try:
+            point = validate_point(json.loads(body or b"{}"))
+        except (ValueError, json.JSONDecodeError) as exc:
+            return 400, {"error": str(exc)}
+        try:
+            return 200, await self.batcher.submit(point)
+        except ServiceBusy as exc:
+            return 503, {"error": str(exc)}
+        except Exception as exc:
+            # A failed batch fails every request in it; report it rather than drop the connection.
+            return 500, {"error": f"Evaluation failed: {exc}"}
+
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    await _write_response(writer, 400, {"error": "Malformed HTTP request."}, False)
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self.handle(method, path, body)
+                await _write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start_server(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self._connection, path=unix_path)
+        return await asyncio.start_server(self._connection, host, port)
+
+
+async def serve(host="127.0.0.1", port=8765, unix_path=None, batch_window=0.002, max_batch_size=1024, max_pending=10000):
+    """
+    Run the service until cancelled.
+
+    Parameters:
+    host (str): Address to bind for TCP.
+    port (int): TCP port.
+    unix_path (str): Unix socket path; used instead of TCP when given.
+    batch_window (float): Seconds to wait for more requests after the first in a batch.
+    max_batch_size (int): Largest batch passed to the cycle.
+    max_pending (int): Requests allowed to wait before new ones get 503.
+    """
+    batcher = MicroBatcher(batch_window, max_batch_size, max_pending)
+    await batcher.start()
+    server = await CycleService(batcher).start_server(host, port, unix_path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve cycle evaluations over HTTP/JSON with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", help="Listen on a Unix socket instead of TCP.")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch-size", type=int, default=1024)
+    parser.add_argument("--max-pending", type=int, default=10000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_path, args.batch_window_ms / 1000.0,
+                          args.max_batch_size, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
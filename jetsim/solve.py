@@ -0,0 +1,356 @@
+"""
+Warm-started inverse cycle solves.
+
+Solves for cycle inputs that hit target outputs, e.g. the fuel-air ratio
+for a required T04 or thrust, at many operating points at once. Each point
+runs its own batched Broyden iteration. Converged points go into a
+SolutionStore, a nearest-neighbour index over the problem inputs. Later
+solves start from the closest stored solutions, stepped to the new targets
+with their stored Jacobians, and skip the finite-difference Jacobian, so
+nearby points converge in roughly half the iterations of a cold start.
+
+    solver = WarmStartSolver(unknowns=("f",), targets=("thrust",))
+    result = solver.solve({"thrust": np.linspace(6e4, 9e4, 500)}, T06=2000.0)
+    solver.report()
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from jetsim.cycle import DESIGN_POINT, run_cycle
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # brute-force nearest neighbours without scipy
+    cKDTree = None
+
+SolveResult = namedtuple("SolveResult", ["x", "converged", "iterations", "evaluations", "warm"])
+
+
+class SolutionStore:
+    """
+    Converged solutions indexed by their problem inputs.
+
+    Distances are measured after dividing each feature by its scale, so
+    features with different units weigh equally.
+
+    A point within min_distance (in scaled units) of one already stored, or
+    of another in the same batch, adds nothing to a warm start and is not
+    stored. Beyond max_size points the oldest are dropped.
+
+    Parameters:
+    n_features (int): Length of each problem-input vector.
+    scales (array): Feature scales; defaults to the spread of the stored points.
+    min_distance (float): Scaled distance below which a point is a duplicate.
+    max_size (int): Most points kept; None keeps every one.
+    """
+
+    def __init__(self, n_features, scales=None, min_distance=1e-6, max_size=200_000):
+        if max_size is not None and max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.n_features = n_features
+        self.scales = None if scales is None else np.asarray(scales, dtype=float)
+        self.min_distance = min_distance
+        self.max_size = max_size
+        self._features = np.empty((0, n_features))
+        self._solutions = None
+        self._jacobians = None
+        self._tree = None
+        self._tree_size = 0
+        self._tree_scales = None
+
+    def __len__(self):
+        return len(self._features)
+
+    def add(self, features, solutions, jacobians):
+        """
+        Store converged points.
+
+        Parameters:
+        features (array): Problem inputs, shape (n, n_features).
+        solutions (array): Solved unknowns, shape (n, k).
+        jacobians (array): Jacobians of the target outputs with respect to
+            the unknowns, shape (n, k, k).
+        """
+        if self._solutions is None:
+            self._solutions = np.empty((0,) + solutions.shape[1:])
+            self._jacobians = np.empty((0,) + jacobians.shape[1:])
+        if len(features) and self.min_distance > 0:
+            keep = self._novel(features)
+            features, solutions, jacobians = features[keep], solutions[keep], jacobians[keep]
+        self._features = np.concatenate([self._features, features])
+        self._solutions = np.concatenate([self._solutions, solutions])
+        self._jacobians = np.concatenate([self._jacobians, jacobians])
+        if self.max_size is not None and len(self) > self.max_size:
+            drop = len(self) - self.max_size
+            self._features = self._features[drop:]
+            self._solutions = self._solutions[drop:]
+            self._jacobians = self._jacobians[drop:]
+            self._tree = None  # indices shifted
+
+    def _novel(self, features):
+        """
+        Mask of the points not within min_distance of a stored point or an earlier one in the batch.
+        """
+        if len(self):
+            scale = self._scale()
+        else:
+            spread = np.ptp(features, axis=0) if self.scales is None else self.scales
+            scale = np.where(spread > 0, spread, 1.0)
+        # Within the batch: one point per min_distance cell of the scaled inputs.
+        cells = np.floor(features / scale / self.min_distance)
+        keep = np.zeros(len(features), dtype=bool)
+        keep[np.unique(cells, axis=0, return_index=True)[1]] = True
+        if len(self):
+            distance, _ = self.nearest(features, 1)
+            keep &= distance[:, 0] > self.min_distance
+        return keep
+
+    def _scale(self):
+        if self.scales is not None:
+            return self.scales
+        spread = np.ptp(self._features, axis=0)
+        return np.where(spread > 0, spread, 1.0)
+
+    def nearest(self, features, k=1):
+        """
+        Find the closest stored points.
+
+        Parameters:
+        features (array): Query problem inputs, shape (m, n_features).
+        k (int): Neighbours per query.
+
+        Returns:
+        tuple: Distances and indices, each shape (m, k).
+        """
+        k = min(k, len(self))
+        scale = self._scale()
+        query = features / scale
+        if cKDTree is not None:
+            # Rebuild once the store has grown by a quarter or the scaling changed.
+            stale = self._tree is None or len(self) > 1.25 * self._tree_size or not np.array_equal(scale, self._tree_scales)
+            if stale:
+                self._tree = cKDTree(self._features / scale)
+                self._tree_size = len(self)
+                self._tree_scales = scale
+            distance, index = self._tree.query(query, k=k)
+            distance = distance.reshape(len(query), k)
+            index = index.reshape(len(query), k)
+            if self._tree_size < len(self):
+                # Points added since the last rebuild are searched directly.
+                tail = self._features[self._tree_size:] / scale
+                tail_distance = np.sqrt(((query[:, None, :] - tail[None, :, :]) ** 2).sum(-1))
+                distance = np.concatenate([distance, tail_distance], axis=1)
+                index = np.concatenate([index, np.broadcast_to(np.arange(self._tree_size, len(self)), tail_distance.shape)], axis=1)
+                order = np.argsort(distance, axis=1)[:, :k]
+                distance = np.take_along_axis(distance, order, axis=1)
+                index = np.take_along_axis(index, order, axis=1)
+            return distance, index
+        stored = self._features / scale
+        distance = np.empty((len(query), k))
+        index = np.empty((len(query), k), dtype=np.intp)
+        for start in range(0, len(query), 1024):  # bound the (m, n) distance matrix
+            block = np.sqrt(((query[start:start + 1024, None, :] - stored[None, :, :]) ** 2).sum(-1))
+            order = np.argsort(block, axis=1)[:, :k]
+            index[start:start + 1024] = order
+            distance[start:start + 1024] = np.take_along_axis(block, order, axis=1)
+        return distance, index
+
+    def initial_guess(self, features, target_columns, k=4):
+        """
+        Initial unknowns and Jacobians from the nearest stored solutions.
+
+        Each neighbour's solution is moved to the query's targets with a
+        Newton step on its stored Jacobian; the guess is the inverse-distance
+        weighted mean of those predictions.
+
+        Parameters:
+        features (array): Query problem inputs, shape (m, n_features).
+        target_columns (list of int): Feature columns holding the targets, in unknown order.
+        k (int): Neighbours blended per query.
+
+        Returns:
+        tuple: Guesses (m, n_unknowns) and the nearest neighbour's Jacobians
+        of the target outputs, (m, n_unknowns, n_unknowns).
+        """
+        distance, index = self.nearest(features, k)
+        jacobians = self._jacobians[index]
+        shift = features[:, None, target_columns] - self._features[index][..., target_columns]
+        try:
+            step = np.linalg.solve(jacobians, shift[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            step = np.einsum("mkij,mkj->mki", np.linalg.pinv(jacobians), shift)
+        predictions = self._solutions[index] + step
+        weight = 1.0 / np.maximum(distance, 1e-12)
+        weight /= weight.sum(axis=1, keepdims=True)
+        guess = np.einsum("mk,mkj->mj", weight, predictions)
+        return guess, jacobians[:, 0]
+
+
+class WarmStartSolver:
+    """
+    Batched Broyden solver for cycle inputs that hit target outputs.
+
+    Parameters:
+    unknowns (tuple of str): Cycle inputs to solve for.
+    targets (tuple of str): Cycle outputs to match, as many as unknowns.
+    tol (float): Convergence tolerance on |output - target| / max(|target|, 1).
+    max_iterations (int): Broyden steps per point before giving up.
+    neighbours (int): Stored solutions blended into each warm start.
+    store (SolutionStore): Shared store; one is created on the first solve.
+    """
+
+    def __init__(self, unknowns=("f",), targets=("T04",), tol=1e-9, max_iterations=50, neighbours=4, store=None):
+        self.unknowns = tuple(unknowns)
+        self.targets = tuple(targets)
+        if len(self.unknowns) != len(self.targets):
+            raise ValueError("Need as many targets as unknowns.")
+        for name in self.unknowns:
+            if name not in DESIGN_POINT:
+                raise ValueError(f"Unknown cycle input '{name}'.")
+        self.tol = tol
+        self.max_iterations = max_iterations
+        self.neighbours = neighbours
+        self.store = store
+        self.feature_names = None
+        self._cold = [0, 0]  # points, iterations
+        self._warm = [0, 0]
+
+    def _residual(self, x, target, fixed):
+        state = run_cycle(**fixed, **{name: x[:, j] for j, name in enumerate(self.unknowns)})
+        outputs = np.stack([np.broadcast_to(state[name], (len(x),)) for name in self.targets], axis=1)
+        return (outputs - target) / np.maximum(np.abs(target), 1.0)
+
+    def _jacobian(self, x, r, target, fixed):
+        k = len(self.unknowns)
+        J = np.empty((len(x), k, k))
+        for j in range(k):
+            step = 1e-6 * np.maximum(np.abs(x[:, j]), 1e-4)
+            shifted = x.copy()
+            shifted[:, j] += step
+            J[:, :, j] = (self._residual(shifted, target, fixed) - r) / step[:, None]
+        return J
+
+    def solve(self, target_values, **overrides):
+        """
+        Solve for the unknowns at every point.
+
+        Parameters:
+        target_values (dict): Target value (float or array) for each target output.
+        **overrides: Other cycle inputs (floats or arrays) at each point.
+
+        Returns:
+        SolveResult: x (n, k) unknowns, converged mask, Broyden iterations
+        and cycle evaluations per point, and which points were warm started.
+        """
+        for name in self.unknowns:
+            if name in overrides:
+                raise ValueError(f"'{name}' is being solved for; do not set it.")
+        names = sorted(target_values) + sorted(overrides)
+        values = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                       [target_values[t] for t in sorted(target_values)] + [overrides[o] for o in sorted(overrides)]))
+        n = values[0].size
+        columns = [v.ravel() for v in values]
+        features = np.stack(columns, axis=1)
+        target_columns = [names.index(t) for t in self.targets]
+        target = features[:, target_columns]
+        scale = np.maximum(np.abs(target), 1.0)
+        fixed = {name: columns[names.index(name)] for name in overrides}
+        if self.store is None:
+            self.store = SolutionStore(len(names))
+        if self.feature_names is None:
+            self.feature_names = names
+        elif self.feature_names != names:
+            raise ValueError(f"Solver was first used with inputs {self.feature_names}, not {names}.")
+
+        x = np.tile([DESIGN_POINT[name] for name in self.unknowns], (n, 1)).astype(float)
+        J = None
+        warm = np.zeros(n, dtype=bool)
+        if len(self.store):
+            x, J = self.store.initial_guess(features, target_columns, self.neighbours)
+            J = J / scale[:, :, None]
+            warm[:] = True
+        iterations = np.zeros(n, dtype=int)
+        evaluations = np.ones(n, dtype=int)
+        r = self._residual(x, target, fixed)
+        if J is None:
+            J = self._jacobian(x, r, target, fixed)
+            evaluations += len(self.unknowns)
+        converged = np.max(np.abs(r), axis=1) < self.tol
+
+        active = np.flatnonzero(~converged)
+        for _ in range(self.max_iterations):
+            if not len(active):
+                break
+            sub_fixed = {name: value[active] for name, value in fixed.items()}
+            xa, ra, Ja = x[active], r[active], J[active]
+            try:
+                dx = -np.linalg.solve(Ja, ra[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                dx = -np.einsum("mij,mj->mi", np.linalg.pinv(Ja), ra)
+            x_new = xa + dx
+            r_new = self._residual(x_new, target[active], sub_fixed)
+            for _ in range(5):
+                # Halve steps that left the physical range (NaN outputs).
+                bad = ~np.all(np.isfinite(r_new), axis=1)
+                if not bad.any():
+                    break
+                dx[bad] *= 0.5
+                x_new[bad] = xa[bad] + dx[bad]
+                r_new[bad] = self._residual(x_new[bad], target[active[bad]],
+                                            {name: value[bad] for name, value in sub_fixed.items()})
+                evaluations[active[bad]] += 1
+            # Broyden's good update: J += (dr - J dx) dx^T / (dx^T dx)
+            dr = r_new - ra
+            denominator = np.maximum(np.einsum("mi,mi->m", dx, dx), 1e-300)
+            Ja = Ja + np.einsum("mi,mj->mij", dr - np.einsum("mij,mj->mi", Ja, dx), dx) / denominator[:, None, None]
+            x[active], r[active], J[active] = x_new, r_new, Ja
+            iterations[active] += 1
+            evaluations[active] += 1
+            done = np.max(np.abs(r_new), axis=1) < self.tol
+            converged[active[done]] = True
+            active = active[~done & np.all(np.isfinite(r_new), axis=1)]
+
+        self.store.add(features[converged], x[converged], J[converged] * scale[converged][:, :, None])
+        for mask, tally in ((~warm, self._cold), (warm, self._warm)):
+            tally[0] += int(np.count_nonzero(mask & converged))
+            tally[1] += int(iterations[mask & converged].sum())
+        shape = values[0].shape + (len(self.unknowns),)
+        return SolveResult(x.reshape(shape), converged.reshape(values[0].shape),
+                           iterations.reshape(values[0].shape), evaluations.reshape(values[0].shape),
+                           warm.reshape(values[0].shape))
+
+    def report(self):
+        """
+        Iteration savings of warm starts over cold starts so far.
+
+        Returns:
+        dict: Mean Broyden iterations for cold and warm starts, the saving
+        as a fraction of the cold mean, and the number of stored solutions.
+        """
+        cold = self._cold[1] / self._cold[0] if self._cold[0] else float("nan")
+        warm = self._warm[1] / self._warm[0] if self._warm[0] else float("nan")
+        return {
+            "cold_points": self._cold[0],
+            "warm_points": self._warm[0],
+            "mean_iterations_cold": cold,
+            "mean_iterations_warm": warm,
+            "iteration_saving": 1.0 - warm / cold if self._cold[0] and self._warm[0] else float("nan"),
+            "stored_solutions": len(self.store) if self.store is not None else 0,
+        }
+
+
+def solve_f_for_T04(T04, store=None, **overrides):
+    """
+    Find the fuel-air ratio that gives a combustor exit temperature.
+
+    Parameters:
+    T04 (float or array): Target stagnation temperature at the combustor exit (K).
+    store (SolutionStore): Optional store shared across calls for warm starts.
+    **overrides: Other cycle inputs.
+
+    Returns:
+    array: Fuel to air ratio at each point.
+    """
+    result = WarmStartSolver(("f",), ("T04",), store=store).solve({"T04": T04}, **overrides)
+    return result.x[..., 0]
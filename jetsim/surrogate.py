@@ -0,0 +1,323 @@
+"""
+Surrogate models of the cycle fitted to design-of-experiments samples.
+
+A surrogate maps a box of cycle inputs to selected outputs with a cheap
+closed-form model, for optimizers and UIs that need many evaluations.
+Two models are available:
+
+    poly  total-degree polynomial response surface, least squares
+    rbf   radial basis function interpolant (cubic, thin-plate, Gaussian
+          or multiquadric kernel) with a linear polynomial tail
+
+Inputs are scaled to [-1, 1] over their ranges and outputs standardized
+before fitting. cross_validate gives k-fold held-out errors for each
+output, so a model and sample count can be chosen with known accuracy.
+
+    python -m jetsim.surrogate --samples 1024 --model poly --degree 3
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from jetsim.cycle import CYCLE_OUTPUTS, DESIGN_POINT, run_cycle
+from jetsim.doe import sample
+
+SURROGATE_OUTPUTS = ("thrust", "tsfc", "T04", "T05")
+
+# Default box: engine design and throttle inputs at sea-level ambient,
+# kept where thrust stays well above zero so TSFC is smooth.
+SURROGATE_RANGES = {
+    "V1": (150.0, 300.0),
+    "m_flow": (90.0, 140.0),
+    "rp": (20.0, 35.0),
+    "eta_c": (0.82, 0.92),
+    "f": (0.018, 0.025),
+    "n_turbine": (0.90, 0.99),
+    "T06": (2000.0, 2400.0),
+}
+
+MODELS = ("poly", "rbf")
+RBF_KERNELS = {
+    "cubic": lambda r, epsilon: r**3,
+    "thin_plate": lambda r, epsilon: np.where(r > 0, r**2 * np.log(np.where(r > 0, r, 1.0)), 0.0),
+    "gaussian": lambda r, epsilon: np.exp(-(epsilon * r) ** 2),
+    "multiquadric": lambda r, epsilon: np.sqrt(1.0 + (epsilon * r) ** 2),
+}
+_CHUNK = 4096  # query rows per block, to keep the feature and distance matrices in cache
+
+
+class PolynomialModel:
+    """
+    Total-degree polynomial fitted by least squares.
+
+    Parameters:
+    degree (int): Highest total degree of the monomials.
+    ridge (float): Tikhonov regularization, relative to the number of samples.
+    """
+
+    def __init__(self, degree=3, ridge=1e-10):
+        self.degree = degree
+        self.ridge = ridge
+        self.terms = None
+        self.coefficients = None
+
+    def _features(self, U):
+        # One row per monomial, each its parent (one degree lower) times one more variable.
+        F = np.empty((len(self.terms), len(U)))
+        F[0] = 1.0
+        Ut = np.ascontiguousarray(U.T)
+        for k, (parent, variable) in enumerate(self._recipe, 1):
+            np.multiply(F[parent], Ut[variable], out=F[k])
+        return F
+
+    def fit(self, U, Y):
+        d = U.shape[1]
+        self.terms = [term for degree in range(self.degree + 1)
+                      for term in itertools.combinations_with_replacement(range(d), degree)]
+        position = {term: k for k, term in enumerate(self.terms)}
+        self._recipe = [(position[term[:-1]], term[-1]) for term in self.terms[1:]]
+        if len(U) < len(self.terms):
+            raise ValueError(f"A degree-{self.degree} polynomial in {d} inputs needs at least "
+                             f"{len(self.terms)} samples, got {len(U)}.")
+        A = self._features(U).T
+        if self.ridge:
+            A = np.vstack([A, np.sqrt(self.ridge * len(U)) * np.eye(A.shape[1])])
+            Y = np.vstack([Y, np.zeros((A.shape[1], Y.shape[1]))])
+        self.coefficients = np.linalg.lstsq(A, Y, rcond=None)[0]
+        return self
+
+    def predict(self, U):
+        out = np.empty((len(U), self.coefficients.shape[1]))
+        for start in range(0, len(U), _CHUNK):
+            block = U[start:start + _CHUNK]
+            out[start:start + _CHUNK] = (self.coefficients.T @ self._features(block)).T
+        return out
+
+
+class RBFModel:
+    """
+    Radial basis function interpolant with a linear polynomial tail.
+
+    Parameters:
+    kernel (str): One of RBF_KERNELS.
+    epsilon (float): Shape parameter for the Gaussian and multiquadric kernels.
+    smoothing (float): Added to the kernel diagonal; 0 interpolates the samples exactly.
+    """
+
+    def __init__(self, kernel="cubic", epsilon=1.0, smoothing=0.0):
+        if kernel not in RBF_KERNELS:
+            raise ValueError(f"Unknown RBF kernel '{kernel}'; use one of {', '.join(RBF_KERNELS)}.")
+        self.kernel = kernel
+        self.epsilon = epsilon
+        self.smoothing = smoothing
+        self.centres = None
+        self.weights = None
+
+    def _kernel_matrix(self, U):
+        # |u - c|^2 = |u|^2 + |c|^2 - 2 u.c, one matrix product instead of an (m, n, d) difference
+        squared = (U**2).sum(1)[:, None] + (self.centres**2).sum(1)[None, :] - 2.0 * U @ self.centres.T
+        return RBF_KERNELS[self.kernel](np.sqrt(np.maximum(squared, 0.0)), self.epsilon)
+
+    def fit(self, U, Y):
+        n, d = U.shape
+        self.centres = U.copy()
+        P = np.hstack([np.ones((n, 1)), U])
+        system = np.zeros((n + d + 1, n + d + 1))
+        system[:n, :n] = self._kernel_matrix(U) + self.smoothing * np.eye(n)
+        system[:n, n:] = P
+        system[n:, :n] = P.T
+        rhs = np.vstack([Y, np.zeros((d + 1, Y.shape[1]))])
+        self.weights = np.linalg.solve(system, rhs)
+        return self
+
+    def predict(self, U):
+        n = len(self.centres)
+        out = np.empty((len(U), self.weights.shape[1]))
+        for start in range(0, len(U), _CHUNK):
+            block = U[start:start + _CHUNK]
+            out[start:start + _CHUNK] = (self._kernel_matrix(block) @ self.weights[:n]
+                                         + block @ self.weights[n + 1:] + self.weights[n])
+        return out
+
+
+def _make_model(model, options):
+    if model == "poly":
+        return PolynomialModel(**options)
+    if model == "rbf":
+        return RBFModel(**options)
+    raise ValueError(f"Unknown surrogate model '{model}'; use one of {', '.join(MODELS)}.")
+
+
+class Surrogate:
+    """
+    Surrogate of some cycle outputs over a box of inputs.
+
+    Parameters:
+    ranges (dict): {input: (low, high)} box the surrogate covers.
+    outputs (tuple of str): Cycle outputs to model.
+    model (str): "poly" or "rbf".
+    **options: Model options, e.g. degree=3 or kernel="thin_plate".
+    """
+
+    def __init__(self, ranges=None, outputs=SURROGATE_OUTPUTS, model="poly", **options):
+        self.ranges = dict(SURROGATE_RANGES if ranges is None else ranges)
+        self.outputs = tuple(outputs)
+        for name in self.ranges:
+            if name not in DESIGN_POINT:
+                raise ValueError(f"Unknown cycle input '{name}'.")
+        for name in self.outputs:
+            if name not in CYCLE_OUTPUTS:
+                raise ValueError(f"Unknown cycle output '{name}'.")
+        self.model_name = model
+        self.options = options
+        self.model = _make_model(model, options)
+        self._low = np.array([low for low, _ in self.ranges.values()], dtype=float)
+        self._high = np.array([high for _, high in self.ranges.values()], dtype=float)
+        self._mean = None
+        self._std = None
+
+    def _unit(self, inputs):
+        missing = [name for name in self.ranges if name not in inputs]
+        if missing:
+            raise ValueError(f"Missing surrogate input(s): {', '.join(missing)}.")
+        columns = np.broadcast_arrays(*(np.asarray(inputs[name], dtype=float) for name in self.ranges))
+        X = np.stack([column.ravel() for column in columns], axis=1)
+        return 2.0 * (X - self._low) / (self._high - self._low) - 1.0, columns[0].shape
+
+    def fit(self, inputs, results):
+        """
+        Fit the model to sampled inputs and cycle results.
+
+        Parameters:
+        inputs (dict): Sampled input arrays, one per range.
+        results (dict): Cycle outputs at the samples.
+
+        Returns:
+        Surrogate: self.
+        """
+        U, shape = self._unit(inputs)
+        Y = np.stack([np.broadcast_to(results[name], shape).ravel() for name in self.outputs], axis=1)
+        keep = np.all(np.isfinite(Y), axis=1)
+        U, Y = U[keep], Y[keep]
+        self._mean = Y.mean(axis=0)
+        self._std = np.where(Y.std(axis=0) > 0, Y.std(axis=0), 1.0)
+        self.model.fit(U, (Y - self._mean) / self._std)
+        return self
+
+    def predict(self, **inputs):
+        """
+        Predict the outputs.
+
+        Parameters:
+        **inputs: Values (floats or arrays, broadcast together) for every input in the ranges.
+
+        Returns:
+        dict: Each output with the broadcast input shape.
+        """
+        if self._mean is None:
+            raise ValueError("Surrogate has not been fitted.")
+        U, shape = self._unit(inputs)
+        Y = self.model.predict(U) * self._std + self._mean
+        return {name: Y[:, j].reshape(shape) for j, name in enumerate(self.outputs)}
+
+
+def cross_validate(surrogate, inputs, results, folds=5, seed=0):
+    """
+    k-fold held-out errors of a surrogate configuration.
+
+    Parameters:
+    surrogate (Surrogate): Configuration to check (ranges, outputs, model, options).
+    inputs, results (dict): Samples, as for Surrogate.fit.
+    folds (int): Number of folds.
+    seed (int): Random seed for the fold split.
+
+    Returns:
+    dict: {output: {"rmse", "max_abs", "rmse_rel", "max_rel", "r2"}}, with
+    relative errors taken against each output's range over the samples.
+    """
+    n = len(next(iter(inputs.values())))
+    if not 2 <= folds <= n:
+        raise ValueError(f"Cross-validation needs between 2 and {n} folds, got {folds}.")
+    order = np.random.default_rng(seed).permutation(n)
+    predicted = {name: np.empty(n) for name in surrogate.outputs}
+    for fold in np.array_split(order, folds):
+        train = np.setdiff1d(order, fold)
+        model = Surrogate(surrogate.ranges, surrogate.outputs, surrogate.model_name, **surrogate.options)
+        model.fit({name: values[train] for name, values in inputs.items()},
+                  {name: np.broadcast_to(results[name], (n,))[train] for name in surrogate.outputs})
+        prediction = model.predict(**{name: values[fold] for name, values in inputs.items()})
+        for name in surrogate.outputs:
+            predicted[name][fold] = prediction[name]
+    report = {}
+    for name in surrogate.outputs:
+        exact = np.broadcast_to(results[name], (n,))
+        finite = np.isfinite(exact)
+        error = predicted[name][finite] - exact[finite]
+        span = np.ptp(exact[finite]) or 1.0
+        report[name] = {
+            "rmse": float(np.sqrt(np.mean(error**2))),
+            "max_abs": float(np.max(np.abs(error))),
+            "rmse_rel": float(np.sqrt(np.mean(error**2)) / span),
+            "max_rel": float(np.max(np.abs(error)) / span),
+            "r2": float(1.0 - np.sum(error**2) / np.sum((exact[finite] - exact[finite].mean()) ** 2)),
+        }
+    return report
+
+
+def fit_surrogate(samples=1024, ranges=None, outputs=SURROGATE_OUTPUTS, model="poly", method="sobol",
+                  seed=0, folds=5, **options):
+    """
+    Sample the cycle, cross-validate and fit a surrogate on all samples.
+
+    Parameters:
+    samples (int): DOE points.
+    ranges (dict): Input box; defaults to SURROGATE_RANGES.
+    outputs (tuple of str): Outputs to model.
+    model (str): "poly" or "rbf".
+    method (str): DOE method, see doe.sample.
+    seed (int): Random seed for the DOE and the folds.
+    folds (int): Cross-validation folds; 0 skips cross-validation.
+    **options: Model options.
+
+    Returns:
+    tuple: Fitted Surrogate and its cross-validation report (None if skipped).
+    """
+    surrogate = Surrogate(ranges, outputs, model, **options)
+    inputs = sample(surrogate.ranges, samples, method, seed)
+    results = run_cycle(**inputs)
+    report = cross_validate(surrogate, inputs, results, folds, seed) if folds else None
+    return surrogate.fit(inputs, results), report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit and cross-validate a cycle surrogate.")
+    parser.add_argument("--samples", type=int, default=1024)
+    parser.add_argument("--model", choices=MODELS, default="poly")
+    parser.add_argument("--method", choices=("sobol", "lhs", "random"), default="sobol")
+    parser.add_argument("--degree", type=int, default=3, help="Polynomial degree (poly).")
+    parser.add_argument("--kernel", choices=tuple(RBF_KERNELS), default="cubic", help="Kernel (rbf).")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds; 0 skips cross-validation.")
+    args = parser.parse_args(argv)
+    if args.folds == 1 or args.folds < 0:
+        parser.error("--folds must be 0 or at least 2.")
+    options = {"degree": args.degree} if args.model == "poly" else {"kernel": args.kernel}
+    surrogate, report = fit_surrogate(args.samples, model=args.model, method=args.method, folds=args.folds, **options)
+    if report is None:
+        print(f"{args.model} surrogate, {args.samples} {args.method} samples, no cross-validation")
+    else:
+        print(f"{args.model} surrogate, {args.samples} {args.method} samples, {args.folds}-fold cross-validation")
+        print(f"{'Output':>8} {'RMSE':>11} {'Max abs':>11} {'RMSE/range':>11} {'Max/range':>10} {'R2':>9}")
+        for name, errors in report.items():
+            print(f"{name:>8} {errors['rmse']:11.4g} {errors['max_abs']:11.4g} {errors['rmse_rel']:11.2e} "
+                  f"{errors['max_rel']:10.2e} {errors['r2']:9.6f}")
+    queries = sample(surrogate.ranges, 100000, "random", seed=1)
+    started = time.perf_counter()
+    surrogate.predict(**queries)
+    elapsed = time.perf_counter() - started
+    print(f"Prediction: {elapsed / 100000 * 1e6:.2f} us per query (100000 queries in {elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ import math
 M_e = 2.0 # Exit Mach number
 P0 =  282681.9905 # Total pressure in Pa
 T0 = 2400 # Total temperature in K
-m_dot =  122.4032 # Mass flow rate in kg/s af afterburner
+m_dot =  122.6913 # Mass flow rate in kg/s af afterburner
 gamma = 1.3333 # Specific heat ratio
 R= 287.05 # Specific gas constant in J/(kg*K)
 P_ambient = 101325 # Ambient pressure in Pa
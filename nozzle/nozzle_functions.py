@@ -1,5 +1,3 @@
-import math
-
 def calculate_area_ratio(M_e, gamma):
     """
     Calculate the area ratio for the nozzle based on exit Mach number and specific heat ratio.
@@ -68,7 +66,7 @@ def calculate_velocity_exit(M_e, gamma, R, T_exit):
     Returns:
     float: Exit velocity in m/s
     """
-    return M_e * math.sqrt(gamma * R * T_exit)
+    return M_e * (gamma * R * T_exit) ** 0.5
 
 def calculate_nozzle_exit_area(m_dot, density_exit, velocity_exit):
     """
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from jetsim.adaptive import adaptive_cycle_map, adaptive_map, compare_uniform
+from jetsim.cycle import run_cycle
+
+RANGES = {"rp": (5.0, 40.0), "f": (0.015, 0.03)}
+
+
+def test_map_matches_run_cycle_at_random_points():
+    adaptive = adaptive_cycle_map(RANGES, ("thrust",), rtol=1e-4, max_level=5)
+    rng = np.random.default_rng(1)
+    checks = {name: rng.uniform(low, high, 2000) for name, (low, high) in RANGES.items()}
+    exact = run_cycle(**checks)["thrust"]
+    # Thrust crosses zero in the box, so the error is measured against its range.
+    assert np.max(np.abs(adaptive(**checks)["thrust"] - exact)) < 1e-3 * np.ptp(exact)
+
+
+def test_points_are_evaluated_once():
+    adaptive = adaptive_cycle_map(RANGES, ("thrust",), rtol=1e-4, max_level=4)
+    keys = np.stack([adaptive.points[name] for name in adaptive.names], axis=1)
+    assert len(np.unique(keys, axis=0)) == adaptive.evaluations
+    np.testing.assert_array_equal(adaptive.values["thrust"], run_cycle(**adaptive.points)["thrust"])
+
+
+def test_fewer_points_than_a_uniform_grid_of_the_same_error():
+    def nozzle_like(x, y):
+        return {"z": np.tanh(40.0 * (x - 0.3)) + y}
+
+    ranges = {"x": (0.0, 1.0), "y": (0.0, 1.0)}
+    adaptive = adaptive_map(nozzle_like, ranges, ("z",), rtol=1e-3, max_level=6)
+    row = compare_uniform(adaptive, nozzle_like, ranges, samples=5000)["z"]
+    assert row["uniform_error"] <= row["adaptive_error"]
+    assert row["uniform_evaluations"] > 2 * row["adaptive_evaluations"]
+
+
+def test_cycle_map_uses_atol():
+    loose = adaptive_cycle_map(RANGES, ("thrust",), max_level=4, atol={"thrust": 1e9})
+    tight = adaptive_cycle_map(RANGES, ("thrust",), max_level=4, atol={"thrust": 1.0})
+    assert loose.evaluations == (4 + 1) ** 2 + 4**2  # coarse corners and centres, nothing split
+    assert tight.evaluations > loose.evaluations
+    with pytest.raises(KeyError):
+        adaptive_cycle_map(RANGES, ("thrust",), max_level=2, atol={"tsfc": 1.0})
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from jetsim.batch import has_case_ids, read_cases, run_batch
+from jetsim.cycle import run_cycle
+
+
+def test_results_match_run_cycle(tmp_path):
+    cases = tmp_path / "cases.csv"
+    cases.write_text("rp,f\n12,0.016\n25,\n38,0.024\n")
+    assert run_batch(str(cases), str(tmp_path / "out.csv"), ("thrust", "f"), chunk_size=2) == 3
+    rows = [line.split(",") for line in (tmp_path / "out.csv").read_text().splitlines()]
+    assert rows[0] == ["thrust", "f"]
+    for row, (rp, f) in zip(rows[1:], [(12.0, 0.016), (25.0, 0.02), (38.0, 0.024)]):
+        assert float(row[0]) == pytest.approx(float(run_cycle(rp=rp, f=f)["thrust"]), rel=1e-12)
+        assert float(row[1]) == f
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4096])
+def test_csv_ids_declared_in_the_header(tmp_path, chunk_size):
+    cases = tmp_path / "cases.csv"
+    cases.write_text("case_id,rp\n,10\n,12\nb,14\n")
+    run_batch(str(cases), str(tmp_path / "out.csv"), ("rp",), chunk_size)
+    assert (tmp_path / "out.csv").read_text().splitlines() == ["case_id,rp", ",10.0", ",12.0", "b,14.0"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_jsonl_ids_after_the_first_record(tmp_path, chunk_size):
+    cases = tmp_path / "cases.jsonl"
+    cases.write_text("".join(json.dumps({"rp": 20.0 + i, **({"case_id": f"c{i}"} if i >= 5 else {})}) + "\n"
+                             for i in range(10)))
+    run_batch(str(cases), str(tmp_path / "out.jsonl"), ("rp",), chunk_size)
+    rows = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert [row["case_id"] for row in rows] == [""] * 5 + [f"c{i}" for i in range(5, 10)]
+
+
+def test_has_case_ids(tmp_path):
+    (tmp_path / "a.csv").write_text("rp,f\n10,0.02\n")
+    (tmp_path / "b.jsonl").write_text('{"rp": 10, "note": "no case_id here"}\n')
+    (tmp_path / "c.jsonl").write_text('{"rp": 10}\n{"case_id": "x"}\n')
+    assert not has_case_ids(str(tmp_path / "a.csv"))
+    assert not has_case_ids(str(tmp_path / "b.jsonl"))
+    assert has_case_ids(str(tmp_path / "c.jsonl"))
+
+
+def test_blank_cells_take_the_design_point(tmp_path):
+    cases = tmp_path / "cases.csv"
+    cases.write_text("rp,f\n12,\n,0.018\n")
+    (n, ids, inputs), = read_cases(str(cases))
+    assert n == 2 and ids is None
+    assert inputs["rp"].tolist() == [12.0, 30.0]
+    assert inputs["f"].tolist() == [0.02, 0.018]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("rp,bogus\n10,1\n", "unknown column 'bogus'"),
+    ("rp,f\n20,0.02\n21,abc\n", "cases.csv:3"),
+    ("rp,f\n20\n", "expected 2 fields"),
+])
+def test_malformed_cases_raise_with_location(tmp_path, text, message):
+    cases = tmp_path / "cases.csv"
+    cases.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        run_batch(str(cases), str(tmp_path / "out.csv"))
@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+
+from jetsim.cache import ResultCache, cached_run_cycle, hash_inputs
+from jetsim.cycle import run_cycle
+
+
+def test_hit_after_miss_returns_the_same_result(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    rp = np.linspace(10.0, 40.0, 50)
+    first = cached_run_cycle(cache, ("thrust", "tsfc"), rp=rp)
+    second = cached_run_cycle(cache, ("thrust", "tsfc"), rp=rp)
+    assert (cache.misses, cache.hits) == (1, 1)
+    np.testing.assert_array_equal(first["thrust"], run_cycle(rp=rp)["thrust"])
+    for name in first:
+        np.testing.assert_array_equal(second[name], first[name])
+
+
+def test_key_depends_on_inputs_and_parameters():
+    inputs = {"rp": np.linspace(10.0, 40.0, 5)}
+    key = hash_inputs(inputs)
+    assert hash_inputs({"rp": np.linspace(10.0, 40.0, 5)}) == key
+    assert hash_inputs({"rp": np.linspace(10.0, 40.0, 6)}) != key
+    assert hash_inputs(inputs, {"outputs": ["thrust"]}) != key
+
+
+def test_other_outputs_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cached_run_cycle(cache, ("thrust",), rp=20.0)
+    cached_run_cycle(cache, ("tsfc",), rp=20.0)
+    assert (cache.misses, cache.hits) == (2, 0)
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1 << 40)
+    rng = np.random.default_rng(0)
+    for i, key in enumerate("abc"):
+        cache.put(key, {"x": rng.random(1000)})
+        os.utime(tmp_path / f"{key}.npz", (1000.0 + i, 1000.0 + i))
+    assert cache.get("a") is not None  # now the most recently used
+    size = max(os.path.getsize(tmp_path / f"{key}.npz") for key in "abc")
+    cache.max_bytes = 3 * size
+    cache.put("d", {"x": rng.random(1000)})
+    assert sorted(path.stem for path in tmp_path.glob("*.npz")) == ["a", "c", "d"]
+
+
+def test_damaged_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    (tmp_path / "bad.npz").write_bytes(b"not a zip file")
+    assert cache.get("bad") is None
+    assert cache.misses == 1
+    assert not (tmp_path / "bad.npz").exists()
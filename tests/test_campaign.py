@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from jetsim.campaign import run_monte_carlo, run_sweep
+
+AXES = {"rp": np.linspace(10.0, 40.0, 31), "f": np.linspace(0.015, 0.025, 11)}
+RANGES = {"eta_c": (0.85, 0.89), "f": ("normal", 0.02, 0.001)}
+
+
+def _statistics(summary):
+    return {name: value for name, value in summary.items() if name not in ("progress", "seed")}
+
+
+def test_resumed_sweep_matches_uninterrupted(tmp_path):
+    whole = run_sweep(AXES, ("thrust", "tsfc", "T04"), chunk_size=40)
+    path = str(tmp_path / "sweep.npz")
+    first = run_sweep(AXES, ("thrust", "tsfc", "T04"), path, chunk_size=40, max_chunks=3)
+    assert first["progress"]["done"] == 3
+    resumed = run_sweep(AXES, ("thrust", "tsfc", "T04"), path, chunk_size=40)
+    assert resumed["progress"]["resumed"] == 3
+    assert resumed["progress"]["done"] == resumed["progress"]["chunks"]
+    assert _statistics(resumed) == _statistics(whole)
+
+
+def test_resumed_monte_carlo_matches_uninterrupted(tmp_path):
+    whole = run_monte_carlo(RANGES, 5000, seed=7, chunk_size=512)
+    path = str(tmp_path / "mc.npz")
+    run_monte_carlo(RANGES, 5000, checkpoint=path, seed=7, chunk_size=512, max_chunks=2)
+    run_monte_carlo(RANGES, 5000, checkpoint=path, chunk_size=512, max_chunks=4)
+    resumed = run_monte_carlo(RANGES, 5000, checkpoint=path, chunk_size=512)
+    assert resumed["seed"] == whole["seed"]
+    assert _statistics(resumed) == _statistics(whole)
+
+
+def test_checkpoint_refuses_another_run(tmp_path):
+    path = str(tmp_path / "sweep.npz")
+    run_sweep(AXES, chunk_size=40, checkpoint=path, max_chunks=1)
+    with pytest.raises(ValueError):
+        run_sweep(AXES, chunk_size=64, checkpoint=path)
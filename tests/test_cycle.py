@@ -0,0 +1,78 @@
+import os
+import re
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from jetsim.cycle import run_cycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Printed labels of the station scripts and the cycle outputs they report.
+BASELINE = {
+    "inlet": {
+        "Real Stagnation Temperature (T0_real)": "T02",
+        "Real Stagnation Pressure after Efficiency (P0_real_after_eta_p)": "P02",
+    },
+    "compressor": {
+        "Stagnation pressure at compressor exit": "P03",
+        "Stagnation temperature at compressor exit": "T03",
+        "Energy flow through the compressor": "W_compressor",
+    },
+    "combustor": {
+        "Stagnation temperature at combustor exit": "T04",
+        "Stagnation pressure at combustor exit": "P04",
+        "Fuel mass flow rate": "m_fuel",
+        "Total mass flow rate": "m_total",
+        "Equivalence ratio": "phi",
+    },
+    "turbine": {
+        "T05' (required temperature drop)": "T05_prime",
+        "T05 (stagnation temperature at turbine exit)": "T05",
+        "P05 (stagnation pressure at turbine exit)": "P05",
+    },
+    "afterburner": {
+        "Fuel-to-air ratio in afterburner": "f_ab",
+        "Fuel mass flow rate in afterburner": "m_fuel_ab",
+        "New total mass flow rate after afterburner": "m_ab",
+        "Pressure at afterburner exit": "P06",
+    },
+    "nozzle": {
+        "Area Ratio": "area_ratio",
+        "Exit Temperature": "T_e",
+        "Exit Pressure": "P_e",
+        "Exit Density": "rho_e",
+        "Exit Velocity": "V_e",
+        "Nozzle Exit Area": "A_e",
+        "Thrust": "thrust",
+    },
+}
+
+
+def _script_values(station):
+    output = subprocess.run([sys.executable, f"{station}_main.py"], cwd=os.path.join(ROOT, station),
+                            env={**os.environ, "MPLBACKEND": "Agg"}, capture_output=True, text=True,
+                            check=True).stdout
+    return {match[1]: float(match[2]) for match in re.finditer(r"^(.+?): (-?[\d.]+)", output, re.M)}
+
+
+@pytest.mark.parametrize("station", list(BASELINE))
+def test_design_point_matches_station_scripts(station):
+    pytest.importorskip("matplotlib")
+    printed = _script_values(station)
+    state = run_cycle()
+    for label, name in BASELINE[station].items():
+        # The scripts print two decimals and chain through rounded *_outputs.py values.
+        assert float(state[name]) == pytest.approx(printed[label], rel=1e-4, abs=0.01), name
+
+
+def test_arrays_match_scalar_runs():
+    rp = np.array([12.0, 25.0, 38.0])
+    f = np.array([0.016, 0.02, 0.024])
+    state = run_cycle(rp=rp, f=f)
+    for k in range(3):
+        scalar = run_cycle(rp=rp[k], f=f[k])
+        for name in ("T04", "thrust", "tsfc"):
+            assert state[name][k] == pytest.approx(scalar[name], rel=1e-12)
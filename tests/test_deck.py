@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from jetsim.deck import Deck, deck_cycle, error_report, generate_deck
+from jetsim.interpolate import GridInterpolator
+
+ALTITUDES = np.linspace(0.0, 12000.0, 7)
+MACHS = np.linspace(0.0, 1.2, 7)
+POWERS = np.linspace(0.0, 2.0, 9)
+
+
+@pytest.fixture(scope="module")
+def deck(tmp_path_factory):
+    return generate_deck(str(tmp_path_factory.mktemp("deck") / "engine.deck"), ALTITUDES, MACHS, POWERS)
+
+
+def test_round_trip_keeps_axes_and_table(deck):
+    reopened = Deck(deck.path)
+    for axis, expected in zip(reopened.axes, (ALTITUDES, MACHS, POWERS)):
+        np.testing.assert_array_equal(axis, expected)
+    state = deck_cycle(ALTITUDES[:, None, None], MACHS[None, :, None], POWERS[None, None, :])
+    for k, name in enumerate(reopened.outputs):
+        np.testing.assert_array_equal(reopened.table[..., k], np.broadcast_to(state[name], reopened.table.shape[:3])
+                                      .astype(np.float32))
+
+
+def test_grid_nodes_interpolate_exactly(deck):
+    altitude, mach, power = np.meshgrid(ALTITUDES, MACHS, POWERS, indexing="ij")
+    for method in ("linear", "cubic"):
+        np.testing.assert_allclose(deck(altitude, mach, power, method=method)["thrust"],
+                                   deck.direct(altitude, mach, power)["thrust"], rtol=1e-6)
+
+
+def test_interpolation_error_is_small(deck):
+    report = error_report(deck, samples=2000)
+    for method in ("linear", "cubic"):
+        for name in deck.outputs:
+            assert report[method][name]["max_rel"] < 0.02
+            assert report[method][name]["rms_rel"] < report[method][name]["max_rel"]
+
+
+def test_not_a_deck(tmp_path):
+    path = tmp_path / "other.deck"
+    path.write_bytes(b"something else entirely")
+    with pytest.raises(ValueError, match="not an engine deck"):
+        Deck(str(path))
+
+
+def test_interpolator_reproduces_linear_functions():
+    axes = (np.array([0.0, 1.0, 3.0, 4.0]), np.array([-1.0, 0.0, 2.0, 2.5]))
+    x, y = np.meshgrid(*axes, indexing="ij")
+    values = 2 * x - 3 * y + 1
+    for method in ("linear", "cubic"):
+        interpolate = GridInterpolator(axes, values, method)
+        np.testing.assert_allclose(interpolate(np.array([0.5, 2.2, 3.9]), np.array([-0.5, 1.0, 1.9])),
+                                   2 * np.array([0.5, 2.2, 3.9]) - 3 * np.array([-0.5, 1.0, 1.9]) + 1, atol=1e-12)
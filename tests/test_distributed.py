@@ -0,0 +1,91 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from jetsim.campaign import monte_carlo_spec, run_chunks, sweep_spec
+from jetsim import distributed
+from jetsim.distributed import Coordinator, WorkerError, run_worker
+
+
+def _statistics(summary):
+    return {name: value for name, value in summary.items() if name not in ("progress", "seed", "workers")}
+
+
+def _run_distributed(spec, workers=2, **options):
+    coordinator = Coordinator(spec, **options)
+    summaries = []
+    errors = []
+
+    def serve():
+        try:
+            summaries.append(coordinator.run(port=0))
+        except Exception as exc:
+            errors.append(exc)
+
+    serving = threading.Thread(target=serve)
+    serving.start()
+    deadline = time.monotonic() + 30
+    while coordinator.port is None:
+        assert serving.is_alive() and time.monotonic() < deadline, "coordinator did not start"
+        time.sleep(0.01)
+    def work(name):
+        try:
+            run_worker(f"127.0.0.1:{coordinator.port}", name)
+        except FloatingPointError:
+            pass  # a worker re-raises the chunk failure it reported; the coordinator's error is checked
+
+    threads = [threading.Thread(target=work, args=(f"test{i}",)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads + [serving]:
+        thread.join(60)
+    if errors:
+        raise errors[0]
+    assert summaries, "coordinator did not finish"
+    return summaries[0]
+
+
+def test_distributed_sweep_matches_campaign():
+    spec = sweep_spec({"rp": np.linspace(10.0, 40.0, 31), "f": np.linspace(0.015, 0.025, 11)},
+                      ("thrust", "tsfc"), chunk_size=25)
+    summary = _run_distributed(spec)
+    assert summary["progress"]["done"] == summary["progress"]["chunks"]
+    assert _statistics(summary) == _statistics(run_chunks(spec))
+
+
+def test_distributed_monte_carlo_matches_campaign():
+    spec = monte_carlo_spec({"eta_c": (0.85, 0.89), "T06": (2000.0, 2400.0)}, 4000, chunk_size=300)
+    summary = _run_distributed(spec, seed=11)
+    assert summary["seed"] == 11
+    assert _statistics(summary) == _statistics(run_chunks(spec, seed=11))
+
+
+def test_distributed_raw_rows_cover_every_case(tmp_path):
+    spec = sweep_spec({"rp": np.linspace(10.0, 40.0, 7), "f": np.linspace(0.015, 0.025, 5)}, ("thrust",),
+                      chunk_size=4)
+    results = tmp_path / "rows.csv"
+    _run_distributed(spec, results=str(results))
+    lines = results.read_text().splitlines()
+    assert lines[0] == "case,rp,f,thrust"
+    assert sorted(int(float(line.split(",")[0])) for line in lines[1:]) == list(range(35))
+
+
+def test_failing_chunk_fails_the_run(monkeypatch):
+    spec = sweep_spec({"rp": np.linspace(10.0, 40.0, 31)}, ("thrust",), chunk_size=4)
+    evaluator = distributed.chunk_evaluator
+
+    def failing_evaluator(spec, entropy):
+        evaluate = evaluator(spec, entropy)
+
+        def evaluate_or_fail(chunk, with_inputs=False):
+            if chunk == 3:
+                raise FloatingPointError("chunk 3 is broken")
+            return evaluate(chunk, with_inputs)
+        return evaluate_or_fail
+
+    monkeypatch.setattr(distributed, "chunk_evaluator", failing_evaluator)
+    with pytest.raises(WorkerError, match="chunk 3 is broken") as failure:
+        _run_distributed(spec)
+    assert "Traceback" in str(failure.value)
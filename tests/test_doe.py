@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from jetsim.doe import SOBOL_MAX_DIMENSIONS, latin_hypercube, sobol
+
+qmc = pytest.importorskip("scipy.stats.qmc")
+
+
+@pytest.mark.filterwarnings("ignore:The balance properties")
+@pytest.mark.parametrize("d", [1, 3, SOBOL_MAX_DIMENSIONS])
+@pytest.mark.parametrize("skip", [0, 1, 4, 6, 100, 1023])
+def test_sobol_matches_scipy(d, skip):
+    reference = qmc.Sobol(d, scramble=False)
+    if skip:
+        reference.random(skip)
+    np.testing.assert_allclose(sobol(64, d, skip=skip), reference.random(64))
+
+
+def test_sobol_skip_continues_the_sequence():
+    np.testing.assert_allclose(sobol(1, 3, skip=4), [[0.375, 0.375, 0.625]])
+    np.testing.assert_allclose(sobol(8, 4)[5:], sobol(3, 4, skip=5))
+
+
+def test_latin_hypercube_has_one_point_per_stratum():
+    points = latin_hypercube(50, 4, seed=1)
+    for column in points.T:
+        assert sorted(np.floor(column * 50).astype(int)) == list(range(50))
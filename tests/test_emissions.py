@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from jetsim.cycle import run_cycle
+from jetsim.emissions import EMISSION_OUTPUTS, Emissions, emission_indices, pattern_factor, primary_zone_temperature
+
+
+def test_nox_matches_lefebvre_with_liner_volume():
+    state = run_cycle(rp=np.array([10.0, 20.0, 30.0]))
+    tau, m_air = 4e-3, 115.0
+    P03, T03, R = state["P03"], state["T03"], state["R"]
+    volume = m_air * tau / (P03 / (R * T03))  # liner volume holding the air for tau
+    T_pz = primary_zone_temperature(T03, state["T04"], state["phi"], state["cp_combustor"])
+    expected = 9e-8 * (P03 / 1000) ** 1.25 * volume * np.exp(0.01 * T_pz) / (m_air * T_pz)
+    result = emission_indices(P03, T03, state["T04"], state["phi"], state["p_loss_ratio"], state["cp_combustor"], R,
+                              residence_time=tau)
+    np.testing.assert_allclose(result["EI_NOx"], expected, rtol=1e-12)
+
+
+def test_trends_with_pressure_ratio():
+    result = Emissions()(run_cycle(rp=np.array([10.0, 20.0, 30.0])))
+    assert set(result) == set(EMISSION_OUTPUTS)
+    assert np.all(np.diff(result["EI_NOx"]) > 0)  # hotter, denser primary zone
+    assert np.all(np.diff(result["EI_CO"]) < 0)
+    assert np.all(np.diff(result["EI_UHC"]) < 0)
+    assert 1 < result["EI_NOx"][1] < 50  # g/kg, the range of real combustors
+
+
+def test_pattern_factor_and_peak_temperature():
+    assert pattern_factor(3.0, 20.0) == pytest.approx(1 - np.exp(-1 / 4.2))
+    assert pattern_factor(6.0, 40.0) < pattern_factor(3.0, 20.0)  # longer, lossier liners mix better
+    state = run_cycle()
+    result = Emissions()(state)
+    assert result["T04_peak"] == pytest.approx(state["T04"] + result["pattern_factor"] * (state["T04"] - state["T03"]))
+
+
+def test_primary_zone_temperature_is_capped():
+    assert primary_zone_temperature(900.0, 2400.0, 0.35, 1150.0, T_max=2400.0) == 2400.0
+    assert primary_zone_temperature(900.0, 900.0, 0.0, 1150.0) == 900.0
+
+
+def test_invalid_settings_raise():
+    with pytest.raises(ValueError):
+        Emissions(residence_time=0.0)
+    with pytest.raises(ValueError):
+        Emissions(primary_air_fraction=1.5)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from jetsim.cycle import run_cycle
+from jetsim.equilibrium import (F_STOICH, afterburner_equilibrium, combustor_equilibrium, combustor_equilibrium_error,
+                                equilibrium_properties)
+
+INPUTS = {"rp": np.array([10.0, 20.0, 35.0]), "f": np.array([0.015, 0.03, 0.045])}
+
+
+@pytest.fixture(scope="module")
+def ideal():
+    return run_cycle(**INPUTS)
+
+
+def _combustor(ideal):
+    return combustor_equilibrium(ideal["P03"], ideal["T03"], INPUTS["f"], ideal["n_b"], ideal["LHV"],
+                                 ideal["cp_combustor"], ideal["f_stoich"], ideal["p_loss_ratio"], ideal["m_flow"])
+
+
+def _afterburner(ideal, T06):
+    return afterburner_equilibrium(ideal["P05"], ideal["T05"], T06, INPUTS["f"], ideal["cp_ab"], ideal["LHV"],
+                                   ideal["n_ab"], ideal["m_total"], ideal["ab_loss"])
+
+
+def test_air_properties_at_room_temperature():
+    air = equilibrium_properties(300.0, 101325.0, 0.0)
+    assert air["R"] == pytest.approx(287.0, rel=1e-3)
+    assert air["gamma"] == pytest.approx(1.4, rel=1e-2)
+    assert air["cp"] == pytest.approx(1005.0, rel=1e-2)
+    assert 0.06 < F_STOICH < 0.075
+
+
+def test_hot_products_have_higher_cp_and_lower_gamma():
+    products = equilibrium_properties(np.array([300.0, 1500.0, 2800.0]), 1e6, 0.03)
+    assert np.all(np.diff(products["h"]) > 0)
+    assert np.all(np.diff(products["cp"]) > 0)
+    assert np.all(np.diff(products["gamma"]) < 0)
+
+
+def test_equilibrium_T04_is_below_ideal(ideal):
+    burnt = _combustor(ideal)
+    assert np.all(burnt["T04"] < ideal["T04"])
+    # Dissociation and the rising cp take more off the hotter points.
+    assert np.all(np.diff(ideal["T04"] - burnt["T04"]) > 0)
+    np.testing.assert_array_equal(burnt["P04"], ideal["P04"])
+
+
+def test_error_estimate_tracks_the_equilibrium_T04(ideal):
+    actual = (ideal["T04"] - _combustor(ideal)["T04"]) / ideal["T04"]
+    estimate = combustor_equilibrium_error(ideal["T03"], ideal["T04"], ideal["P04"], INPUTS["f"],
+                                           ideal["cp_combustor"])
+    np.testing.assert_allclose(estimate, actual, atol=0.01)
+
+
+def test_afterburner_needs_more_fuel_than_ideal_or_reports_nan(ideal):
+    reheat = _afterburner(ideal, 2000.0)
+    f_ab = ideal["cp_ab"] * (2000.0 - ideal["T05"]) / (ideal["n_ab"] * ideal["LHV"] - ideal["cp_ab"] * 2000.0)
+    assert np.all(np.isfinite(reheat["f_ab"]))
+    np.testing.assert_allclose(reheat["m_ab"], ideal["m_total"] * (1 + reheat["f_ab"]))
+    assert np.all((reheat["f_ab"] > f_ab) & (reheat["f_ab"] < 1.5 * f_ab))
+    assert np.all(np.isnan(_afterburner(ideal, 3200.0)["f_ab"]))
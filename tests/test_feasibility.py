@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from jetsim.cycle import run_cycle
+from jetsim.feasibility import DEFAULT_CONSTRAINTS, FEASIBLE, T04_MAX, Constraint, run_feasible
+
+OUTPUTS = ("thrust", "tsfc", "T04", "m_fuel_total")
+
+
+def _sweep():
+    rng = np.random.default_rng(0)
+    return {"f": rng.uniform(0.005, 0.06, 5000), "rp": rng.uniform(2.0, 40.0, 5000),
+            "T06": rng.uniform(1200.0, 2400.0, 5000)}
+
+
+def _expected_mask(inputs):
+    state = run_cycle(**inputs)
+    with np.errstate(invalid="ignore"):
+        ok = np.ones(len(inputs["f"]), dtype=bool)
+        for constraint in DEFAULT_CONSTRAINTS:
+            ok &= np.broadcast_to(constraint.function(**{name: state[name] for name in constraint.variables}), ok.shape)
+    return ok, state
+
+
+def test_feasible_mask_and_values_match_run_cycle():
+    inputs = _sweep()
+    result = run_feasible(**inputs)
+    expected, state = _expected_mask(inputs)
+    assert 0 < result.feasible.sum() < len(expected)
+    np.testing.assert_array_equal(result.feasible, expected)
+    for name in OUTPUTS:
+        np.testing.assert_allclose(result.values[name][expected], state[name][expected], rtol=1e-13)
+        assert np.isnan(result.values[name][~expected]).all()
+
+
+def test_reason_is_the_first_failed_constraint():
+    result = run_feasible(f=np.array([0.02, 0.06, 0.02]), T06=np.array([2000.0, 2000.0, 600.0]))
+    assert result.reason[0] == FEASIBLE
+    assert result.reasons[result.reason[1] - 1] == "T04 above turbine limit"
+    assert result.reasons[result.reason[2] - 1] == "T06 below T05"
+    assert result.counts() == {"T04 above turbine limit": 1, "T06 below T05": 1}
+
+
+def test_pruned_points_skip_later_stations():
+    f = np.linspace(0.01, 0.06, 1000)
+    result = run_feasible(f=f)
+    over = run_cycle(f=f)["T04"] > T04_MAX
+    assert result.evaluations["turbine"] == np.count_nonzero(~over)
+    assert result.evaluations["compressor"] == len(f)
+
+
+def test_unknown_constraint_variable():
+    with pytest.raises(ValueError, match="unknown variable"):
+        run_feasible((Constraint("bad", ("nope",), lambda nope: nope > 0),), f=np.ones(3) * 0.02)
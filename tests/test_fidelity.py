@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from jetsim.atmosphere import flight_condition
+from jetsim.fidelity import AUTO, DEFAULT_TOLERANCE, run_fidelity
+
+
+@pytest.fixture(scope="module")
+def envelope():
+    rng = np.random.default_rng(0)
+    inputs = flight_condition(rng.uniform(0.0, 15000.0, 2000), rng.uniform(0.0, 1.5, 2000))
+    inputs["rp"] = rng.uniform(4.0, 16.0, 2000)
+    return inputs
+
+
+@pytest.mark.parametrize("station, model, output", [
+    ("inlet", "normal_shock", "P02"),
+    ("compressor", "stacked", "T03"),
+    ("combustor", "equilibrium", "T04"),
+    ("turbine", "variable_cp", "T05_prime"),
+])
+def test_auto_matches_detailed_on_escalated_points(envelope, station, model, output):
+    auto = run_fidelity({station: AUTO}, **envelope)
+    detailed = run_fidelity({station: model}, **envelope).state[output]
+    ideal = run_fidelity({}, **envelope).state[output]
+    escalated = auto.escalated[station]
+    assert escalated.any() and not escalated.all()
+    np.testing.assert_allclose(auto.state[output][escalated], detailed[escalated], rtol=1e-12)
+    np.testing.assert_allclose(auto.state[output][~escalated], ideal[~escalated], rtol=1e-12)
+
+
+def test_combustor_default_escalates_a_minority(envelope):
+    escalated = run_fidelity({"combustor": AUTO}, **envelope).escalated["combustor"]
+    assert escalated.mean() < 0.5
+    assert run_fidelity({"combustor": AUTO}, DEFAULT_TOLERANCE, **envelope).escalated["combustor"].mean() > 0.5
+
+
+def test_tolerance_per_station(envelope):
+    choice = {"compressor": AUTO, "combustor": AUTO}
+    result = run_fidelity(choice, {"compressor": 1.0}, **envelope)
+    assert not result.escalated["compressor"].any()
+    np.testing.assert_array_equal(result.escalated["combustor"],
+                                  run_fidelity({"combustor": AUTO}, **envelope).escalated["combustor"])
+    with pytest.raises(ValueError, match="nozzle_x"):
+        run_fidelity(choice, {"nozzle_x": 0.1}, **envelope)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from jetsim.fleet import fit_fleet, fit_shard, simulate_fleet, stack_engines
+from jetsim.gaspath import PARAMETERS
+
+
+def test_noise_free_fleet_recovers_the_true_health():
+    fleet, truth = simulate_fleet(engines=12, points=20, noise=0.0, seed=1)
+    fit = fit_fleet(fleet, workers=1)
+    assert fit.converged.all() and not fit.stalled.any()
+    assert fit.rms.max() < 1e-12
+    for name in PARAMETERS:
+        np.testing.assert_allclose(fit.parameters[name], truth[name], rtol=1e-10)
+
+
+def test_noisy_fleet_converges_near_the_truth():
+    fleet, truth = simulate_fleet(engines=12, points=30, noise=1e-4, seed=2)
+    fit = fit_fleet(fleet, workers=1)
+    assert fit.converged.all()
+    assert fit.rms.max() < 5e-4
+    for name in PARAMETERS:
+        np.testing.assert_allclose(fit.parameters[name], truth[name], rtol=5e-3)
+
+
+def test_shards_match_a_single_fit():
+    fleet, _ = simulate_fleet(engines=9, points=15, seed=3)
+    single = fit_shard(fleet)
+    sharded = fit_fleet(fleet, workers=1, shards=3)
+    for name in PARAMETERS:
+        np.testing.assert_allclose(sharded.parameters[name], single.parameters[name], rtol=1e-12)
+    np.testing.assert_array_equal(sharded.iterations, single.iterations)
+
+
+def test_engines_with_fewer_points_are_padded():
+    fleet, truth = simulate_fleet(engines=2, points=20, noise=0.0, seed=4)
+    engines = [{name: values[0] for name, values in fleet.items()},
+               {name: values[1, :12] for name, values in fleet.items()}]
+    stacked = stack_engines(engines)
+    assert stacked["P02"].shape == (2, 20)
+    assert np.isnan(stacked["P02"][1, 12:]).all()
+    fit = fit_fleet(stacked, workers=1)
+    assert fit.converged.all()
+    for name in PARAMETERS:
+        np.testing.assert_allclose(fit.parameters[name], truth[name], rtol=1e-9)
@@ -0,0 +1,67 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from jetsim.cycle import DESIGN_POINT, run_cycle
+from jetsim.gaspath import PARAMETERS, SENSORS, GasPathAnalyser, analyse_log, read_sensor_log, simulate_log
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_recovers_injected_drift(tmp_path, suffix):
+    log = str(tmp_path / f"log{suffix}")
+    drift = {"eta_c": -0.02, "n_turbine": -0.01, "p_loss_ratio": 0.01}
+    samples = simulate_log(log, duration=20.0, rate=50.0, drift=drift, noise=1e-5, chunk_size=256)
+    series = str(tmp_path / "series.csv")
+    summary = analyse_log(log, series, window=50, chunk_size=300)
+    assert summary["samples"] == samples == 1000
+    assert summary["recorded_duration"] == pytest.approx(19.98)
+    with open(series, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    last = rows[-1]
+    # The window lags the drift by half its length.
+    expected = 1 - 25 / samples
+    for name in PARAMETERS:
+        assert float(last["d_" + name]) == pytest.approx(drift.get(name, 0.0) * expected, abs=2e-4), name
+
+
+def test_exact_inversion_with_a_window_of_one():
+    truth = {"eta_c": 0.85, "n_b": 0.97, "p_loss_ratio": 0.05, "n_turbine": 0.95, "ab_loss": 0.03}
+    state = run_cycle(rp=np.array([20.0, 25.0]), **truth)
+    estimates = GasPathAnalyser(window=1).update({name: np.broadcast_to(state[name], (2,)) for name in SENSORS})
+    for name, value in truth.items():
+        np.testing.assert_allclose(estimates[name], value, rtol=1e-6)
+        np.testing.assert_allclose(estimates["d_" + name], value - DESIGN_POINT[name], atol=1e-6)
+
+
+def _jsonl_log(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return str(path)
+
+
+def test_jsonl_nulls_are_missing_samples(tmp_path):
+    record = {name: 1.0 for name in SENSORS}
+    log = _jsonl_log(tmp_path / "log.jsonl", [record, {**record, "T04": None}])
+    chunk, = read_sensor_log(log)
+    assert np.isnan(chunk["T04"][1]) and chunk["T04"][0] == 1.0
+
+
+@pytest.mark.parametrize("bad, message", [
+    ({"T04": "hot"}, r"log.jsonl:3: 'T04' must be a number"),
+    ({"T04": True}, r"log.jsonl:3: 'T04' must be a number"),
+    ({"bogus": 1.0}, r"log.jsonl:3: column 'bogus'"),
+])
+def test_jsonl_values_are_checked_on_every_record(tmp_path, bad, message):
+    record = {name: 1.0 for name in SENSORS}
+    log = _jsonl_log(tmp_path / "log.jsonl", [record, record, {**record, **bad}])
+    with pytest.raises(ValueError, match=message):
+        list(read_sensor_log(log, chunk_size=1))
+
+
+def test_csv_bad_value_has_its_line(tmp_path):
+    log = tmp_path / "log.csv"
+    log.write_text(",".join(SENSORS) + "\n" + ",".join(["1"] * len(SENSORS)) + "\n"
+                   + ",".join(["x"] + ["1"] * (len(SENSORS) - 1)) + "\n")
+    with pytest.raises(ValueError, match="log.csv:3: 'P02'"):
+        list(read_sensor_log(str(log)))
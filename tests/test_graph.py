@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from jetsim.cycle import CYCLE_OUTPUTS, STATION_NAMES, run_cycle
+from jetsim.graph import CycleGraph, downstream, edges
+
+
+def test_first_evaluate_runs_every_station():
+    graph = CycleGraph(f=np.linspace(0.015, 0.03, 20))
+    state = graph.evaluate()
+    assert graph.recomputed == list(STATION_NAMES)
+    expected = run_cycle(f=np.linspace(0.015, 0.03, 20))
+    for name in CYCLE_OUTPUTS:
+        np.testing.assert_array_equal(state[name], expected[name])
+
+
+@pytest.mark.parametrize("change, stations", [
+    ({"M_e": 2.2}, ["nozzle"]),
+    ({"T06": 2100.0}, ["afterburner", "nozzle"]),
+    ({"rp": 30.0}, ["compressor", "combustor", "turbine", "afterburner", "nozzle"]),
+])
+def test_change_recomputes_only_downstream_stations(change, stations):
+    graph = CycleGraph(f=np.linspace(0.015, 0.03, 20))
+    graph.evaluate()
+    assert graph.set(**change) == set(stations)
+    thrust = graph["thrust"]
+    assert graph.recomputed == stations
+    np.testing.assert_allclose(thrust, run_cycle(f=np.linspace(0.015, 0.03, 20), **change)["thrust"], rtol=1e-15)
+
+
+def test_clean_graph_does_not_recompute():
+    graph = CycleGraph()
+    graph.evaluate()
+    graph.recomputed = []
+    graph["tsfc"]
+    assert graph.recomputed == []
+
+
+def test_edges_and_unknown_inputs():
+    assert ("turbine", "T05", "afterburner") in edges()
+    assert downstream(["T05"]) >= {"afterburner"}
+    with pytest.raises(ValueError, match="nope"):
+        CycleGraph().set(nope=1.0)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from jetsim.atmosphere import flight_condition
+from jetsim.cycle import DESIGN_POINT, cycle_inputs
+from jetsim.inlet_matching import InletGeometry, match_inlet, run_matched, size_inlet
+
+MATCH_INPUTS = ("P1", "T1", "V1", "eta_i", "eta_p", "gamma", "cp", "R")
+
+
+def _match(geometry, **overrides):
+    inputs = cycle_inputs(**overrides)
+    return match_inlet(geometry, *(inputs[name] for name in MATCH_INPUTS))
+
+
+def test_design_point_gets_its_design_flow():
+    state = run_matched(size_inlet())
+    assert state["m_flow"] == pytest.approx(DESIGN_POINT["m_flow"], rel=1e-12)
+    assert not state["inlet_limited"]
+
+
+def test_subsonic_demand_is_met_and_the_rest_spills():
+    geometry = size_inlet()
+    state = run_matched(geometry, **flight_condition(np.zeros(4), np.array([0.3, 0.5, 0.7, 0.9])))
+    assert not state["inlet_limited"].any()
+    # The engine draws its corrected flow; the throat stays at its design Mach number.
+    corrected = state["m_flow"] * np.sqrt(state["T02"] / 288.15) / (state["P02"] / 101325.0)
+    np.testing.assert_allclose(corrected, geometry.corrected_flow, rtol=1e-12)
+    np.testing.assert_allclose(state["M_throat"], state["M_throat"][0], rtol=1e-9)
+    captured = state["m_flow"] / state["capture_ratio"]
+    np.testing.assert_allclose(state["spillage"], np.maximum(captured - state["m_flow"], 0.0), rtol=1e-12)
+
+
+def test_capture_area_limits_supersonic_flow():
+    state = _match(size_inlet(), **flight_condition(np.zeros(3), np.array([1.2, 2.0, 2.5])))
+    limited = state["inlet_limited"]
+    np.testing.assert_array_equal(limited, [False, True, True])
+    # Limited points swallow the whole capture stream tube and spill nothing.
+    np.testing.assert_allclose(state["capture_ratio"][limited], 1.0, rtol=1e-12)
+    np.testing.assert_array_equal(state["spillage"][limited], 0.0)
+    assert state["spillage"][0] > 0
+    # Less flow through the same throat: a lower throat Mach number.
+    assert (state["M_throat"][limited] < state["M_throat"][0]).all()
+
+
+def test_small_throat_chokes():
+    sized = size_inlet()
+    geometry = InletGeometry(sized.A_capture, 0.3 * sized.A_throat, sized.corrected_flow)
+    state = _match(geometry, **flight_condition(np.zeros(3), np.array([0.3, 0.8, 1.2])))
+    assert state["inlet_limited"].all()
+    np.testing.assert_allclose(state["M_throat"], 1.0, rtol=1e-9)
+    assert (state["recovery"] < _match(sized, **flight_condition(np.zeros(3), np.array([0.3, 0.8, 1.2])))["recovery"]).all()
+
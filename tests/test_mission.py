@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from jetsim.deck import deck_cycle
+from jetsim.mission import integrate_missions, mission_power, synthetic_missions
+
+
+@pytest.fixture(scope="module")
+def missions():
+    return synthetic_missions(6, duration=600.0, dt=10.0, seed=1)
+
+
+@pytest.mark.parametrize("block_points", [1, 7, 61, 1 << 20])
+def test_totals_do_not_depend_on_the_block_size(missions, block_points):
+    reference = integrate_missions(**missions, history=True)
+    result = integrate_missions(**missions, history=True, block_points=block_points)
+    for name in ("fuel", "afterburner_time", "impulse", "duration", "thrust", "fuel_burned"):
+        np.testing.assert_allclose(getattr(result, name), getattr(reference, name), rtol=1e-12, err_msg=name)
+
+
+def test_totals_match_the_trapezoidal_rule(missions):
+    result = integrate_missions(**missions)
+    time = missions["time"]
+    state = deck_cycle(missions["altitude"], missions["mach"], missions["power"])
+    np.testing.assert_allclose(result.fuel, np.trapezoid(state["m_fuel_total"], time, axis=1), rtol=1e-12)
+    np.testing.assert_allclose(result.impulse, np.trapezoid(state["thrust"], time, axis=1), rtol=1e-12)
+    reheat = (missions["power"] > 1).astype(float)
+    np.testing.assert_allclose(result.afterburner_time, np.trapezoid(reheat, time, axis=1), rtol=1e-12)
+    np.testing.assert_array_equal(result.duration, time[-1] - time[0])
+
+
+def test_padded_missions_match_their_unpadded_length(missions):
+    time = np.tile(missions["time"], (2, 1))
+    time[1, 40:] = np.nan
+    result = integrate_missions(time, missions["altitude"][:2], missions["mach"][:2], missions["power"][:2],
+                                block_points=16)
+    short = integrate_missions(missions["time"][:40], missions["altitude"][1, :40], missions["mach"][1, :40],
+                               missions["power"][1, :40])
+    np.testing.assert_allclose(result.fuel[1], short.fuel[0], rtol=1e-12)
+    assert result.duration[1] == missions["time"][39]
+
+
+def test_bad_inputs():
+    with pytest.raises(ValueError, match="increasing"):
+        integrate_missions([0.0, 2.0, 1.0], 0.0, 0.5, 1.0)
+    with pytest.raises(ValueError, match="padded"):
+        integrate_missions([0.0, np.nan, 1.0], 0.0, 0.5, 1.0)
+    with pytest.raises(ValueError):
+        mission_power(1.2)
+    np.testing.assert_array_equal(mission_power([0.3, 1.0], [0.0, 0.5]), [0.3, 1.5])
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from jetsim.moc import design_contour, mach_from_prandtl_meyer, prandtl_meyer
+from nozzle.nozzle_functions import calculate_area_ratio
+
+M_E, GAMMA = 2.0, 1.3333
+
+
+def test_prandtl_meyer_round_trip():
+    M = np.array([1.0, 1.5, 2.0, 3.5])
+    np.testing.assert_allclose(mach_from_prandtl_meyer(prandtl_meyer(M, GAMMA), GAMMA), M, rtol=1e-10)
+    assert prandtl_meyer(1.0, GAMMA) == pytest.approx(0.0, abs=1e-12)
+
+
+@pytest.mark.parametrize("planar", [False, True])
+def test_exit_area_ratio_matches_isentropic_area_ratio(planar):
+    contour = design_contour(M_E, GAMMA, planar=planar)
+    assert contour.area_ratio == pytest.approx(calculate_area_ratio(M_E, GAMMA), rel=1e-3)
+    assert abs(contour.mass_error) < 1e-3
+
+
+@pytest.mark.parametrize("planar", [False, True])
+def test_wall_runs_from_throat_corner_and_opens_out(planar):
+    contour = design_contour(M_E, GAMMA, planar=planar)
+    assert (contour.x[0], contour.r[0]) == (0.0, 1.0)
+    assert np.all(np.diff(contour.x) > 0)
+    assert np.all(np.diff(contour.r) >= 0)
+    assert contour.length == pytest.approx(contour.x[-1])
+    assert not contour.r.flags.writeable
+
+
+def test_planar_corner_turns_half_the_prandtl_meyer_angle():
+    planar = design_contour(M_E, GAMMA, planar=True)
+    axisymmetric = design_contour(M_E, GAMMA)
+    assert planar.theta_max == pytest.approx(prandtl_meyer(M_E, GAMMA) / 2, rel=1e-2)
+    assert axisymmetric.theta_max < planar.theta_max
+
+
+def test_contours_are_cached():
+    assert design_contour(M_E, GAMMA) is design_contour(M_E, GAMMA)
+
+
+@pytest.mark.parametrize("kwargs", [{"M_e": 1.0}, {"gamma": 1.0}, {"resolution": 1}, {"M_e": np.array([2.0, 2.5])}])
+def test_invalid_designs_are_rejected(kwargs):
+    args = {"M_e": M_E, "gamma": GAMMA, **kwargs}
+    with pytest.raises(ValueError):
+        design_contour(**args)
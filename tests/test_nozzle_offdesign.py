@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from jetsim.nozzle_offdesign import (IDEAL, NO_FLOW, OVEREXPANDED, SHOCK_IN_NOZZLE, SUBSONIC, UNDEREXPANDED,
+                                     mach_from_area_ratio, normal_shock_pressure_ratio, offdesign_nozzle,
+                                     pressure_ratio)
+from nozzle.nozzle_functions import calculate_area_ratio
+
+GAMMA, R, P0, T0, AREA_RATIO = 1.4, 287.0, 2e5, 1500.0, 2.0
+
+
+@pytest.fixture(scope="module")
+def boundaries():
+    M_sub = mach_from_area_ratio(AREA_RATIO, GAMMA, supersonic=False)
+    M_sup = mach_from_area_ratio(AREA_RATIO, GAMMA, supersonic=True)
+    p_first = P0 * pressure_ratio(M_sub, GAMMA)
+    p_design = P0 * pressure_ratio(M_sup, GAMMA)
+    return p_first, p_design * normal_shock_pressure_ratio(M_sup, GAMMA), p_design, M_sup
+
+
+def _solve(P_back):
+    return offdesign_nozzle(P0, T0, AREA_RATIO, np.asarray(P_back, dtype=float), GAMMA, R, A_throat=0.1)
+
+
+def test_mach_from_area_ratio_inverts_the_area_relation():
+    for supersonic in (False, True):
+        M = mach_from_area_ratio(np.array([1.2, 2.0, 4.0]), GAMMA, supersonic)
+        np.testing.assert_allclose(calculate_area_ratio(M, GAMMA), [1.2, 2.0, 4.0], rtol=1e-12)
+        assert np.all(M > 1) if supersonic else np.all(M < 1)
+
+
+def test_regimes_either_side_of_each_boundary(boundaries):
+    p_first, p_second, p_design, _ = boundaries
+    eps = 1e-6
+    P_back = [P0 * 1.01, p_first * (1 + eps), p_first * (1 - eps), p_second * (1 + eps), p_second * (1 - eps),
+              p_design * 1.01, p_design, p_design * 0.99]
+    expected = [NO_FLOW, SUBSONIC, SHOCK_IN_NOZZLE, SHOCK_IN_NOZZLE, OVEREXPANDED, OVEREXPANDED, IDEAL,
+                UNDEREXPANDED]
+    np.testing.assert_array_equal(_solve(P_back)["regime"], expected)
+
+
+def test_shock_moves_from_throat_to_exit(boundaries):
+    p_first, p_second, _, _ = boundaries
+    result = _solve([p_first * (1 - 1e-6), p_second * (1 + 1e-6)])
+    np.testing.assert_allclose(result["shock_area_ratio"], [1.0, AREA_RATIO], rtol=1e-2)
+    np.testing.assert_allclose(result["P_e"], [p_first * (1 - 1e-6), p_second * (1 + 1e-6)])
+    assert np.all(result["M_e"] < 1)
+
+
+def test_choked_flow_is_fixed_below_the_first_critical_pressure(boundaries):
+    p_first, p_second, p_design, M_sup = boundaries
+    result = _solve([p_first * 0.999, p_second * 0.9, p_design, p_design * 0.5])
+    np.testing.assert_allclose(result["m_dot"], result["m_dot"][0], rtol=1e-9)
+    np.testing.assert_allclose(result["M_e"][1:], M_sup, rtol=1e-12)
+    subsonic = _solve([p_first * 1.05, (p_first + P0) / 2])
+    assert np.all(subsonic["m_dot"] < result["m_dot"][0])
+    np.testing.assert_allclose(subsonic["P_e"], [p_first * 1.05, (p_first + P0) / 2])
+
+
+def test_no_flow_gives_no_thrust():
+    result = _solve([P0, 1.5 * P0])
+    np.testing.assert_array_equal(result["regime"], [NO_FLOW, NO_FLOW])
+    np.testing.assert_array_equal(result["thrust"], 0.0)
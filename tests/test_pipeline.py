@@ -0,0 +1,91 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from jetsim.batch import run_batch
+from jetsim.emissions import Emissions
+from jetsim.pipeline import run_pipeline
+
+OUTPUTS = ("thrust", "tsfc", "T04", "rp", "P1")
+
+
+@pytest.fixture
+def cases_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    path = tmp_path / "cases.csv"
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["case_id", "rp", "f", "P1"])
+        for i in range(1000):
+            # Blank cells take the design point.
+            writer.writerow([f"c{i}", rng.uniform(10, 40), rng.uniform(0.015, 0.025),
+                             "" if i % 7 == 0 else rng.uniform(5e4, 1e5)])
+    return str(path)
+
+
+@pytest.fixture
+def cases_jsonl(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    records = [{"case_id": "a", "rp": 20.0}, {"f": 0.018}, {"rp": 25.0, "T1": 250.0}, {}, {"f": 0.021}]
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 4096])
+def test_pipeline_matches_batch_csv(cases_csv, tmp_path, chunk_size):
+    run_batch(cases_csv, str(tmp_path / "batch.csv"), OUTPUTS, chunk_size)
+    result = run_pipeline(cases_csv, str(tmp_path / "pipeline.csv"), OUTPUTS, chunk_size, buffers=3)
+    assert result.cases == 1000
+    assert result.chunks == -(-1000 // chunk_size)
+    assert (tmp_path / "pipeline.csv").read_text() == (tmp_path / "batch.csv").read_text()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_pipeline_matches_batch_jsonl(cases_jsonl, tmp_path, chunk_size):
+    run_batch(cases_jsonl, str(tmp_path / "batch.jsonl"), OUTPUTS, chunk_size)
+    run_pipeline(cases_jsonl, str(tmp_path / "pipeline.jsonl"), OUTPUTS, chunk_size)
+    assert (tmp_path / "pipeline.jsonl").read_text() == (tmp_path / "batch.jsonl").read_text()
+
+
+def test_pipeline_matches_batch_with_post_stages(cases_csv, tmp_path):
+    outputs = ("thrust", "EI_NOx", "T04_peak")
+    run_batch(cases_csv, str(tmp_path / "batch.csv"), outputs, 100, post=(Emissions(),))
+    result = run_pipeline(cases_csv, str(tmp_path / "pipeline.csv"), outputs, 100,
+                          post=(Emissions(residence_time=4e-3), Emissions()))
+    assert (tmp_path / "pipeline.csv").read_text() == (tmp_path / "batch.csv").read_text()
+    assert list(result.stages) == ["reader", "inlet", "compressor", "combustor", "turbine", "afterburner",
+                                   "nozzle", "emissions_1", "emissions_2", "writer"]
+    for stage in result.stages.values():
+        assert 0 <= stage.occupancy <= 1
+
+
+def test_empty_case_file(tmp_path):
+    cases = tmp_path / "empty.csv"
+    cases.write_text("rp\n")
+    assert run_pipeline(str(cases), str(tmp_path / "out.csv"), ("thrust",)).cases == 0
+    assert (tmp_path / "out.csv").read_text().splitlines() == ["thrust"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+def test_case_ids_after_the_first_chunk_match_batch(tmp_path, chunk_size):
+    csv_cases = tmp_path / "late.csv"
+    csv_cases.write_text("case_id,rp\n,10\n,12\nb,14\n")
+    jsonl_cases = tmp_path / "late.jsonl"
+    jsonl_cases.write_text("".join(json.dumps({"rp": 20.0 + i, **({"case_id": f"c{i}"} if i >= 5 else {})}) + "\n"
+                                   for i in range(10)))
+    for cases, suffix in ((csv_cases, ".csv"), (jsonl_cases, ".jsonl")):
+        run_batch(str(cases), str(tmp_path / f"batch{suffix}"), ("thrust",), chunk_size)
+        run_pipeline(str(cases), str(tmp_path / f"pipeline{suffix}"), ("thrust",), chunk_size)
+        assert (tmp_path / f"pipeline{suffix}").read_text() == (tmp_path / f"batch{suffix}").read_text()
+    assert (tmp_path / "pipeline.csv").read_text().splitlines()[0] == "case_id,thrust"
+    assert '"case_id": "c5"' in (tmp_path / "pipeline.jsonl").read_text()
+
+
+@pytest.mark.parametrize("run", [run_batch, run_pipeline])
+def test_bad_value_reports_the_line(tmp_path, run):
+    cases = tmp_path / "bad.csv"
+    cases.write_text("rp,f\n20,0.02\n21,abc\n")
+    with pytest.raises(ValueError, match="bad.csv:3"):
+        run(str(cases), str(tmp_path / "out.csv"))
@@ -0,0 +1,33 @@
+import numpy as np
+
+from jetsim.cycle import CYCLE_OUTPUTS, run_cycle
+from jetsim.precision import precision_report, select_dtype
+
+
+def test_float32_is_kept_through_every_station():
+    state = run_cycle(np.float32, rp=np.linspace(10.0, 40.0, 100))
+    for name in CYCLE_OUTPUTS:
+        assert np.asarray(state[name]).dtype == np.float32, name
+    scalar = run_cycle(np.float32)
+    assert all(np.asarray(scalar[name]).dtype == np.float32 for name in CYCLE_OUTPUTS)
+
+
+def test_default_precision_is_float64():
+    state = run_cycle(rp=np.linspace(10.0, 40.0, 10))
+    assert state["thrust"].dtype == np.float64
+
+
+def test_float32_stays_close_to_float64():
+    rp = np.linspace(10.0, 40.0, 100)
+    single, double = run_cycle(np.float32, rp=rp), run_cycle(rp=rp)
+    for name in ("T03", "T04", "P04", "T05", "m_fuel_total"):
+        np.testing.assert_allclose(single[name], double[name], rtol=1e-5, err_msg=name)
+
+
+def test_report_and_dtype_choice():
+    report = precision_report(samples=2000, outputs=("T04", "thrust"))
+    assert report["T04"]["max_rel"] < 1e-5
+    assert report["T04"]["rms_rel"] <= report["T04"]["max_rel"]
+    assert set(report["thrust"]["worst"]) >= {"rp", "f"}
+    assert select_dtype(1e-4, ("T04",), report) is np.float32
+    assert select_dtype(1e-12, ("T04",), report) is np.float64
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from jetsim.atmosphere import flight_condition
+from jetsim.cycle import run_cycle
+from jetsim.reheat import ReheatTable, main
+
+ALTITUDES = [0.0, 5000.0, 10000.0]
+MACHS = [0.0, 0.5, 0.9]
+
+
+@pytest.fixture(scope="module")
+def table():
+    return ReheatTable(ALTITUDES, MACHS)
+
+
+@pytest.mark.parametrize("reheat", [0.0, 0.3, 1.0])
+def test_table_nodes_match_run_cycle(table, reheat):
+    altitude, mach = np.meshgrid(ALTITUDES, MACHS, indexing="ij")
+    conditions = flight_condition(altitude, mach)
+    T05 = run_cycle(**conditions)["T05"]
+    state = run_cycle(T06=T05 + reheat * (2400.0 - T05), **conditions)
+    result = table.query(altitude, mach, reheat)
+    np.testing.assert_allclose(result["thrust"], state["thrust"], rtol=1e-6)
+    np.testing.assert_allclose(result["m_fuel_total"], state["m_fuel_total"], rtol=1e-6)
+
+
+def test_wet_dry_rows(table):
+    rows = table.wet_dry_rows()
+    assert len(rows) == len(ALTITUDES) * len(MACHS)
+    for altitude, mach, dry, wet, fuel_dry, fuel_wet, augmentation in rows:
+        assert wet > dry and fuel_wet > fuel_dry
+        assert augmentation == pytest.approx(wet / dry)
+
+
+@pytest.mark.parametrize("argv", [["--altitudes", "0"], ["--machs", "0.5"], ["--machs", "0.9,0.5"],
+                                  ["--altitudes", "0,x"]])
+def test_main_rejects_bad_axes(argv, capsys):
+    with pytest.raises(SystemExit):
+        main(argv)
+    assert f"argument {argv[0]}:" in capsys.readouterr().err
@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+from jetsim import service
+from jetsim.cycle import run_cycle
+from jetsim.service import CycleService, MicroBatcher
+
+
+def _handle(body, batcher=None):
+    async def run():
+        nonlocal batcher
+        batcher = batcher or MicroBatcher(batch_window=0.0)
+        await batcher.start()
+        try:
+            return await CycleService(batcher).handle("POST", "/evaluate", json.dumps(body).encode())
+        finally:
+            await batcher.stop()
+    return asyncio.run(run())
+
+
+def test_evaluate_matches_run_cycle():
+    status, payload = _handle({"f": 0.025, "rp": 28})
+    assert status == 200
+    assert payload["thrust"] == float(run_cycle(f=0.025, rp=28)["thrust"])
+
+
+def test_overflowing_input_is_a_bad_request():
+    status, payload = _handle({"rp": 10 ** 400})
+    assert status == 400
+    assert "rp" in payload["error"]
+
+
+def test_unknown_input_is_a_bad_request():
+    status, _ = _handle({"nope": 1})
+    assert status == 400
+
+
+def test_evaluation_error_is_a_server_error(monkeypatch):
+    def fail(points, outputs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(service, "evaluate_batch", fail)
+    status, payload = _handle({"f": 0.02})
+    assert status == 500
+    assert "boom" in payload["error"]
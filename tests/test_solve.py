@@ -0,0 +1,42 @@
+import numpy as np
+
+from jetsim.cycle import run_cycle
+from jetsim.solve import SolutionStore, WarmStartSolver, solve_f_for_T04
+
+
+def test_solution_hits_the_target():
+    f = solve_f_for_T04(np.linspace(1400.0, 1800.0, 50))
+    np.testing.assert_allclose(run_cycle(f=f)["T04"], np.linspace(1400.0, 1800.0, 50), rtol=1e-8)
+
+
+def test_warm_starts_take_fewer_iterations():
+    solver = WarmStartSolver(("f",), ("thrust",))
+    cold = solver.solve({"thrust": np.linspace(6e4, 9e4, 200)}, T06=2000.0)
+    warm = solver.solve({"thrust": np.linspace(6.005e4, 9.005e4, 200)}, T06=2000.0)
+    assert cold.converged.all() and warm.converged.all()
+    assert not cold.warm.any() and warm.warm.all()
+    assert warm.iterations.mean() < 0.5 * cold.iterations.mean()
+    assert warm.evaluations.mean() < cold.evaluations.mean()
+    np.testing.assert_allclose(run_cycle(f=warm.x[:, 0], T06=2000.0)["thrust"], np.linspace(6.005e4, 9.005e4, 200),
+                               rtol=1e-8)
+
+
+def test_store_skips_duplicates():
+    solver = WarmStartSolver(("f",), ("thrust",))
+    targets = {"thrust": np.repeat(np.linspace(6e4, 9e4, 100), 2)}
+    solver.solve(targets, T06=2000.0)
+    assert len(solver.store) == 100
+    solver.solve(targets, T06=2000.0)
+    assert len(solver.store) == 100
+
+
+def test_store_keeps_the_newest_points():
+    store = SolutionStore(1, max_size=10)
+    for start in range(0, 30, 5):
+        features = np.arange(start, start + 5, dtype=float)[:, None]
+        store.add(features, features, np.ones((5, 1, 1)))
+    assert len(store) == 10
+    _, index = store.nearest(np.array([[29.0]]))
+    assert store._features[index[0, 0], 0] == 29.0
+    distance, _ = store.nearest(np.array([[0.0]]))
+    assert distance[0, 0] > 0